@@ -1,10 +1,10 @@
 from pydantic import Field,field_validator
 from pydantic_settings import BaseSettings,SettingsConfigDict
-from typing import Literal
+from typing import Dict, List, Literal, Optional
 from pathlib import Path
 
 import os
-from itertools import lru_cache
+from functools import lru_cache
 
 PROJECT_ROOT = Path(__file__).parent.parent
 ENV_FILE_PATH = PROJECT_ROOT/".env"
@@ -38,6 +38,10 @@ class ArxivSettings(BaseSettings):
     download_max_retries: int = 3
     download_retry_delay_base: float = 5.0
     max_concurrent_downloads: int = 5
+    # arXiv asks for one request every rate_limit_delay seconds, downloads included, so
+    # unset the rate follows it; only raise either for a mirror with a looser policy
+    download_rate_per_second: Optional[float] = None
+    download_burst: int = 1
     max_concurrent_parsing: int =1
     namespaces: dict = {
         "atom": "http://www.w3.org/2005/Atom",
@@ -63,6 +67,17 @@ class PDFParserSettings(BaseCOnfigSettings):
     max_file_size_mb: int = 20
     do_ocr:bool = False
     do_table_structure: bool = True
+    tiered_parsing: bool = True
+    structure_pages: int = 12
+    max_text_pages: int = 300
+    parse_timeout_seconds: float = 300.0
+    worker_start_timeout_seconds: float = 180.0
+    worker_memory_limit_mb: int = 4096
+    max_docs_per_worker: int = 50
+    start_method: Literal["spawn","forkserver","fork"] = "spawn"
+    preload_models: bool = False
+    cache_enabled: bool = True
+    cache_dir: str = "./data/parsed_pdfs"
 
 class ChunkingSettings(BaseCOnfigSettings):
     model_config = SettingsConfigDict(
@@ -78,6 +93,57 @@ class ChunkingSettings(BaseCOnfigSettings):
     min_chunk_size: int = 100
     section_based: bool = True
 
+class EmbeddingsSettings(BaseCOnfigSettings):
+    model_config = SettingsConfigDict(
+        env_file=[".env",str(ENV_FILE_PATH)],
+        env_prefix= "EMBEDDINGS__",
+        extra = "ignore",
+        frozen = True,
+        case_sensitive=False
+    )
+
+    provider: Literal["jina","local"] = "jina"
+
+    local_model_name: str = "BAAI/bge-m3"
+    local_backend: Literal["torch","onnx"] = "torch"
+    local_num_threads: int = 0
+    local_quantize_int8: bool = False
+    local_onnx_file_name: str = ""
+    # int8 export loaded when quantizing the onnx backend (sentence_transformers.export_dynamic_quantized_onnx_model
+    # naming), the fp32 model.onnx is used if the model does not ship it
+    local_onnx_int8_file_name: str = "onnx/model_qint8_avx512_vnni.onnx"
+    local_max_batch_size: int = 32
+    local_max_wait_ms: float = 10.0
+    local_query_prompt: str = ""
+    local_passage_prompt: str = ""
+
+    coalesce_batches: bool = True
+    coalesce_batch_size: int = 100
+    coalesce_max_wait_ms: float = 50.0
+    max_concurrent_requests: int = 4
+
+    cache_backend: Literal["none","redis","disk"] = "redis"
+    cache_dir: str = "./data/embedding_cache"
+    cache_ttl_days: int = 30
+
+    query_cache_size: int = 1024
+    query_cache_ttl_seconds: int = 3600
+
+class IndexingSettings(BaseCOnfigSettings):
+    model_config = SettingsConfigDict(
+        env_file=[".env",str(ENV_FILE_PATH)],
+        env_prefix= "INDEXING__",
+        extra = "ignore",
+        frozen = True,
+        case_sensitive=False
+    )
+
+    pipelined: bool = True
+    chunk_workers: int = 2
+    embedding_concurrency: int = 8
+    queue_size: int = 16
+    embedding_batch_size: int = 50
+
 class OpenSearchSettings(BaseCOnfigSettings):
     model_config = SettingsConfigDict(
         env_file=[".env",str(ENV_FILE_PATH)],
@@ -91,6 +157,24 @@ class OpenSearchSettings(BaseCOnfigSettings):
     chunk_index_suffix : str = "chunks"
     max_text_size: int = 1000000
 
+    request_timeout: float = 10.0
+    pool_maxsize: int = 20
+    http_compress: bool = False
+    max_retries: int = 1
+
+    health_check_interval_seconds: float = 10.0
+    circuit_failure_threshold: int = 3
+    circuit_reset_timeout_seconds: float = 30.0
+
+    parallel_hybrid: bool = True
+    embedding_budget_ms: float = 300.0
+
+    hedge_enabled: bool = True
+    hedge_percentile: float = 95.0
+    hedge_latency_window: int = 200
+    hedge_default_delay_ms: float = 100.0
+    hedge_min_delay_ms: float = 20.0
+
     vector_dimension:int  = 1024
     vector_space_type: str = "cosinesimil"
 
@@ -132,6 +216,59 @@ class RedisSettings(BaseCOnfigSettings):
     socket_timeout: int = 30
     socket_connection_timeout: int = 30
     ttl_hours: int = 6
+    max_connections: int = 50
+    compression_threshold_bytes: int = 1024
+    lookup_timeout_ms: float = 200.0
+
+class SemanticCacheSettings(BaseCOnfigSettings):
+    model_config = SettingsConfigDict(
+        env_file=[".env",str(ENV_FILE_PATH)],
+        env_prefix= "SEMANTIC_CACHE__",
+        extra = "ignore",
+        frozen = True,
+        case_sensitive=False
+    )
+    enabled: bool = True
+    similarity_threshold: float = 0.95
+    max_entries: int = 1000
+    ttl_seconds: int = 3600
+
+class RetrievalCacheSettings(BaseCOnfigSettings):
+    model_config = SettingsConfigDict(
+        env_file=[".env",str(ENV_FILE_PATH)],
+        env_prefix= "RETRIEVAL_CACHE__",
+        extra = "ignore",
+        frozen = True,
+        case_sensitive=False
+    )
+    enabled: bool = True
+    ttl_seconds: int = 3600
+
+class StreamingSettings(BaseCOnfigSettings):
+    model_config = SettingsConfigDict(
+        env_file=[".env",str(ENV_FILE_PATH)],
+        env_prefix= "STREAMING__",
+        extra = "ignore",
+        frozen = True,
+        case_sensitive=False
+    )
+    flush_interval_ms: float = 20.0
+    heartbeat_interval_seconds: float = 15.0
+    queue_size: int = 64
+
+class PromptSettings(BaseCOnfigSettings):
+    model_config = SettingsConfigDict(
+        env_file=[".env",str(ENV_FILE_PATH)],
+        env_prefix= "PROMPT__",
+        extra = "ignore",
+        frozen = True,
+        case_sensitive=False
+    )
+    context_token_budget: int = 2048
+    model_context_budgets: Dict[str,int] = Field(default_factory=dict)
+    chars_per_token: float = 4.0
+    near_duplicate_threshold: float = 0.8
+    include_abstract: bool = True
 
 class Settings(BaseCOnfigSettings):
     app_version: str = "0.1.0"
@@ -147,14 +284,30 @@ class Settings(BaseCOnfigSettings):
     ollama_host: str = "http://localhost:11434"
     ollama_model: str = "llama3.2:1b"
     ollama_timeout: int = 300
+    ollama_connect_timeout: float = 5.0
+    ollama_max_connections: int = 20
+    ollama_max_keepalive_connections: int = 10
+    ollama_keepalive_expiry: float = 60.0
+    ollama_keep_alive: str = "30m"
+    ollama_num_ctx: int = 4096
+    ollama_warmup_on_startup: bool = True
+    ollama_warmup_models: List[str] = Field(default_factory=list)
+
+    jina_api_key: str = ""
 
 
     arxiv: ArxivSettings = Field(default_factory=ArxivSettings)
     pdf_parser : PDFParserSettings = Field(default_factory=PDFParserSettings)
     chunking: ChunkingSettings = Field(default_factory=ChunkingSettings)
+    embeddings: EmbeddingsSettings = Field(default_factory=EmbeddingsSettings)
+    indexing: IndexingSettings = Field(default_factory=IndexingSettings)
     opensearch: OpenSearchSettings = Field(default_factory=OpenSearchSettings)
     langfuse: LangfuseSettings = Field(default_factory = LangfuseSettings)
     redis: RedisSettings = Field(default_factory = RedisSettings)
+    semantic_cache: SemanticCacheSettings = Field(default_factory = SemanticCacheSettings)
+    retrieval_cache: RetrievalCacheSettings = Field(default_factory = RetrievalCacheSettings)
+    streaming: StreamingSettings = Field(default_factory = StreamingSettings)
+    prompt: PromptSettings = Field(default_factory = PromptSettings)
 
     @field_validator("postgres_database_url")
     @classmethod
@@ -7,9 +7,15 @@ from src.config import Settings
 from src.db.interfaces.base import BaseDatabase
 from src.services.arxiv.client import ArxivClient
 from src.services.cache.client import CacheClient
-from src.services.embeddings.jina_client import JinaEmbeddingsClient
+from src.services.cache.coalescing import SingleFlight, StreamBroadcaster
+from src.services.cache.retrieval import RetrievalCache
+from src.services.cache.semantic import SemanticAnswerCache
+from src.services.embeddings.base import BaseEmbeddingsClient
 from src.services.langfuse.client import LangfuseTracer
+from src.services.ollama.client import OllamaClient
+from src.services.opensearch.async_client import AsyncOpenSearchClient
 from src.services.opensearch.client import OpenSearchClient
+from src.services.opensearch.health import OpenSearchHealthMonitor
 from src.services.pdf_parser.parser import PDFParserService
 
 
@@ -29,7 +35,15 @@ def get_db_session(database: Annotated[BaseDatabase,Depends(get_database)]) -> G
         yield session
 
 def get_opensearch_client(request: Request) -> OpenSearchClient:
-    return OpenSearchClient.app.state.opensearch_client
+    return request.app.state.opensearch_client
+
+
+def get_async_opensearch_client(request: Request) -> AsyncOpenSearchClient:
+    return request.app.state.async_opensearch_client
+
+
+def get_opensearch_health(request: Request) -> OpenSearchHealthMonitor:
+    return request.app.state.opensearch_health
 
 
 def get_arxiv_client(request: Request) -> ArxivClient:
@@ -40,7 +54,7 @@ def get_pdf_parser(request:Request) -> ArxivClient:
     return request.app.state.arxiv_client
 
 
-def get_embeddings_service(request: Request) -> JinaEmbeddingsClient:
+def get_embeddings_service(request: Request) -> BaseEmbeddingsClient:
     return request.app.state.embeddings_service
 
 
@@ -48,16 +62,43 @@ def get_langfuse_tracer(request: Request) -> LangfuseTracer:
     return request.app.state.langfuse_tracer
 
 
+def get_ollama_client(request: Request) -> OllamaClient:
+    return request.app.state.ollama_client
+
+
 def get_cache_client(request: Request) -> CacheClient | None:
     return getattr(request.app.state,"cache_client",None)
 
 
+def get_single_flight(request: Request) -> SingleFlight:
+    return request.app.state.single_flight
+
+
+def get_stream_broadcaster(request: Request) -> StreamBroadcaster:
+    return request.app.state.stream_broadcaster
+
+
+def get_retrieval_cache(request: Request) -> RetrievalCache | None:
+    return getattr(request.app.state,"retrieval_cache",None)
+
+
+def get_semantic_cache(request: Request) -> SemanticAnswerCache | None:
+    return getattr(request.app.state,"semantic_cache",None)
+
+
 SettingsDep = Annotated[Settings,Depends(get_settings)]
 DatabaseDep = Annotated[BaseDatabase, Depends(get_database)]
 SessionDep = Annotated[Session, Depends(get_db_session)]
 OpenSearchDep = Annotated[OpenSearchClient, Depends(get_opensearch_client)]
+AsyncOpenSearchDep = Annotated[AsyncOpenSearchClient, Depends(get_async_opensearch_client)]
+OpenSearchHealthDep = Annotated[OpenSearchHealthMonitor, Depends(get_opensearch_health)]
 ArxivDep = Annotated[ArxivClient, Depends(get_arxiv_client)]
 PDFParserDep = Annotated[PDFParserService, Depends(get_pdf_parser)]
-EmbeddingsDep = Annotated[JinaEmbeddingsClient, Depends(get_embeddings_service)]
+EmbeddingsDep = Annotated[BaseEmbeddingsClient, Depends(get_embeddings_service)]
+OllamaDep = Annotated[OllamaClient, Depends(get_ollama_client)]
 LangfuseDep = Annotated[LangfuseTracer, Depends(get_langfuse_tracer)]
-CacheDep = Annotated[CacheClient | None, Depends(get_cache_client)]
\ No newline at end of file
+CacheDep = Annotated[CacheClient | None, Depends(get_cache_client)]
+SemanticCacheDep = Annotated[SemanticAnswerCache | None, Depends(get_semantic_cache)]
+RetrievalCacheDep = Annotated[RetrievalCache | None, Depends(get_retrieval_cache)]
+SingleFlightDep = Annotated[SingleFlight, Depends(get_single_flight)]
+StreamBroadcasterDep = Annotated[StreamBroadcaster, Depends(get_stream_broadcaster)]
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import uvicorn
 from fastapi import FastAPI
@@ -10,10 +11,16 @@ from src.db.factory import make_database
 from src.routers import hybrid_search, ping
 from src.routers.ask import ask_router, stream_router
 from src.services.arxiv.factory import make_arxiv_client
-from src.services.cache.factory import make_cache_client
+from src.services.cache.coalescing import SingleFlight, StreamBroadcaster
+from src.services.cache.factory import make_cache_client, make_retrieval_cache, make_semantic_cache
 from src.services.embeddings.factory import make_embeddings_service
 from src.services.langfuse.factory import make_langfuse_tracer
-from src.services.opensearch.factory import make_opensearch_client
+from src.services.ollama.factory import make_ollama_client
+from src.services.opensearch.factory import (
+    make_async_opensearch_client,
+    make_opensearch_client,
+    make_opensearch_health_monitor,
+)
 from src.services.pdf_parser.factory import make_pdf_parser_service
 
 
@@ -52,17 +59,50 @@ async def lifespan(app: FastAPI):
     else:
         logger.warning("OpenSearch connection failed - search features will be limited")
 
-    app.state.arxiv_client = make_arxiv_client()
+    async_opensearch_client = make_async_opensearch_client(settings)
+    app.state.async_opensearch_client = async_opensearch_client
+
+    opensearch_health = make_opensearch_health_monitor(async_opensearch_client, settings)
+    await opensearch_health.start()
+    app.state.opensearch_health = opensearch_health
+
+    arxiv_client = make_arxiv_client()
+    app.state.arxiv_client = arxiv_client
     app.state.pdf_parser = make_pdf_parser_service()
     app.state.embeddings_service = make_embeddings_service()
-    app.state.ollama_client = make_ollama_client()
+    ollama_client = make_ollama_client()
+    app.state.ollama_client = ollama_client
+    warm_up_task = None
+    if settings.ollama_warmup_on_startup:
+        # loading a model can take minutes, so it warms in the background instead of holding up startup
+        warm_up_task = asyncio.create_task(
+            ollama_client.warm_up(settings.ollama_warmup_models or [settings.ollama_model])
+        )
     app.state.langfuse_tracer = make_langfuse_tracer()
-    app.state.cache_client = make_cache_client(settings)
+    cache_client = make_cache_client(settings)
+    if await cache_client.ping():
+        logger.info(f"Connected to redis at {settings.redis.host}:{settings.redis.port}")
+    app.state.cache_client = cache_client
+    app.state.semantic_cache = make_semantic_cache(settings)
+    app.state.retrieval_cache = make_retrieval_cache(cache_client, settings)
+    app.state.single_flight = SingleFlight()
+    app.state.stream_broadcaster = StreamBroadcaster()
     logger.info("Services initialized: arXiv API client, PDF parser, OpenSearch, Embeddings, Ollama, Langfuse, Cache")
 
     logger.info("API ready")
     yield
 
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+        try:
+            await warm_up_task
+        except asyncio.CancelledError:
+            pass
+    await opensearch_health.stop()
+    await async_opensearch_client.close()
+    await ollama_client.close()
+    await arxiv_client.close()
+    await cache_client.close()
     database.teardown()
     logger.info("API shutdown complete")
 
@@ -1 +0,0 @@
-pa
\ No newline at end of file
@@ -1,50 +1,174 @@
+import asyncio
 import json
-import loguru import logger
+from contextlib import aclosing
+from loguru import logger
 import time
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
+from src.dependencies import (
+    AsyncOpenSearchDep,
+    CacheDep,
+    EmbeddingsDep,
+    LangfuseDep,
+    OllamaDep,
+    RetrievalCacheDep,
+    SemanticCacheDep,
+    SettingsDep,
+    SingleFlightDep,
+    StreamBroadcasterDep,
+)
 from src.schemas.api.ask import AskRequest, AskResponse
+from src.services.cache.client import ask_cache_key
+from src.services.cache.retrieval import RetrievalCache
 from src.services.langfuse.tracer import RAGTracer
+from src.services.streaming.sse import SSE_HEADERS, sse_event_stream
 
 
 ask_router = APIRouter(tags=["ask"])
 stream_router = APIRouter(tags=["stream"])
 
 
+def _sse_frame(data: Dict) -> str:
+    """Frame one stream event, shared by live and replayed streams so both are byte identical"""
+    return f"data: {json.dumps(data)}\n\n"
+
+
+def _replay_frames(cached_response: AskResponse, tokens: Optional[List[str]]) -> str:
+    """All frames of a cached stream in one write, split on the original token boundaries
+
+    Answers cached by /ask have no token boundaries and are replayed as a single chunk.
+    """
+    frames = [
+        _sse_frame(
+            {
+                "sources": cached_response.sources,
+                "chunks_used": cached_response.chunks_used,
+                "search_mode": cached_response.search_mode,
+                "degraded": cached_response.degraded,
+            }
+        )
+    ]
+    frames.extend(_sse_frame({"chunk": token}) for token in (tokens or [cached_response.answer]))
+    frames.append(_sse_frame({"answer": cached_response.answer, "done": True}))
+    return "".join(frames)
+
+
+async def _embed_query(
+    request: AskRequest,
+    embeddings_service,
+    rag_tracer: RAGTracer,
+    trace=None,
+) -> Optional[List[float]]:
+    """Embed the query with tracing, None if the embeddings service fails."""
+    with rag_tracer.trace_embedding(trace, request.query) as embedding_span:
+        try:
+            query_embedding = await embeddings_service.embed_query(request.query)
+            logger.info("Generated query embedding")
+            return query_embedding
+        except Exception as e:
+            logger.warning(f"Failed to generate embeddings, falling back to BM25: {e}")
+            if embedding_span:
+                rag_tracer.tracer.update_span(embedding_span, output={"success": False, "error": str(e)})
+            return None
+
+
 async def _prepare_chunks_and_sources(
     request: AskRequest,
     opensearch_client,
     embeddings_service,
     rag_tracer: RAGTracer,
     trace=None,
-) -> tuple[List[Dict], List[str], List[str]]:
-    """Retrieve and prepare chunks for RAG with clean tracing."""
+    retrieval_cache: Optional[RetrievalCache] = None,
+    deadline: Optional[float] = None,
+    embedding_task: Optional[asyncio.Future] = None,
+    cached_search: Optional[tuple[Optional[Dict], int]] = None,
+) -> tuple[List[Dict], List[str], List[str], str, bool]:
+    """Retrieve and prepare chunks for RAG with clean tracing.
+
+    deadline is the loop time the request's latency budget runs out, for callers that
+    started spending it before retrieval, embedding_task is a query embedding the caller
+    already started, used instead of embedding the query again, and cached_search is the
+    retrieval cache lookup for callers that already made it. The last two
+    elements are the search mode that actually ran, "bm25" after a fallback, and True when
+    retrieval ran out of the budget and the chunks come from partial results.
+    """
+    loop = asyncio.get_running_loop()
+    if deadline is None and request.latency_budget_ms:
+        deadline = loop.time() + request.latency_budget_ms / 1000
+
+    def remaining_budget() -> Optional[float]:
+        return None if deadline is None else max(0.0, deadline - loop.time())
+
+    def query_embedding_awaitable():
+        if embedding_task is not None:
+            return asyncio.shield(embedding_task)
+        return _embed_query(request, embeddings_service, rag_tracer, trace)
 
-    # Handle embeddings for hybrid search
     query_embedding = None
-    if request.use_hybrid:
-        with rag_tracer.trace_embedding(trace, request.query) as embedding_span:
-            try:
-                query_embedding = await embeddings_service.embed_query(request.query)
-                logger.info("Generated query embedding for hybrid search")
-            except Exception as e:
-                logger.warning(f"Failed to generate embeddings, falling back to BM25: {e}")
-                if embedding_span:
-                    rag_tracer.tracer.update_span(embedding_span, output={"success": False, "error": str(e)})
+    degraded = False
+
+    # Repeated searches are served from the retrieval cache without embedding the query
+    search_mode = "hybrid" if request.use_hybrid else "bm25"
+    search_results, generation = None, -1
+    # cached results were only stored when they ran in the requested mode
+    used_mode = search_mode
+    if cached_search is not None:
+        search_results, generation = cached_search
+    elif retrieval_cache is not None:
+        search_results, generation = await retrieval_cache.get(
+            request.query, search_mode, size=request.top_k, categories=request.categories
+        )
+
+    # Hybrid retrieval starts BM25 while the query is embedded
+    parallel_hybrid = (
+        search_results is None
+        and request.use_hybrid
+        and opensearch_client.settings.opensearch.parallel_hybrid
+    )
+
+    # Handle embeddings for hybrid search
+    if search_results is None and request.use_hybrid and not parallel_hybrid:
+        try:
+            query_embedding = await asyncio.wait_for(query_embedding_awaitable(), remaining_budget())
+        except asyncio.TimeoutError:
+            logger.warning("Query embedding exceeded the latency budget, falling back to BM25")
+            degraded = True
 
     # Search with tracing
     with rag_tracer.trace_search(trace, request.query, request.top_k) as search_span:
-        search_results = opensearch_client.search_unified(
-            query=request.query,
-            query_embedding=query_embedding,
-            size=request.top_k,
-            from_=0,
-            categories=request.categories,
-            use_hybrid=request.use_hybrid and query_embedding is not None,
-            min_score=0.0,
-        )
+        if search_results is None:
+            if parallel_hybrid:
+                search_results = await opensearch_client.search_hybrid_parallel(
+                    query=request.query,
+                    query_embedding=query_embedding_awaitable(),
+                    size=request.top_k,
+                    categories=request.categories,
+                    budget_seconds=remaining_budget(),
+                )
+                use_hybrid = search_results.get("search_mode") == "hybrid"
+            else:
+                use_hybrid = request.use_hybrid and query_embedding is not None
+                search_results = await opensearch_client.search_unified(
+                    query=request.query,
+                    query_embedding=query_embedding,
+                    size=request.top_k,
+                    from_=0,
+                    categories=request.categories,
+                    use_hybrid=use_hybrid,
+                    min_score=0.0,
+                    budget_seconds=remaining_budget(),
+                )
+
+            used_mode = "hybrid" if use_hybrid else "bm25"
+            degraded = degraded or search_results.get("degraded", False)
+
+            # results from a BM25 fallback or cut short by the budget are not what a later request asked for
+            if retrieval_cache is not None and use_hybrid == request.use_hybrid and not degraded:
+                await retrieval_cache.set(
+                    request.query, search_mode, request.top_k, search_results, generation, categories=request.categories
+                )
 
         # Extract essential data for LLM
         chunks = []
@@ -58,6 +182,8 @@ async def _prepare_chunks_and_sources(
             chunks.append(
                 {
                     "arxiv_id": arxiv_id,
+                    "title": hit.get("title", ""),
+                    "score": hit.get("score", 0.0),
                     "chunk_text": hit.get("chunk_text", hit.get("abstract", "")),
                 }
             )
@@ -70,19 +196,22 @@ async def _prepare_chunks_and_sources(
         # End search span with essential metadata
         rag_tracer.end_search(search_span, chunks, arxiv_ids, search_results.get("total", 0))
 
-    return chunks, list(sources_set), arxiv_ids
+    return chunks, list(sources_set), arxiv_ids, used_mode, degraded
 
 
 @ask_router.post("/ask", response_model=AskResponse)
 async def ask_question(
     request: AskRequest,
-    opensearch_client: OpenSearchDep,
+    opensearch_client: AsyncOpenSearchDep,
     embeddings_service: EmbeddingsDep,
     ollama_client: OllamaDep,
     langfuse_tracer: LangfuseDep,
     cache_client: CacheDep,
+    semantic_cache: SemanticCacheDep,
+    retrieval_cache: RetrievalCacheDep,
+    single_flight: SingleFlightDep,
 ) -> AskResponse:
-    """Clean RAG endpoint with essential tracing and exact match caching."""
+    """Clean RAG endpoint with essential tracing, exact match and semantic caching."""
 
     rag_tracer = RAGTracer(langfuse_tracer)
     start_time = time.time()
@@ -100,64 +229,122 @@ async def ask_question(
                 except Exception as e:
                     logger.warning(f"Cache check failed, proceeding with normal flow: {e}")
 
-            # Generate query embedding for hybrid search if needed
-            query_embedding = None
+            # Identical concurrent requests share one retrieval and generation
+            async def answer_question() -> AskResponse:
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + request.latency_budget_ms / 1000 if request.latency_budget_ms else None
+
+                # Cached retrieval results need no query embedding, so the semantic lookup is skipped for them
+                cached_search = None
+                if retrieval_cache is not None:
+                    cached_search = await retrieval_cache.get(
+                        request.query,
+                        "hybrid" if request.use_hybrid else "bm25",
+                        size=request.top_k,
+                        categories=request.categories,
+                    )
+
+                # The query embedding serves both the semantic lookup and retrieval, which starts meanwhile
+                embedding_task = None
+                if semantic_cache is not None and (cached_search is None or cached_search[0] is None):
+                    embedding_task = asyncio.ensure_future(_embed_query(request, embeddings_service, rag_tracer, trace))
+                retrieval = asyncio.ensure_future(
+                    _prepare_chunks_and_sources(
+                        request,
+                        opensearch_client,
+                        embeddings_service,
+                        rag_tracer,
+                        trace,
+                        retrieval_cache=retrieval_cache,
+                        deadline=deadline,
+                        embedding_task=embedding_task,
+                        cached_search=cached_search,
+                    )
+                )
+
+                try:
+                    # Then look for an answer to a near-duplicate question once the embedding is in
+                    query_embedding = None
+                    if embedding_task is not None:
+                        try:
+                            query_embedding = await asyncio.wait_for(
+                                asyncio.shield(embedding_task),
+                                None if deadline is None else max(0.0, deadline - loop.time()),
+                            )
+                        except asyncio.TimeoutError:
+                            logger.warning("Query embedding exceeded the latency budget, skipping the semantic cache")
+                        if query_embedding is not None:
+                            cached_response = semantic_cache.lookup(request, query_embedding)
+                            if cached_response:
+                                logger.info("Returning cached response for semantically similar query")
+                                return cached_response
+
+                    # Retrieve chunks
+                    chunks, sources, _, search_mode, degraded = await retrieval
+                finally:
+                    if not retrieval.done():
+                        retrieval.cancel()
+                        await asyncio.gather(retrieval, return_exceptions=True)
 
-            # Retrieve chunks
-            chunks, sources, _ = await _prepare_chunks_and_sources(
-                request, opensearch_client, embeddings_service, rag_tracer, trace
-            )
+                if not chunks:
+                    response = AskResponse(
+                        query=request.query,
+                        answer="I couldn't find any relevant information in the papers to answer your question.",
+                        sources=[],
+                        chunks_used=0,
+                        search_mode=search_mode,
+                        degraded=degraded,
+                    )
+                    rag_tracer.end_request(trace, response.answer, time.time() - start_time)
+                    return response
+
+                # Build prompt
+                with rag_tracer.trace_prompt_construction(trace, chunks) as prompt_span:
+                    prompt_builder = ollama_client.prompt_builder
 
-            if not chunks:
+                    try:
+                        prompt_data = prompt_builder.create_structured_prompt(request.query, chunks, request.model)
+                        final_prompt = prompt_data["prompt"]
+                    except Exception:
+                        final_prompt = prompt_builder.create_rag_prompt(request.query, chunks, request.model)
+
+                    rag_tracer.end_prompt(prompt_span, final_prompt)
+
+                # Generate answer
+                with rag_tracer.trace_generation(trace, request.model, final_prompt) as gen_span:
+                    rag_response = await ollama_client.generate_rag_answer(query=request.query, chunks=chunks, model=request.model)
+                    answer = rag_response.get("answer", "Unable to generate answer")
+                    rag_tracer.end_generation(gen_span, answer, request.model)
+
+                # Prepare response
                 response = AskResponse(
                     query=request.query,
-                    answer="I couldn't find any relevant information in the papers to answer your question.",
-                    sources=[],
-                    chunks_used=0,
-                    search_mode="bm25" if not request.use_hybrid else "hybrid",
+                    answer=answer,
+                    sources=sources,
+                    chunks_used=len(chunks),
+                    search_mode=search_mode,
+                    degraded=degraded,
                 )
-                rag_tracer.end_request(trace, response.answer, time.time() - start_time)
-                return response
 
-            # Build prompt
-            with rag_tracer.trace_prompt_construction(trace, chunks) as prompt_span:
-                from src.services.ollama.prompts import RAGPromptBuilder
+                rag_tracer.end_request(trace, answer, time.time() - start_time)
 
-                prompt_builder = RAGPromptBuilder()
+                # Answers built from partial retrieval are not cached
+                if degraded:
+                    return response
 
-                try:
-                    prompt_data = prompt_builder.create_structured_prompt(request.query, chunks)
-                    final_prompt = prompt_data["prompt"]
-                except Exception:
-                    final_prompt = prompt_builder.create_rag_prompt(request.query, chunks)
-
-                rag_tracer.end_prompt(prompt_span, final_prompt)
-
-            # Generate answer
-            with rag_tracer.trace_generation(trace, request.model, final_prompt) as gen_span:
-                rag_response = await ollama_client.generate_rag_answer(query=request.query, chunks=chunks, model=request.model)
-                answer = rag_response.get("answer", "Unable to generate answer")
-                rag_tracer.end_generation(gen_span, answer, request.model)
-
-            # Prepare response
-            response = AskResponse(
-                query=request.query,
-                answer=answer,
-                sources=sources,
-                chunks_used=len(chunks),
-                search_mode="bm25" if not request.use_hybrid else "hybrid",
-            )
+                # Store response in exact match cache
+                if cache_client:
+                    try:
+                        await cache_client.store_response(request, response)
+                    except Exception as e:
+                        logger.warning(f"Failed to store response in cache: {e}")
 
-            rag_tracer.end_request(trace, answer, time.time() - start_time)
+                if semantic_cache is not None and query_embedding is not None:
+                    semantic_cache.store(request, query_embedding, response)
 
-            # Store response in exact match cache
-            if cache_client:
-                try:
-                    await cache_client.store_response(request, response)
-                except Exception as e:
-                    logger.warning(f"Failed to store response in cache: {e}")
+                return response
 
-            return response
+            return await single_flight.do(ask_cache_key(request), answer_question)
 
         except Exception as e:
             logger.error(f"Error processing request: {e}")
@@ -167,104 +354,112 @@ async def ask_question(
 @stream_router.post("/stream")
 async def ask_question_stream(
     request: AskRequest,
-    opensearch_client: OpenSearchDep,
+    opensearch_client: AsyncOpenSearchDep,
     embeddings_service: EmbeddingsDep,
     ollama_client: OllamaDep,
     langfuse_tracer: LangfuseDep,
     cache_client: CacheDep,
+    retrieval_cache: RetrievalCacheDep,
+    stream_broadcaster: StreamBroadcasterDep,
+    settings: SettingsDep,
+    http_request: Request,
 ) -> StreamingResponse:
-    """Clean streaming RAG endpoint."""
+    """Clean streaming RAG endpoint, served as text/event-stream and cancelled when the client disconnects."""
 
     async def generate_stream():
         rag_tracer = RAGTracer(langfuse_tracer)
         start_time = time.time()
 
         with rag_tracer.trace_request("api_user", request.query) as trace:
-            try:
-                # Check exact cache first
-                if cache_client:
-                    try:
-                        cached_response = await cache_client.find_cached_response(request)
-                        if cached_response:
-                            logger.info("Returning cached response for exact streaming query match")
-
-                            # Send metadata first (same format as non-cached)
-                            metadata_response = {
-                                "sources": cached_response.sources,
-                                "chunks_used": cached_response.chunks_used,
-                                "search_mode": cached_response.search_mode,
-                            }
-                            yield f"data: {json.dumps(metadata_response)}\n\n"
-
-                            # Stream the cached response in chunks
-                            for chunk in cached_response.answer.split():
-                                yield f"data: {json.dumps({'chunk': chunk + ' '})}\n\n"
-
-                            # Send completion signal with just the final answer
-                            yield f"data: {json.dumps({'answer': cached_response.answer, 'done': True})}\n\n"
-                            return
-                    except Exception as e:
-                        logger.warning(f"Cache check failed, proceeding with normal flow: {e}")
-
-                # Retrieve chunks
-                chunks, sources, _ = await _prepare_chunks_and_sources(
-                    request, opensearch_client, embeddings_service, rag_tracer, trace
-                )
-
-                if not chunks:
-                    yield f"data: {json.dumps({'answer': 'No relevant information found.', 'sources': [], 'done': True})}\n\n"
-                    return
-
-                # Send metadata first
-                search_mode = "bm25" if not request.use_hybrid else "hybrid"
-                metadata_response = {"sources": sources, "chunks_used": len(chunks), "search_mode": search_mode}
-                yield f"data: {json.dumps(metadata_response)}\n\n"
-
-                # Build prompt
-                with rag_tracer.trace_prompt_construction(trace, chunks) as prompt_span:
-                    from src.services.ollama.prompts import RAGPromptBuilder
-
-                    prompt_builder = RAGPromptBuilder()
-                    final_prompt = prompt_builder.create_rag_prompt(request.query, chunks)
-                    rag_tracer.end_prompt(prompt_span, final_prompt)
+            # Check exact cache first
+            if cache_client:
+                try:
+                    cached_response, tokens = await cache_client.find_cached_stream(request)
+                    if cached_response:
+                        logger.info("Returning cached response for exact streaming query match")
+                        yield _replay_frames(cached_response, tokens)
+                        return
+                except Exception as e:
+                    logger.warning(f"Cache check failed, proceeding with normal flow: {e}")
 
-                # Stream generation
-                with rag_tracer.trace_generation(trace, request.model, final_prompt) as gen_span:
-                    full_response = ""
-                    async for chunk in ollama_client.generate_rag_answer_stream(
-                        query=request.query, chunks=chunks, model=request.model
-                    ):
-                        if chunk.get("response"):
-                            text_chunk = chunk["response"]
-                            full_response += text_chunk
-                            yield f"data: {json.dumps({'chunk': text_chunk})}\n\n"
-
-                        if chunk.get("done", False):
-                            rag_tracer.end_generation(gen_span, full_response, request.model)
-                            yield f"data: {json.dumps({'answer': full_response, 'done': True})}\n\n"
-                            break
-
-                rag_tracer.end_request(trace, full_response, time.time() - start_time)
+            # Identical concurrent streams subscribe to one live generation
+            async def live_stream():
+                try:
+                    # Retrieve chunks
+                    chunks, sources, _, search_mode, degraded = await _prepare_chunks_and_sources(
+                        request, opensearch_client, embeddings_service, rag_tracer, trace, retrieval_cache=retrieval_cache
+                    )
+
+                    if not chunks:
+                        yield _sse_frame({'answer': 'No relevant information found.', 'sources': [], 'done': True})
+                        return
+
+                    # Send metadata first
+                    metadata_response = {
+                        "sources": sources,
+                        "chunks_used": len(chunks),
+                        "search_mode": search_mode,
+                        "degraded": degraded,
+                    }
+                    yield _sse_frame(metadata_response)
+
+                    # Build prompt
+                    with rag_tracer.trace_prompt_construction(trace, chunks) as prompt_span:
+                        final_prompt = ollama_client.prompt_builder.create_rag_prompt(request.query, chunks, request.model)
+                        rag_tracer.end_prompt(prompt_span, final_prompt)
+
+                    # Stream generation
+                    with rag_tracer.trace_generation(trace, request.model, final_prompt) as gen_span:
+                        full_response = ""
+                        # token boundaries as streamed, so a cached replay sends the same frames
+                        tokens: List[str] = []
+                        async for chunk in ollama_client.generate_rag_answer_stream(
+                            query=request.query, chunks=chunks, model=request.model
+                        ):
+                            if chunk.get("response"):
+                                text_chunk = chunk["response"]
+                                full_response += text_chunk
+                                tokens.append(text_chunk)
+                                yield _sse_frame({'chunk': text_chunk})
+
+                            if chunk.get("done", False):
+                                rag_tracer.end_generation(gen_span, full_response, request.model)
+                                yield _sse_frame({'answer': full_response, 'done': True})
+                                break
+
+                    rag_tracer.end_request(trace, full_response, time.time() - start_time)
+
+                    # Store response in exact match cache
+                    if cache_client and full_response and not degraded:
+                        try:
+                            response_to_cache = AskResponse(
+                                query=request.query,
+                                answer=full_response,
+                                sources=sources,
+                                chunks_used=len(chunks),
+                                search_mode=search_mode,
+                            )
+                            await cache_client.store_response(request, response_to_cache, tokens)
+                        except Exception as e:
+                            logger.warning(f"Failed to store streaming response in cache: {e}")
 
-                # Store response in exact match cache
-                if cache_client and full_response:
-                    try:
-                        search_mode = "bm25" if not request.use_hybrid else "hybrid"
-                        response_to_cache = AskResponse(
-                            query=request.query,
-                            answer=full_response,
-                            sources=sources,
-                            chunks_used=len(chunks),
-                            search_mode=search_mode,
-                        )
-                        await cache_client.store_response(request, response_to_cache)
-                    except Exception as e:
-                        logger.warning(f"Failed to store streaming response in cache: {e}")
+                except Exception as e:
+                    logger.error(f"Streaming error: {e}")
+                    yield _sse_frame({'error': str(e)})
 
-            except Exception as e:
-                logger.error(f"Streaming error: {e}")
-                yield f"data: {json.dumps({'error': str(e)})}\n\n"
+            # closing the subscription on disconnect lets the broadcaster cancel generation
+            async with aclosing(stream_broadcaster.subscribe(ask_cache_key(request), live_stream)) as events:
+                async for event in events:
+                    yield event
 
     return StreamingResponse(
-        generate_stream(), media_type="text/plain", headers={"Cache-Control": "no-cache", "Connection": "keep-alive"}
+        sse_event_stream(
+            generate_stream(),
+            http_request,
+            flush_interval_ms=settings.streaming.flush_interval_ms,
+            heartbeat_interval_seconds=settings.streaming.heartbeat_interval_seconds,
+            queue_size=settings.streaming.queue_size,
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
     )
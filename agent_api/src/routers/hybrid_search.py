@@ -1,6 +1,8 @@
+import asyncio
+import time
 from loguru import logger
 from fastapi import APIRouter, HTTPException
-from src.dependencies import EmbeddingsDep,OpenSearchDep
+from src.dependencies import AsyncOpenSearchDep,EmbeddingsDep,OpenSearchHealthDep,RetrievalCacheDep
 
 from pydantic import BaseModel,Field
 from typing import List,Optional
@@ -15,6 +17,9 @@ class HybridSearchRequest(BaseModel):
     latest_papers: bool = Field(False, description="Sort by publication date instead of relevance")
     use_hybrid: bool = Field(True, description="Enable hybrid search (BM25 + vector) with automatic embedding generation")
     min_score: float = Field(0.0, description="Minimum score threshold for results", ge=0.0)
+    latency_budget_ms: Optional[int] = Field(
+        None, description="Search latency budget, partial results are returned once it runs out", ge=10, le=60000
+    )
 
     class Config:
         allow_population_by_field_name = True
@@ -56,6 +61,7 @@ class SearchResponse(BaseModel):
     size: int = Field(description="Number of results requested")
     from_: int = Field(alias="from", description="Offset used for pagination")
     search_mode: Optional[str] = Field(None, description="Search mode used: bm25, vector, or hybrid")
+    degraded: bool = Field(False, description="Search ran out of its latency budget and returned partial results")
     error: Optional[str] = None
 
     class Config:
@@ -65,32 +71,70 @@ router = APIRouter(prefix="/hybrid-search",tags =["hybrid-search"])
 
 @router.post("/",response_model = SearchResponse)
 async def hybrid_search(
-    request:HybridSearchRequest,opensearch_client:OpenSearchDep,embeddings_service: EmbeddingsDep
+    request:HybridSearchRequest,
+    opensearch_client:AsyncOpenSearchDep,
+    embeddings_service: EmbeddingsDep,
+    opensearch_health: OpenSearchHealthDep,
+    retrieval_cache: RetrievalCacheDep,
 )->SearchResponse:
     try:
-        if not opensearch_client.health_check():
+        if not opensearch_health.allow_request():
             raise HTTPException(status_code=503,detail = "Search Service is currently unavailable")
         
-        query_embedding = None
-        if request.use_hybrid:
-            try:
-                query_embedding = await embeddings_service.embed_query(request.query)
-                logger.info("Generated Query Embedding for hybrid search")
-            except Exception as e:
-                logger.warning(f"Failed to generate embedding for the query")
-                query_embedding = None
-        logger.info(f"Hybrud Seach: {request.query} (hybrid: {request.use_hybrid and query_embedding is not None})")
-
-        results = opensearch_client.search_unified(
-            query = request.query,
-            query_embedding = query_embedding,
+        # the latency budget covers the embedding call and the search together
+        deadline = time.monotonic() + request.latency_budget_ms / 1000 if request.latency_budget_ms else None
+
+        def remaining_budget() -> Optional[float]:
+            return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        search_mode = "hybrid" if request.use_hybrid else "bm25"
+        cache_filters = dict(
             size = request.size,
-            from_ = request.categories,
+            from_ = request.from_,
+            categories = request.categories,
             latest = request.latest_papers,
-            use_hybrid = request.use_hybrid,
             min_score = request.min_score,
         )
 
+        results, generation = None, -1
+        if retrieval_cache is not None:
+            results, generation = await retrieval_cache.get(request.query, search_mode, **cache_filters)
+
+        if results is None:
+            degraded = False
+            query_embedding = None
+            if request.use_hybrid:
+                try:
+                    query_embedding = await asyncio.wait_for(embeddings_service.embed_query(request.query),remaining_budget())
+                    logger.info("Generated Query Embedding for hybrid search")
+                except asyncio.TimeoutError:
+                    logger.warning(f"Query embedding exceeded the latency budget, using BM25 only")
+                    degraded = True
+                except Exception as e:
+                    logger.warning(f"Failed to generate embedding for the query")
+                    query_embedding = None
+
+            if request.use_hybrid and query_embedding is None:
+                search_mode = "bm25"
+            logger.info(f"Hybrud Seach: {request.query} (hybrid: {search_mode == 'hybrid'})")
+
+            results = await opensearch_client.search_unified(
+                query = request.query,
+                query_embedding = query_embedding,
+                use_hybrid = request.use_hybrid,
+                budget_seconds = remaining_budget(),
+                **cache_filters,
+            )
+
+            results["degraded"] = degraded or results.get("degraded",False)
+
+            if (
+                retrieval_cache is not None
+                and not results["degraded"]
+                and search_mode == ("hybrid" if request.use_hybrid else "bm25")
+            ):
+                await retrieval_cache.set(request.query, search_mode, results = results, generation = generation, **cache_filters)
+
         hits = []
         for hit in results.get("hits",[]):
             hits.append(
@@ -114,7 +158,8 @@ async def hybrid_search(
             hits = hits,
             size = request.size,
              **{"from": request.from_},
-            search_mode="hybrid" if (request.use_hybrid and query_embedding) else "bm25",
+            search_mode=search_mode,
+            degraded=results.get("degraded",False),
         )
 
         return search_response
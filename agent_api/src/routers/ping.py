@@ -1,9 +1,8 @@
 from fastapi import APIRouter
 from sqlalchemy import text
 
-from ..dependencies import DatabaseDep, OpenSearchDep, SettingsDep
+from ..dependencies import DatabaseDep, OllamaDep, OpenSearchDep, SettingsDep
 from ..schemas.api.health import HealthResponse, ServiceStatus
-from ..services.ollama import OllamaClient
 
 router = APIRouter()
 
@@ -17,7 +16,8 @@ async def ping():
 async def health_check(
     settings:SettingsDep,
     database:DatabaseDep,
-    opensearch_client:OpenSearchDep
+    opensearch_client:OpenSearchDep,
+    ollama_client:OllamaDep,
 ) -> HealthResponse:
     """Health checkpoint for monitoring and load balance"""
 
@@ -46,7 +46,6 @@ async def health_check(
     _check_service("opensearch",_check_opensearch)
 
     try:
-        ollama_client = OllamaClient(settings)
         ollama_health = await ollama_client.health_check()
         services["ollama"] = ServiceStatus(status = ollama_health["status"],message = ollama_health["message"])
         if ollama_health["status"] != "healthy":
@@ -11,6 +11,9 @@ class AskRequest(BaseModel):
     use_hybrid: bool = Field(True, description="Use hybrid search (BM25 + vector)")
     model: str = Field("llama3.2:1b", description="Ollama model to use for generation")
     categories: Optional[List[str]] = Field(None, description="Filter by arXiv categories")
+    latency_budget_ms: Optional[int] = Field(
+        None, description="Retrieval latency budget, partial results are used once it runs out", ge=10, le=60000
+    )
 
     class Config:
         json_schema_extra = {
@@ -32,6 +35,7 @@ class AskResponse(BaseModel):
     sources: List[str] = Field(..., description="PDF URLs of source papers")
     chunks_used: int = Field(..., description="Number of chunks used for generation")
     search_mode: str = Field(..., description="Search mode used: bm25 or hybrid")
+    degraded: bool = Field(False, description="Retrieval ran out of its latency budget and used partial results")
 
     class Config:
         json_schema_extra = {
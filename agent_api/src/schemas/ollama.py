@@ -3,7 +3,7 @@ from typing import List , Optional
 from pydantic import BaseModel , Field
 
 class RAGResponse(BaseModel):
-    answer: str = Field(desciption = "Comprehensive answer based on the provided paper")
+    answer: str = Field(description = "Comprehensive answer based on the provided paper")
     sources: List[str] = Field(
         default_factory = list,
         description = "List of PDF URLs from papers"
@@ -12,7 +12,7 @@ class RAGResponse(BaseModel):
         default = None,
         description = "Confidence level , high , medium or low"
     )
-    citiations = Optional[list[str]] = Field(
+    citations: Optional[List[str]] = Field(
         default = None,
         description = "Specific arxiv IDS or papers titles referred in the answer"
     )
\ No newline at end of file
@@ -6,6 +6,7 @@ from pydantic import BaseModel , Field
 class ParserType(str,Enum):
     """PDF parser types"""
     DOCLING = "docling"
+    PDFIUM = "pdfium"
 
 class PaperSection(BaseModel):
     """Represents a section of a paper"""
@@ -12,12 +12,15 @@ from src.config import ArxivSettings
 from src.exceptions import ArxivAPIException, ArxivAPITimeoutError , ArxivParseError, PDFDownloadException, PDFDownloadTimeoutError
 from src.schemas.arxiv.paper import ArxivPaper
 
+from .downloader import PDFDownloadManager
+
 class ArxivClient:
     """Client for fetching papers from arxiv API"""
 
     def __init__(self,settings:ArxivSettings):
         self._settings = settings
         self._last_request_time: Optional[float] = None
+        self.downloader = PDFDownloadManager(settings)
 
     @cached_property
     def pdf_cache_dir(self)->Path:
@@ -295,74 +298,47 @@ class ArxivClient:
             logger.error(f"No PDF URL for paperr {paper.arxiv_id}")
             return None
         
-        pdf_path = self._get_pdf_url(paper.arxiv_id)
+        pdf_path = self._get_pdf_path(paper.arxiv_id)
 
         if pdf_path.exists() and not force_download:
+            logger.info(f"Using cached PDF {pdf_path.name}")
             return pdf_path
-        else:
-            return None
-        
-    def _get_pdf_path(self,arxiv_id:str)->Path:
-        """Get the local path for a PDF File"""
-
-        safe_filename = arxiv_id.replace("/","_") + ".pdf"
-        return self.pdf_cache_dir /  safe_filename
-    
-    async def _download_with_retry(self,url:str,path:Path,max_retries:Optional[int]=None)->bool:
-        """Download file with retry logic"""
-
-        if max_retries is None:
-            max_retries = self._settings.download_max_retries
-        
-        logger.info(f"Downloading PDF from {url}")
 
-        await asyncio.sleep(self.rate_limit_delay)
+        if await self._download_with_retry(paper.pdf_url,pdf_path,force=force_download):
+            return pdf_path
+        return None
 
-        for attempt in range(self.rate_limit_delay):
-            try:
-                async with httpx.AsyncClient(timeout = float(self.timeout_seconds)) as client:
-                    async with client.stream("GET",url) as response:
-                        response.raise_for_status()
+    async def download_pdfs(self,papers:List[ArxivPaper],force_download:bool = False)-> Dict[str,Optional[Path]]:
+        """Download PDFs for many papers concurrently, bounded by max_concurrent_downloads
 
-                        with open(path,"wb") as f:
-                            async for chunk in response.aiter_bytes():
-                                f.write(chunk)
-                logger.info(f"Successfully downloaded to {path.name}")
-                return True
-            
-            except httpx.TimeoutException as e:
-                if attempt < max_retries -1:
-                    wait_time = self._settings.download_retry_delay_base * (attempt+1)
-                    logger.warning(f"PDF Download timeout (attempt {attempt+1}/{max_retries}): {e}")
-                    logger.info(f"Retrying in {wait_time}s...")
-                    await asyncio.sleep(wait_time)
-                else:
-                    logger.error(f"PDF Download failed after {max_retries} attempts due to timeout: {e}")
-                    raise PDFDownloadTimeoutError(f"PDF Download timed out after {max_retries} attempts : {e}")
-            except httpx.HTTPError as e:
-                if attempt < max_retries -1:
-                    wait_time = self._settings.download_retry_delay_base * (attempt+1)
-                    logger.warning(f"PDF Download timeout (attempt {attempt+1}/{max_retries}): {e}")
-                    logger.info(f"Retrying in {wait_time}s...")
-                    await asyncio.sleep(wait_time)
-                else:
-                    logger.error(f"PDF Download failed after {max_retries} attempts due to timeout: {e}")
-                    raise PDFDownloadTimeoutError(f"PDF Download timed out after {max_retries} attempts : {e}")
-
-            except Exception as e:
-                logger.error(f"Unexpected download error: {e}")
-                raise PDFDownloadException(f"Unexpected error during PDF Download: {e}")
-
-
-        if path.exists():
-            path.unlink()
-        return False
+        Returns the local path per arxiv id, None for papers without a PDF URL or whose
+        download failed.
+        """
+        items = [(paper.pdf_url,self._get_pdf_path(paper.arxiv_id)) for paper in papers if paper.pdf_url]
+        errors = await self.downloader.download_many(items,force=force_download)
+
+        paths = {}
+        for paper in papers:
+            pdf_path = self._get_pdf_path(paper.arxiv_id)
+            error = errors.get(pdf_path) if paper.pdf_url else PDFDownloadException("No PDF URL")
+            if error is not None:
+                logger.error(f"Failed to download PDF for {paper.arxiv_id}: {error}")
+                paths[paper.arxiv_id] = None
+            else:
+                paths[paper.arxiv_id] = pdf_path
 
+        logger.info(f"Downloaded {sum(path is not None for path in paths.values())}/{len(papers)} PDFs")
+        return paths
         
+    def _get_pdf_path(self,arxiv_id:str)->Path:
+        """Get the local path for a PDF File"""
 
+        safe_filename = arxiv_id.replace("/","_") + ".pdf"
+        return self.pdf_cache_dir /  safe_filename
     
+    async def _download_with_retry(self,url:str,path:Path,force:bool = False)->bool:
+        """Download file with retry logic, resuming partial transfers, on the shared pooled downloader"""
+        return await self.downloader.download(url,path,force=force)
 
-    
-    
-                
-    
\ No newline at end of file
+    async def close(self)->None:
+        await self.downloader.close()
@@ -0,0 +1,183 @@
+import asyncio
+import os
+import time
+from loguru import logger
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import httpx
+from src.config import ArxivSettings
+from src.exceptions import PDFDownloadException, PDFDownloadTimeoutError
+
+# statuses worth retrying; anything else in the 4xx range is a permanent failure
+_RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Token bucket rate limiter shared by every download of a client
+
+    Allows bursts of up to capacity requests and rate requests per second after that.
+    Callers reserve a token synchronously and sleep for any deficit, so the bucket needs no
+    lock and works across event loops.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+
+    def _reserve(self) -> float:
+        """Take one token and return how long the caller has to wait before using it"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self) -> None:
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class PDFDownloadManager:
+    """Concurrent PDF downloader on one pooled HTTP client
+
+    At most max_concurrent_downloads transfers run at once and every request start takes a
+    token from a shared bucket, so the fan-out stays within arXiv's rate policy. Data is
+    written to a .part file next to the target; a retry or a later run resumes it with an
+    HTTP Range request, and the file is renamed into place only once it is complete.
+    """
+
+    def __init__(self, settings: ArxivSettings):
+        self._settings = settings
+        self.max_retries = settings.download_max_retries
+        self.retry_delay_base = settings.download_retry_delay_base
+        rate = settings.download_rate_per_second or 1.0 / settings.rate_limit_delay
+        self.rate_limiter = TokenBucket(rate, settings.download_burst)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _bind_loop(self) -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        """Client and semaphore for the running loop
+
+        Airflow tasks run every batch in a fresh event loop and connections cannot outlive
+        the loop that opened them, so both are recreated when the loop changes.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(float(self._settings.timout_seconds)),
+                limits=httpx.Limits(
+                    max_connections=self._settings.max_concurrent_downloads,
+                    max_keepalive_connections=self._settings.max_concurrent_downloads,
+                ),
+                follow_redirects=True,
+            )
+            self._semaphore = asyncio.Semaphore(self._settings.max_concurrent_downloads)
+            self._loop = loop
+        return self._client, self._semaphore
+
+    async def _transfer(self, client: httpx.AsyncClient, url: str, part_path: Path) -> None:
+        """Fetch url into part_path, resuming from its current size when the server supports ranges"""
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+        await self.rate_limiter.acquire()
+
+        async with client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 416:
+                # the part file is already complete or the remote file changed, start over
+                part_path.unlink(missing_ok=True)
+                raise httpx.HTTPStatusError("Range not satisfiable", request=response.request, response=response)
+
+            response.raise_for_status()
+
+            if offset and response.status_code == 206:
+                mode = "ab"
+                logger.info(f"Resuming {part_path.name} from byte {offset}")
+            else:
+                mode = "wb"
+                offset = 0
+
+            expected = response.headers.get("Content-Length")
+            written = 0
+            with open(part_path, mode) as f:
+                # write chunks as they arrive so a dropped connection loses as little as possible
+                async for chunk in response.aiter_bytes():
+                    f.write(chunk)
+                    written += len(chunk)
+
+        if expected is not None and written < int(expected):
+            raise httpx.ReadError(f"Connection closed after {offset + written} bytes")
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = error.response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return float(retry_after)
+        return self.retry_delay_base * (attempt + 1)
+
+    async def download(self, url: str, path: Path, force: bool = False) -> bool:
+        """Download url to path, returns True once path holds the complete file"""
+        if path.exists() and not force:
+            return True
+
+        client, semaphore = self._bind_loop()
+        part_path = path.with_name(path.name + ".part")
+        if force:
+            part_path.unlink(missing_ok=True)
+
+        async with semaphore:
+            for attempt in range(self.max_retries):
+                try:
+                    logger.info(f"Downloading PDF from {url}")
+                    await self._transfer(client, url, part_path)
+                    os.replace(part_path, path)
+                    logger.info(f"Successfully downloaded to {path.name}")
+                    return True
+
+                except (httpx.TimeoutException, httpx.TransportError, httpx.HTTPStatusError) as e:
+                    if isinstance(e, httpx.HTTPStatusError) and e.response.status_code not in _RETRYABLE_STATUS | {416}:
+                        logger.error(f"PDF Download failed for {url}: {e}")
+                        part_path.unlink(missing_ok=True)
+                        raise PDFDownloadException(f"PDF Download failed with status {e.response.status_code}: {url}")
+
+                    if attempt < self.max_retries - 1:
+                        wait_time = self._retry_delay(attempt, e)
+                        logger.warning(f"PDF Download error (attempt {attempt+1}/{self.max_retries}): {e}")
+                        logger.info(f"Retrying in {wait_time}s...")
+                        await asyncio.sleep(wait_time)
+                    elif isinstance(e, httpx.TimeoutException):
+                        logger.error(f"PDF Download failed after {self.max_retries} attempts due to timeout: {e}")
+                        raise PDFDownloadTimeoutError(f"PDF Download timed out after {self.max_retries} attempts : {e}")
+                    else:
+                        logger.error(f"PDF Download failed after {self.max_retries} attempts: {e}")
+                        raise PDFDownloadException(f"PDF Download failed after {self.max_retries} attempts : {e}")
+
+                except OSError as e:
+                    logger.error(f"Failed to write {path.name}: {e}")
+                    raise PDFDownloadException(f"Failed to write PDF {path.name}: {e}")
+
+        return False
+
+    async def download_many(self, items: Sequence[Tuple[str, Path]], force: bool = False) -> Dict[Path, Optional[Exception]]:
+        """Download every (url, path) concurrently, returning the error per path or None on success"""
+
+        async def run(url: str, path: Path) -> Optional[Exception]:
+            try:
+                await self.download(url, path, force)
+                return None
+            except Exception as e:
+                return e
+
+        results: List[Optional[Exception]] = await asyncio.gather(*[run(url, path) for url, path in items])
+        return {path: error for (_, path), error in zip(items, results)}
+
+    async def close(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._loop = None
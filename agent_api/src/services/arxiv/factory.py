@@ -7,6 +7,6 @@ def make_arxiv_client()-> ArxivClient:
     """
     Factory function to create an Arxiv Client instance
     """
-    settings = get_settings
-    client = ArxivClient()
+    settings = get_settings()
+    client = ArxivClient(settings=settings.arxiv)
     return client
\ No newline at end of file
@@ -1,69 +1,198 @@
+import asyncio
 import hashlib
 import json
+import zlib
 from loguru import logger
-from datetime import timedelta
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-import redis
+import msgpack
+import redis.asyncio as aioredis
 from src.config import RedisSettings
 from src.schemas.api.ask import AskRequest , AskResponse
 
+# first byte of every stored value, tells readers whether the msgpack payload is compressed
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+
+
+def pack_value(value: Any, compression_threshold: int = 0) -> bytes:
+    """Encode a value with msgpack, zlib compressing payloads larger than compression_threshold bytes"""
+    payload = msgpack.packb(value, use_bin_type=True)
+
+    if compression_threshold > 0 and len(payload) > compression_threshold:
+        return _ZLIB + zlib.compress(payload, 6)
+
+    return _RAW + payload
+
+
+def unpack_value(data: bytes) -> Any:
+    """Decode a value written by pack_value"""
+    marker, payload = data[:1], data[1:]
+
+    if marker == _ZLIB:
+        payload = zlib.decompress(payload)
+    elif marker != _RAW:
+        raise ValueError(f"Unknown cache value encoding: {marker!r}")
+
+    return msgpack.unpackb(payload, raw=False)
+
+
+def ask_cache_key(request: AskRequest) -> str:
+    """Exact match key for an ask request, also used to coalesce identical in-flight requests"""
+    key_data = {
+        "query": request.query,
+        "model": request.model,
+        "top_k": request.top_k,
+        "use_hybrid": request.use_hybrid,
+        "categories": sorted(request.categories) if request.categories else [],
+    }
+
+    key_string = json.dumps(key_data,sort_keys= True)
+    key_hash = hashlib.sha256(key_string.encode()).hexdigest()[:16]
+
+    return f"exact_cache:{key_hash}"
+
+
 class CacheClient:
-    """Redis-based exact match cache for RAG queries"""
+    """Redis-based exact match cache for RAG queries
 
-    def __init__(self,redis_client:redis.Redis,settings: RedisSettings):
+    Uses redis.asyncio on a shared connection pool so lookups never block the event loop.
+    Multi-key reads use MGET and multi-key writes a single non-transactional pipeline.
+    """
+
+    def __init__(self,redis_client:aioredis.Redis,settings: RedisSettings):
         self.redis = redis_client
         self.settings = settings
-        self.ttl = timedelta(hours = settings.ttl_hours)
+        self.ttl_seconds = settings.ttl_hours * 3600
+        self.compression_threshold = settings.compression_threshold_bytes
+        self.lookup_timeout = settings.lookup_timeout_ms / 1000
 
     def _generate_cache_key(self,request: AskRequest)-> str:
         """Generate exact cache key based on request parameters"""
-        key_data = {
-            "query": request.query,
-            "model": request.model,
-            "top_k": request.top_k,
-            "use_hybrid": request.use_hybrid,
-            "categories": sorted(request.categoires) if request.categories else [],
-        }
-
-        key_string = json.dumps(key_data,sort_keys= True)
-        key_hash = hashlib.sha256(key_string.encode()).hexdigest()[:16]
-
-        return f"exacr_cache:{key_hash}"
-    
+        return ask_cache_key(request)
+
+    def _generate_stream_key(self,request: AskRequest)-> str:
+        """Key for the streamed token sequence of a cached answer"""
+        return ask_cache_key(request).replace("exact_cache:","exact_stream:",1)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """Fetch and decode several keys in one round trip, missing or undecodable keys come back as None
+
+        A lookup slower than lookup_timeout_ms is treated as a miss for every key.
+        """
+        if not keys:
+            return []
+
+        try:
+            raw_values = await asyncio.wait_for(self.redis.mget(list(keys)), self.lookup_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Cache lookup timed out after {self.lookup_timeout * 1000:.0f}ms, treating as miss")
+            return [None] * len(keys)
+
+        values = []
+        for raw in raw_values:
+            if raw is None:
+                values.append(None)
+                continue
+            try:
+                values.append(unpack_value(raw))
+            except Exception as e:
+                logger.warning(f"Failed to deserialize cached value: {e}")
+                values.append(None)
+
+        return values
+
+    async def set_many(self, items: Sequence[Tuple[str, Any]], ttl_seconds: Optional[int] = None) -> bool:
+        """Encode and store several keys with a TTL in one pipelined round trip"""
+        if not items:
+            return True
+
+        ttl_seconds = ttl_seconds or self.ttl_seconds
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value in items:
+                pipe.set(key, pack_value(value, self.compression_threshold), ex=ttl_seconds)
+            results = await pipe.execute()
+
+        return all(results)
+
+    async def find_cached_responses(self, requests: Sequence[AskRequest]) -> List[Optional[AskResponse]]:
+        """Find cached responses for several requests with a single MGET"""
+        try:
+            cached = await self.get_many([self._generate_cache_key(request) for request in requests])
+            return [AskResponse(**data) if data else None for data in cached]
+        except Exception as e:
+            logger.error(f"Error checking cache: {e}")
+            return [None] * len(requests)
+
     async def find_cached_response(self, request: AskRequest)-> Optional[AskResponse]:
         """Find cached response for exact query match"""
+        cached_response = (await self.find_cached_responses([request]))[0]
+
+        if cached_response:
+            logger.info(f"Cache hit for exact match query")
+
+        return cached_response
+
+    async def find_cached_stream(self, request: AskRequest) -> Tuple[Optional[AskResponse], Optional[List[str]]]:
+        """Find a cached response and the tokens it was streamed as, fetched together in one MGET
+
+        Tokens are None when the answer was cached by /ask rather than by a stream.
+        """
         try:
-            cache_key = self._generate_cache_key(request)
-
-            cached_response = self.redis.get(cache_key)
-
-            if cached_response:
-                try:
-                    response_data = json.loads(cached_response)
-                    logger.info(f"Cache hit for exact match query")
-                    return AskResponse(**response_data)
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Failed to deserialize cached response: {e}")
-                    return None
-            return None
+            data, tokens = await self.get_many([self._generate_cache_key(request), self._generate_stream_key(request)])
+            if not data:
+                return None, None
+            response = AskResponse(**data)
+            # tokens left over from an earlier answer must not be replayed with this one
+            if tokens is not None and "".join(tokens) != response.answer:
+                tokens = None
+            logger.info(f"Cache hit for exact match streaming query")
+            return response, tokens
         except Exception as e:
             logger.error(f"Error checking cache: {e}")
-            return None
-        
-    async def store_response(self,request: AskRequest,response: AskResponse)-> bool:
-        """Store response for exact query matching"""
+            return None, None
+
+    async def store_responses(self, items: Sequence[Tuple[AskRequest, AskResponse]]) -> bool:
+        """Store several responses in one pipelined write"""
         try:
-            cache_key = self._generate_cache_key(request)
+            return await self.set_many(
+                [(self._generate_cache_key(request), response.model_dump()) for request, response in items]
+            )
+        except Exception as e:
+            logger.error((f"Error storing in cache: {e}"))
+            return False
 
-            success = self.redis.set(cache_key,response.model_dump_json(),ex = self.ttl)
+    async def store_response(self,request: AskRequest,response: AskResponse,tokens: Optional[List[str]] = None)-> bool:
+        """Store response for exact query matching, with the original token boundaries when it was streamed"""
+        if tokens is None:
+            success = await self.store_responses([(request, response)])
+        else:
+            try:
+                success = await self.set_many(
+                    [
+                        (self._generate_cache_key(request), response.model_dump()),
+                        (self._generate_stream_key(request), tokens),
+                    ]
+                )
+            except Exception as e:
+                logger.error((f"Error storing in cache: {e}"))
+                success = False
 
-            if success:
-                logger.info(f"Stored response in exact cache with key {cache_key[:16]}...")
-                return True
-            else:
-                logger.warning(f"Failed to store response in cache")
-                return False
+        if success:
+            logger.info(f"Stored response in exact cache with key {self._generate_cache_key(request)[:16]}...")
+        else:
+            logger.warning(f"Failed to store response in cache")
+
+        return success
+
+    async def ping(self) -> bool:
+        try:
+            return await self.redis.ping()
         except Exception as e:
-            logger.error((f"Error storing in cache: {e}"))
-            return False
\ No newline at end of file
+            logger.warning(f"Redis ping failed: {e}")
+            return False
+
+    async def close(self) -> None:
+        """Close the client and disconnect the pool it owns"""
+        await self.redis.aclose(close_connection_pool=True)
@@ -0,0 +1,123 @@
+import asyncio
+from loguru import logger
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Collapse concurrent calls that share a key into a single execution
+
+    The first caller starts the work as its own task and every concurrent caller with the
+    same key awaits that task. The task is shielded, so a caller that disconnects does not
+    cancel the work for the others. The key is released as soon as the work finishes.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            logger.info(f"Coalescing request onto in-flight call {key}")
+
+        return await asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+class _Broadcast:
+    """Event log of one in-flight stream that any number of subscribers can read from the start"""
+
+    def __init__(self):
+        self.events: List[Any] = []
+        self.done = False
+        self.subscribers = 0
+        self._changed = asyncio.Condition()
+
+    async def publish(self, event: Any) -> None:
+        async with self._changed:
+            self.events.append(event)
+            self._changed.notify_all()
+
+    async def close(self) -> None:
+        async with self._changed:
+            self.done = True
+            self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[Any]:
+        """Yield every event published so far, then follow live events until the stream closes"""
+        position = 0
+
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: position < len(self.events) or self.done)
+                pending = self.events[position:]
+                done = self.done
+
+            for event in pending:
+                yield event
+            position += len(pending)
+
+            if done and position >= len(self.events):
+                return
+
+
+class StreamBroadcaster:
+    """In-process fan-out of one producer stream to all concurrent requests with the same key
+
+    The first request for a key runs the producer in a background task; later requests for
+    the same key subscribe to its events, including those already sent, instead of starting
+    their own generation. Once every subscriber has gone away the producer is cancelled.
+    """
+
+    def __init__(self):
+        self._streams: Dict[str, Tuple[_Broadcast, asyncio.Task]] = {}
+
+    async def _run(self, key: str, broadcast: _Broadcast, producer: AsyncIterator[Any]) -> None:
+        try:
+            async for event in producer:
+                await broadcast.publish(event)
+        except Exception as e:
+            logger.error(f"Broadcast producer {key} failed: {e}")
+        finally:
+            self._streams.pop(key, None)
+            await broadcast.close()
+
+    async def _follow(self, key: str, broadcast: _Broadcast, task: asyncio.Task) -> AsyncIterator[Any]:
+        broadcast.subscribers += 1
+        try:
+            async for event in broadcast.subscribe():
+                yield event
+        finally:
+            broadcast.subscribers -= 1
+            if broadcast.subscribers == 0 and not task.done():
+                logger.info(f"All subscribers left stream {key}, cancelling its producer")
+                task.cancel()
+
+    def subscribe(self, key: str, producer_factory: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """Subscribe to the stream for key, starting it with producer_factory if none is in flight
+
+        Close the returned iterator (aclose) when the client goes away so the producer can be
+        cancelled once nobody is listening.
+        """
+        entry = self._streams.get(key)
+
+        if entry is None:
+            broadcast = _Broadcast()
+            task = asyncio.ensure_future(self._run(key, broadcast, producer_factory()))
+            self._streams[key] = (broadcast, task)
+        else:
+            logger.info(f"Subscribing to in-flight stream {key}")
+            broadcast, task = entry
+
+        return self._follow(key, broadcast, task)
+
+    def __len__(self) -> int:
+        return len(self._streams)
@@ -1,43 +1,64 @@
 from loguru import logger
+from typing import Optional
 
-import redis
+import redis.asyncio as aioredis
 from src.config import Settings
 from src.services.cache.client import CacheClient
+from src.services.cache.retrieval import RetrievalCache
+from src.services.cache.semantic import SemanticAnswerCache
 
-def make_redis_client(settings:Settings)-> redis.Redis:
-    """Create Redis client with connection pooling"""
+def make_redis_connection_pool(settings:Settings,decode_responses:bool = False)-> aioredis.ConnectionPool:
+    """Create an asyncio Redis connection pool sized by REDIS__MAX_CONNECTIONS"""
     redis_settings = settings.redis
 
-    try:
-        client = redis.Redis(
-            host = redis_settings.host,
-            port = redis_settings.port,
-            password = redis_settings.password if redis_settings.password else None,
-            db = redis_settings.db,
-            decode_response = redis_settings.decode_responses,
-            socket_timweout = redis_settings.socker_timeout,
-            socker_connect_timeout = redis_settings.socket_connect_timeout,
-            retry_on_timeout = True,
-            retry_on_error  = [redis.ConnectionError, redis.TimeoutError],
-        )
+    return aioredis.ConnectionPool(
+        host = redis_settings.host,
+        port = redis_settings.port,
+        password = redis_settings.password if redis_settings.password else None,
+        db = redis_settings.db,
+        decode_responses = decode_responses,
+        socket_timeout = redis_settings.socket_timeout,
+        socket_connect_timeout = redis_settings.socket_connection_timeout,
+        retry_on_timeout = True,
+        max_connections = redis_settings.max_connections,
+    )
 
-        client.ping()
-        logger.info(f"Connected to redis at {redis_settings.host}: {redis_settings.port}")
-        return client
-    
-    except redis.ConnectionError as e:
-        logger.error(f"Failed to connect to redis: {e}")
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error catching redis client: {e}")
-        raise
+def make_async_redis_client(settings:Settings,decode_responses:bool = False)-> aioredis.Redis:
+    """Create asyncio Redis client against the same instance as the exact match cache"""
+    return aioredis.Redis(connection_pool = make_redis_connection_pool(settings,decode_responses))
 
 def make_cache_client(settings: Settings)-> CacheClient:
     """Create exact match cache client"""
     try:
-        redis_client = make_redis_client(settings)
+        redis_client = make_async_redis_client(settings)
         cache_client = CacheClient(redis_client,settings.redis)
-        logger.info("Exact match cache client created successfully")
+        logger.info(
+            f"Exact match cache client created for redis at {settings.redis.host}:{settings.redis.port} "
+            f"(pool size {settings.redis.max_connections})"
+        )
+        return cache_client
     except Exception as e:
         logger.error(f"Falied to create cache client: {e}")
-        raise
\ No newline at end of file
+        raise
+
+def make_semantic_cache(settings: Settings)-> Optional[SemanticAnswerCache]:
+    """Create the in-process semantic answer cache, None when SEMANTIC_CACHE__ENABLED is off"""
+    semantic_settings = settings.semantic_cache
+
+    if not semantic_settings.enabled:
+        return None
+
+    logger.info(f"Semantic answer cache enabled (cosine >= {semantic_settings.similarity_threshold})")
+    return SemanticAnswerCache(
+        similarity_threshold = semantic_settings.similarity_threshold,
+        max_entries = semantic_settings.max_entries,
+        ttl_seconds = semantic_settings.ttl_seconds,
+    )
+
+def make_retrieval_cache(cache_client: CacheClient, settings: Settings)-> Optional[RetrievalCache]:
+    """Create the search results cache on the exact match cache's Redis pool, None when RETRIEVAL_CACHE__ENABLED is off"""
+    if not settings.retrieval_cache.enabled:
+        return None
+
+    index_name = f"{settings.opensearch.index_name}-{settings.opensearch.chunk_index_suffix}"
+    return RetrievalCache(cache_client, index_name, ttl_seconds = settings.retrieval_cache.ttl_seconds)
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import re
+from loguru import logger
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.services.opensearch.generation import index_generation_key
+
+from .client import CacheClient, pack_value, unpack_value
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Case fold, collapse whitespace and drop trailing punctuation so trivially different queries share a key"""
+    return _WHITESPACE.sub(" ", query.casefold()).strip().rstrip("?!.").strip()
+
+
+class RetrievalCache:
+    """Cache of search_unified results keyed on the normalized query, search mode and filters
+
+    Every entry stores the index generation it was computed at. A lookup reads the current
+    generation in the same MGET and discards entries written before the last bulk index or
+    delete, so no explicit invalidation pass is needed.
+    """
+
+    def __init__(self, cache_client: CacheClient, index_name: str, ttl_seconds: int = 3600):
+        self.cache_client = cache_client
+        self.redis = cache_client.redis
+        self.ttl_seconds = ttl_seconds
+        self.generation_key = index_generation_key(index_name)
+
+    def _cache_key(self, query: str, mode: str, **filters: Any) -> str:
+        key_data = {"query": normalize_query(query), "mode": mode, **filters}
+        key_string = json.dumps(key_data, sort_keys=True)
+        return f"retrieval_cache:{hashlib.sha256(key_string.encode()).hexdigest()[:16]}"
+
+    async def get(
+        self,
+        query: str,
+        mode: str,
+        size: int,
+        from_: int = 0,
+        categories: Optional[List[str]] = None,
+        latest: bool = False,
+        min_score: float = 0.0,
+    ) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Return (cached results or None, current index generation)
+
+        The generation should be passed back to set() so results computed across an index
+        write are stored as already stale.
+        """
+        key = self._cache_key(
+            query, mode, size=size, from_=from_, categories=sorted(categories or []), latest=latest, min_score=min_score
+        )
+
+        try:
+            raw_generation, raw_entry = await self.redis.mget([self.generation_key, key])
+        except Exception as e:
+            logger.warning(f"Retrieval cache lookup failed: {e}")
+            return None, -1
+
+        generation = int(raw_generation or 0)
+        if raw_entry is None:
+            return None, generation
+
+        try:
+            entry = unpack_value(raw_entry)
+        except Exception as e:
+            logger.warning(f"Failed to deserialize cached retrieval results: {e}")
+            return None, generation
+
+        if entry.get("generation") != generation:
+            return None, generation
+
+        logger.info(f"Retrieval cache hit for '{query[:50]}' ({mode})")
+        return entry["results"], generation
+
+    async def set(
+        self,
+        query: str,
+        mode: str,
+        size: int,
+        results: Dict[str, Any],
+        generation: int,
+        from_: int = 0,
+        categories: Optional[List[str]] = None,
+        latest: bool = False,
+        min_score: float = 0.0,
+    ) -> bool:
+        """Store results computed at generation; empty results are skipped since failed searches also come back empty"""
+        if generation < 0 or not results.get("hits"):
+            return False
+
+        key = self._cache_key(
+            query, mode, size=size, from_=from_, categories=sorted(categories or []), latest=latest, min_score=min_score
+        )
+        value = pack_value({"generation": generation, "results": results}, self.cache_client.compression_threshold)
+
+        try:
+            return bool(await self.redis.set(key, value, ex=self.ttl_seconds))
+        except Exception as e:
+            logger.warning(f"Failed to store retrieval results in cache: {e}")
+            return False
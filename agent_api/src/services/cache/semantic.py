@@ -0,0 +1,127 @@
+import time
+from collections import OrderedDict
+from loguru import logger
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from src.schemas.api.ask import AskRequest, AskResponse
+
+Partition = Tuple[str, Tuple[str, ...], int, bool]
+
+
+class _PartitionIndex:
+    """Normalized embedding matrix for the cache entries that share one partition"""
+
+    def __init__(self):
+        self.entry_ids: List[int] = []
+        self.matrix: Optional[np.ndarray] = None
+        self.vectors: Dict[int, np.ndarray] = {}
+
+    def add(self, entry_id: int, vector: np.ndarray) -> None:
+        self.vectors[entry_id] = vector
+        self.matrix = None
+
+    def remove(self, entry_id: int) -> None:
+        if self.vectors.pop(entry_id, None) is not None:
+            self.matrix = None
+
+    def candidates(self, vector: np.ndarray, threshold: float) -> List[Tuple[int, float]]:
+        """Entry ids with cosine similarity to vector of at least threshold, most similar first,
+        rebuilding the matrix if entries changed"""
+        if not self.vectors:
+            return []
+
+        if self.matrix is None:
+            self.entry_ids = list(self.vectors)
+            self.matrix = np.stack([self.vectors[entry_id] for entry_id in self.entry_ids])
+
+        scores = self.matrix @ vector
+        above = np.flatnonzero(scores >= threshold)
+        ranked = above[np.argsort(-scores[above], kind="stable")]
+        return [(self.entry_ids[i], float(scores[i])) for i in ranked]
+
+
+class SemanticAnswerCache:
+    """In-process semantic cache of RAG answers keyed on query embeddings
+
+    Entries are partitioned by model, categories, top_k and search mode, so a lookup only
+    compares against answers produced under the same settings. Within a partition the
+    nearest cached query by cosine similarity is returned if it clears similarity_threshold.
+    Entries expire after ttl_seconds: a lookup skips expired matches for the next closest
+    live one, and every store purges them. The least recently used are evicted past max_entries.
+    """
+
+    def __init__(self, similarity_threshold: float = 0.95, max_entries: int = 1000, ttl_seconds: int = 3600):
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, Tuple[Partition, AskResponse, float]]" = OrderedDict()
+        self._partitions: Dict[Partition, _PartitionIndex] = {}
+        self._next_id = 0
+
+    @staticmethod
+    def _partition(request: AskRequest) -> Partition:
+        categories = tuple(sorted(request.categories)) if request.categories else ()
+        return (request.model, categories, request.top_k, request.use_hybrid)
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        return vector / norm
+
+    def _remove(self, entry_id: int) -> None:
+        partition, _, _ = self._entries.pop(entry_id)
+        index = self._partitions[partition]
+        index.remove(entry_id)
+        if not index.vectors:
+            del self._partitions[partition]
+
+    def lookup(self, request: AskRequest, query_embedding: Sequence[float]) -> Optional[AskResponse]:
+        """Return the cached answer for the closest earlier query, or None below the threshold"""
+        index = self._partitions.get(self._partition(request))
+        vector = self._normalize(query_embedding)
+        if index is None or vector is None:
+            return None
+
+        now = time.monotonic()
+        for entry_id, similarity in index.candidates(vector, self.similarity_threshold):
+            _, response, expires_at = self._entries[entry_id]
+            if expires_at <= now:
+                self._remove(entry_id)
+                continue
+
+            self._entries.move_to_end(entry_id)
+            logger.info(f"Semantic cache hit (cosine {similarity:.3f})")
+            return response.model_copy(update={"query": request.query})
+
+        return None
+
+    def store(self, request: AskRequest, query_embedding: Sequence[float], response: AskResponse) -> None:
+        vector = self._normalize(query_embedding)
+        if vector is None:
+            return
+
+        self.purge_expired()
+
+        partition = self._partition(request)
+        entry_id = self._next_id
+        self._next_id += 1
+
+        self._entries[entry_id] = (partition, response, time.monotonic() + self.ttl_seconds)
+        self._partitions.setdefault(partition, _PartitionIndex()).add(entry_id, vector)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def purge_expired(self) -> int:
+        now = time.monotonic()
+        expired = [entry_id for entry_id, (_, _, expires_at) in self._entries.items() if expires_at <= now]
+        for entry_id in expired:
+            self._remove(entry_id)
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._entries)
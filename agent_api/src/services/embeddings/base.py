@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+import numpy as np
+
+
+class BaseEmbeddingsClient(ABC):
+    """Base class for embeddings backends"""
+
+    model_name: str = ""
+    dimensions: int = 0
+
+    @abstractmethod
+    async def embed_passages(self,texts:List[str], batch_size: int = 100) -> np.ndarray:
+        """Embed document passages for indexing as a float32 array of shape (len(texts), dimensions)"""
+
+    @abstractmethod
+    async def embed_query(self,query:str) -> List[float]:
+        """Embed a search query"""
+
+    async def close(self):
+        """Release backend resources"""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self,exc_type,exc_val,exc_tb):
+        await self.close()
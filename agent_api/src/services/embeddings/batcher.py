@@ -0,0 +1,137 @@
+import asyncio
+from loguru import logger
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .base import BaseEmbeddingsClient
+
+
+class EmbeddingBatcher(BaseEmbeddingsClient):
+    """Coalesce passage embedding requests from many callers into full batches
+
+    Texts from concurrent embed_passages calls are queued together and sent to the
+    wrapped client once a batch is full or the oldest queued text has waited max_wait_ms.
+    Each returned vector is routed back to the future of the caller that asked for it.
+    """
+
+    def __init__(
+            self,
+            client: BaseEmbeddingsClient,
+            batch_size: int = 100,
+            max_wait_ms: float = 50.0,
+            max_concurrent_requests: int = 4,
+    ):
+        self.client = client
+        self.model_name = client.model_name
+        self.dimensions = client.dimensions
+        self.batch_size = max(1,batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.max_concurrent_requests = max(1,max_concurrent_requests)
+        self._pending: List[Tuple[str,asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._in_flight: set = set()
+        self._request_slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        logger.info(f"Embedding batcher initialized: batch_size={self.batch_size}, max_wait_ms={max_wait_ms}")
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        """Bind the queue, flush timer and request slots to the running loop
+
+        Airflow tasks embed every batch in a fresh event loop and none of these can be used
+        from a loop other than the one they were created on, so they are reset when it changes.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._pending:
+                logger.warning(f"Dropping {len(self._pending)} texts queued on a previous event loop")
+            self._pending = []
+            self._flush_handle = None
+            self._in_flight = set()
+            self._request_slots = asyncio.Semaphore(self.max_concurrent_requests)
+            self._loop = loop
+        return loop
+
+    async def embed_passages(self,texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """Queue texts for embedding and wait for their vectors
+
+        batch_size is accepted for compatibility with the wrapped client and ignored,
+        batches are sized by the batcher itself.
+        """
+        if not texts:
+            return np.empty((0,self.dimensions),dtype=np.float32)
+
+        loop = self._bind_loop()
+        futures = []
+
+        for text in texts:
+            future = loop.create_future()
+            self._pending.append((text,future))
+            futures.append(future)
+
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+        if self._pending and self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait,self._flush)
+
+        return np.stack(await asyncio.gather(*futures))
+
+    async def embed_query(self,query: str) -> List[float]:
+        """Queries are latency sensitive and go straight to the wrapped client"""
+        return await self.client.embed_query(query)
+
+    def _flush(self) -> None:
+        """Send the queued texts as one batch"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if not self._pending:
+            return
+
+        batch = self._pending[:self.batch_size]
+        self._pending = self._pending[self.batch_size:]
+
+        task = asyncio.ensure_future(self._send_batch(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+        if self._pending:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self.max_wait,self._flush)
+
+    async def _send_batch(self,batch: List[Tuple[str,asyncio.Future]]) -> None:
+        """Embed one batch and resolve the futures waiting on it"""
+        texts = [text for text,_ in batch]
+
+        try:
+            async with self._request_slots:
+                embeddings = await self.client.embed_passages(texts=texts,batch_size=len(texts))
+
+            if len(embeddings) != len(batch):
+                raise ValueError(f"Embedding count mismatch: expected {len(batch)}, got {len(embeddings)}")
+
+            for (_,future),embedding in zip(batch,embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+            logger.debug(f"Coalesced embedding batch of {len(batch)}")
+
+        except Exception as e:
+            logger.error(f"Error embedding coalesced batch: {e}")
+            for _,future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def flush(self) -> None:
+        """Send everything still queued and wait for in-flight batches"""
+        self._bind_loop()
+        while self._pending:
+            self._flush()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight,return_exceptions=True)
+
+    async def close(self):
+        await self.flush()
+        await self.client.close()
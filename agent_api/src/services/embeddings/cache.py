@@ -0,0 +1,212 @@
+import asyncio
+from abc import ABC, abstractmethod
+import hashlib
+import sqlite3
+import time
+from collections import OrderedDict
+from loguru import logger
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import redis.asyncio as aioredis
+
+
+def embedding_cache_key(model: str, task: str, dimensions: int, text: str) -> str:
+    """Content addressed key for an embedding: model, task, dimensions and sha256 of the text"""
+    text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model}:{task}:{dimensions}:{text_hash}"
+
+
+def encode_embedding(embedding: np.ndarray) -> bytes:
+    """Pack an embedding as contiguous float32 bytes"""
+    return np.asarray(embedding, dtype=np.float32).tobytes()
+
+
+def decode_embedding(data: bytes) -> np.ndarray:
+    """Unpack float32 bytes into a read-only float32 array without copying"""
+    return np.frombuffer(data, dtype=np.float32)
+
+
+class EmbeddingCache(ABC):
+    """Base class for persistent embedding caches"""
+
+    @abstractmethod
+    async def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Return cached embeddings for the keys that are present"""
+
+    @abstractmethod
+    async def set_many(self, items: Dict[str, np.ndarray]) -> None:
+        """Store embeddings by key"""
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisEmbeddingCache(EmbeddingCache):
+    """Embedding cache stored in Redis as float32 bytes"""
+
+    def __init__(self, redis_client: aioredis.Redis, ttl_seconds: Optional[int] = None, prefix: str = "embedding"):
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        if not keys:
+            return {}
+        try:
+            values = await self.redis.mget([self._redis_key(key) for key in keys])
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed: {e}")
+            return {}
+
+        return {key: decode_embedding(value) for key, value in zip(keys, values) if value is not None}
+
+    async def set_many(self, items: Dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, embedding in items.items():
+                    pipe.set(self._redis_key(key), encode_embedding(embedding), ex=self.ttl_seconds)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Embedding cache store failed: {e}")
+
+    async def close(self) -> None:
+        await self.redis.aclose(close_connection_pool=True)
+
+
+class DiskEmbeddingCache(EmbeddingCache):
+    """Embedding cache stored in a local SQLite file as float32 bytes
+
+    Rows carry an expiry when ttl_seconds is set. Expired rows are skipped on read and
+    deleted on every write.
+    """
+
+    def __init__(self, cache_dir: str, ttl_seconds: Optional[int] = None):
+        path = Path(cache_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        self.db_path = path / "embeddings.sqlite3"
+        self.ttl_seconds = ttl_seconds
+
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL, expires_at REAL)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(embeddings)")}
+            if "expires_at" not in columns:
+                # caches written before expiry was stored start their ttl now
+                conn.execute("ALTER TABLE embeddings ADD COLUMN expires_at REAL")
+                conn.execute("UPDATE embeddings SET expires_at = ?", (self._expires_at(),))
+            conn.execute("CREATE INDEX IF NOT EXISTS embeddings_expires_at ON embeddings (expires_at)")
+
+        logger.info(f"Disk embedding cache at {self.db_path}")
+
+    def _expires_at(self) -> Optional[float]:
+        return time.time() + self.ttl_seconds if self.ttl_seconds else None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _get_many_sync(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        results = {}
+        with self._connect() as conn:
+            # stay well below SQLite's bound parameter limit
+            for i in range(0, len(keys), 500):
+                batch = keys[i : i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders}) "
+                    "AND (expires_at IS NULL OR expires_at > ?)",
+                    [*batch, time.time()],
+                )
+                for key, vector in rows:
+                    results[key] = decode_embedding(vector)
+        return results
+
+    def _set_many_sync(self, items: Dict[str, np.ndarray]) -> None:
+        expires_at = self._expires_at()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM embeddings WHERE expires_at <= ?", (time.time(),))
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, expires_at) VALUES (?, ?, ?)",
+                [(key, encode_embedding(embedding), expires_at) for key, embedding in items.items()],
+            )
+
+    async def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        if not keys:
+            return {}
+        try:
+            return await asyncio.to_thread(self._get_many_sync, keys)
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed: {e}")
+            return {}
+
+    async def set_many(self, items: Dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+        try:
+            await asyncio.to_thread(self._set_many_sync, items)
+        except Exception as e:
+            logger.warning(f"Embedding cache store failed: {e}")
+
+
+class QueryEmbeddingCache:
+    """Two tier query embedding cache: in-process LRU with TTL in front of a shared EmbeddingCache"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600, backend: Optional[EmbeddingCache] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        # values are (expires_at, float32 bytes) so the local tier stays compact too
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    def _get_local(self, key: str) -> Optional[np.ndarray]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, data = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return decode_embedding(data)
+
+    def _set_local(self, key: str, embedding: np.ndarray) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, encode_embedding(embedding))
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[np.ndarray]:
+        """Look up the local tier first, then the shared backend"""
+        embedding = self._get_local(key)
+        if embedding is not None:
+            return embedding
+
+        if self.backend is None:
+            return None
+
+        found = await self.backend.get_many([key])
+        embedding = found.get(key)
+        if embedding is not None:
+            self._set_local(key, embedding)
+        return embedding
+
+    async def set(self, key: str, embedding: np.ndarray) -> None:
+        self._set_local(key, embedding)
+        if self.backend is not None:
+            await self.backend.set_many({key: embedding})
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
@@ -1,21 +1,108 @@
+from loguru import logger
 from typing import Optional
+
 from src.config import Settings, get_settings
+from src.services.cache.factory import make_async_redis_client
+from .base import BaseEmbeddingsClient
+from .batcher import EmbeddingBatcher
+from .cache import DiskEmbeddingCache, EmbeddingCache, QueryEmbeddingCache, RedisEmbeddingCache
 from .jina_client import JinaEmbeddingsClient
+from .local_client import LocalEmbeddingsClient
+
+
+def make_embedding_cache(settings:Optional[Settings] = None) -> Optional[EmbeddingCache]:
+    """Create the persistent embedding cache selected by EMBEDDINGS__CACHE_BACKEND"""
+    if settings is None:
+        settings = get_settings()
+
+    backend = settings.embeddings.cache_backend
+    ttl_seconds = settings.embeddings.cache_ttl_days * 24 * 3600
+
+    if backend == "redis":
+        logger.info(f"Embedding cache using redis at {settings.redis.host}:{settings.redis.port}")
+        return RedisEmbeddingCache(make_async_redis_client(settings),ttl_seconds = ttl_seconds)
+
+    if backend == "disk":
+        return DiskEmbeddingCache(settings.embeddings.cache_dir,ttl_seconds = ttl_seconds)
+
+    return None
+
+
+def make_query_embedding_cache(settings:Optional[Settings] = None) -> QueryEmbeddingCache:
+    """Create the in-process LRU query embedding cache backed by the shared Redis instance"""
+    if settings is None:
+        settings = get_settings()
+
+    ttl_seconds = settings.embeddings.query_cache_ttl_seconds
+    backend = RedisEmbeddingCache(make_async_redis_client(settings),ttl_seconds = ttl_seconds,prefix = "query_embedding")
+
+    return QueryEmbeddingCache(
+        max_entries = settings.embeddings.query_cache_size,
+        ttl_seconds = ttl_seconds,
+        backend = backend,
+    )
 
 
-def get_embedding_service(settings:Optional[Settings] = None) -> JinaEmbeddingsClient:
+def make_local_embeddings_client(settings:Optional[Settings] = None) -> LocalEmbeddingsClient:
+    """Create the on-CPU sentence-transformers embeddings backend"""
     if settings is None:
         settings = get_settings()
 
+    embeddings_settings = settings.embeddings
+
+    return LocalEmbeddingsClient(
+        model_name = embeddings_settings.local_model_name,
+        backend = embeddings_settings.local_backend,
+        num_threads = embeddings_settings.local_num_threads,
+        quantize_int8 = embeddings_settings.local_quantize_int8,
+        onnx_file_name = embeddings_settings.local_onnx_file_name or None,
+        onnx_int8_file_name = embeddings_settings.local_onnx_int8_file_name,
+        max_batch_size = embeddings_settings.local_max_batch_size,
+        max_wait_ms = embeddings_settings.local_max_wait_ms,
+        query_prompt = embeddings_settings.local_query_prompt,
+        passage_prompt = embeddings_settings.local_passage_prompt,
+    )
+
+
+def make_embeddings_service(settings:Optional[Settings] = None) -> BaseEmbeddingsClient:
+    if settings is None:
+        settings = get_settings()
+
+    if settings.embeddings.provider == "local":
+        return make_local_embeddings_client(settings)
+
     jina_api_key = settings.jina_api_key
 
-    return JinaEmbeddingsClient(api_key = jina_api_key)
+    return JinaEmbeddingsClient(api_key = jina_api_key,query_cache = make_query_embedding_cache(settings))
 
 
-def get_embedding_client(settings:Optional[Settings] = None) -> JinaEmbeddingsClient:
+def make_embeddings_client(settings:Optional[Settings] = None) -> BaseEmbeddingsClient:
     if settings is None:
         settings = get_settings()
 
+    if settings.embeddings.provider == "local":
+        return make_local_embeddings_client(settings)
+
     jina_api_key = settings.jina_api_key
 
-    return JinaEmbeddingsClient(api_key = jina_api_key)
\ No newline at end of file
+    return JinaEmbeddingsClient(api_key = jina_api_key,cache = make_embedding_cache(settings))
+
+
+def make_batched_embeddings_client(settings:Optional[Settings] = None) -> BaseEmbeddingsClient:
+    """Embeddings client that coalesces passage requests across papers into full batches
+
+    The local backend batches dynamically on its own, so it is not wrapped.
+    """
+    if settings is None:
+        settings = get_settings()
+
+    client = make_embeddings_client(settings)
+    if isinstance(client,LocalEmbeddingsClient):
+        return client
+
+    return EmbeddingBatcher(
+        client = client,
+        batch_size = settings.embeddings.coalesce_batch_size,
+        max_wait_ms = settings.embeddings.coalesce_max_wait_ms,
+        max_concurrent_requests = settings.embeddings.max_concurrent_requests,
+    )
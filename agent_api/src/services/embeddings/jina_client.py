@@ -1,14 +1,30 @@
-from typing import List
+import base64
+from typing import List, Optional
 from loguru import logger
 import httpx
+import numpy as np
 
 from src.schemas.embeddings.jina import JinaEmbeddingRequest, JinaEmbeddingResponse
 
+from .base import BaseEmbeddingsClient
+from .cache import EmbeddingCache, QueryEmbeddingCache, embedding_cache_key
 
-class JinaEmbeddingsClient:
-    def __init__(self,api_key:str,base_url:str = "https://api.jina.ai/v1"):
+
+class JinaEmbeddingsClient(BaseEmbeddingsClient):
+    model_name = "jina-embeddings-v3"
+    dimensions = 1024
+
+    def __init__(
+            self,
+            api_key:str,
+            base_url:str = "https://api.jina.ai/v1",
+            cache: Optional[EmbeddingCache] = None,
+            query_cache: Optional[QueryEmbeddingCache] = None,
+    ):
         self.api_key = api_key
         self.base_url = base_url
+        self.cache = cache
+        self.query_cache = query_cache
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
@@ -16,14 +32,46 @@ class JinaEmbeddingsClient:
         self.client = httpx.AsyncClient(timeout = 30.0)
         logger.info("Jina Embeddings Client Initialized")
     
-    async def embed_chunks(self,chunks:List[str], batch_size: int = 100) -> List[List[float]]:
-        embeddings = []
+    def _decode_embeddings(self,result:JinaEmbeddingResponse,out:np.ndarray) -> None:
+        """Decode base64 float32 embeddings from the response straight into rows of out"""
+        for row,item in zip(out,result.data):
+            row[:] = np.frombuffer(base64.b64decode(item["embedding"]),dtype="<f4")
+
+    async def embed_passages(self,texts:List[str], batch_size: int = 100) -> np.ndarray:
+        """Embed passages, serving byte-identical texts from the embedding cache and sending only misses to the API
+
+        Returns a contiguous float32 array of shape (len(texts), dimensions).
+        """
+        if self.cache is None or not texts:
+            return await self._embed_passages_remote(texts,batch_size)
+
+        keys = [embedding_cache_key("jina-embeddings-v3","retrieval.passage",1024,text) for text in texts]
+        cached = await self.cache.get_many(list(set(keys)))
+
+        miss_keys = list(dict.fromkeys(key for key in keys if key not in cached))
+        if miss_keys:
+            miss_texts = {key: text for key, text in zip(keys,texts) if key not in cached}
+            miss_embeddings = await self._embed_passages_remote([miss_texts[key] for key in miss_keys],batch_size)
+
+            fresh = dict(zip(miss_keys,miss_embeddings))
+            await self.cache.set_many(fresh)
+            cached.update(fresh)
+
+        logger.debug(f"Embedding cache: {len(miss_keys)} misses for {len(texts)} passages")
+
+        embeddings = np.empty((len(texts),self.dimensions),dtype=np.float32)
+        for row,key in zip(embeddings,keys):
+            row[:] = cached[key]
+        return embeddings
+
+    async def _embed_passages_remote(self,texts:List[str], batch_size: int = 100) -> np.ndarray:
+        embeddings = np.empty((len(texts),self.dimensions),dtype=np.float32)
         
-        for i in range(0,len(chunks),batch_size):
-            batch = chunks[i:i+1]
+        for i in range(0,len(texts),batch_size):
+            batch = texts[i:i+batch_size]
 
             request_data  = JinaEmbeddingRequest(
-                model="jina-embeddings-v3", task="retrieval.passage", dimensions=1024, input=batch
+                model="jina-embeddings-v3", task="retrieval.passage", dimensions=1024, embedding_type="base64", input=batch
             )
 
             try:
@@ -31,9 +79,10 @@ class JinaEmbeddingsClient:
                     f"{self.base_url}/embeddings",headers=self.headers,json = request_data.model_dump()
                 )
                 response.raise_for_status()
-                result = JinaEmbeddingResponse(**response.json())
-                batch_embeddings = [item["embedding"] for item in result.data]
-                embeddings.extend(batch_embeddings)
+                result = JinaEmbeddingResponse.model_validate_json(response.content)
+                if len(result.data) != len(batch):
+                    raise ValueError(f"Embedding count mismatch: expected {len(batch)}, got {len(result.data)}")
+                self._decode_embeddings(result,embeddings[i:i+batch_size])
 
                 logger.debug(f"Embedded Batch of {len(batch)}")
             
@@ -44,31 +93,42 @@ class JinaEmbeddingsClient:
                 logger.error(f"Unexpected Error Embedding Chunk : {e}")
                 raise
 
-        
-
+        return embeddings
 
     async def embed_query(self,query:str)->List[float]:
-        request_data = JinaEmbeddingRequest(model="jina-embeddings-v3", task="retrieval.query", dimensions=1024, input=[query])
+        cache_key = None
+        if self.query_cache is not None:
+            cache_key = embedding_cache_key("jina-embeddings-v3","retrieval.query",1024,query)
+            embedding = await self.query_cache.get(cache_key)
+            if embedding is not None:
+                logger.debug(f"Query embedding cache hit: {query[:50]}...")
+                return embedding.tolist()
+
+        request_data = JinaEmbeddingRequest(
+            model="jina-embeddings-v3", task="retrieval.query", dimensions=1024, embedding_type="base64", input=[query]
+        )
         try:
             response = await self.client.post(f"{self.base_url}/embeddings",headers = self.headers,json = request_data.model_dump())
 
             response.raise_for_status()
 
-            result = JinaEmbeddingResponse(**response.json())
-            embedding = result.data[0]['embedding']
+            result = JinaEmbeddingResponse.model_validate_json(response.content)
+            embedding = np.empty((1,self.dimensions),dtype=np.float32)
+            self._decode_embeddings(result,embedding)
+
+            if cache_key is not None:
+                await self.query_cache.set(cache_key,embedding[0])
 
             logger.debug(f"Embed Query: {query[:50]}...")
-            return embedding
+            return embedding[0].tolist()
         except httpx.HTTPError as e:
             logger.error(f"Error Embedding Query : {e}")
         except Exception as e:
             logger.error(f"Unexpected Error in Embed Query: {e}")
         
     async def close(self):
-        await self.client.close()
-    
-    async def __aenter__(self):
-        return self
-    
-    async def __aexit__(self,exc_type,exc_val,exc_tb):
-        await self.close()        
+        await self.client.aclose()
+        if self.cache is not None:
+            await self.cache.close()
+        if self.query_cache is not None:
+            await self.query_cache.close()
@@ -0,0 +1,181 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from loguru import logger
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .base import BaseEmbeddingsClient
+
+
+class LocalEmbeddingsClient(BaseEmbeddingsClient):
+    """Embeddings computed on CPU with sentence-transformers (torch or ONNX Runtime backend)
+
+    Concurrent embed calls are collected into dynamic batches of up to max_batch_size texts,
+    waiting at most max_wait_ms for a batch to fill, and encoded on a single worker thread.
+    """
+
+    def __init__(
+            self,
+            model_name: str = "BAAI/bge-m3",
+            backend: str = "torch",
+            num_threads: int = 0,
+            quantize_int8: bool = False,
+            onnx_file_name: Optional[str] = None,
+            onnx_int8_file_name: str = "onnx/model_qint8_avx512_vnni.onnx",
+            max_batch_size: int = 32,
+            max_wait_ms: float = 10.0,
+            normalize: bool = True,
+            query_prompt: str = "",
+            passage_prompt: str = "",
+    ):
+        self.model_name = model_name
+        self.max_batch_size = max(1,max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.normalize = normalize
+        self.query_prompt = query_prompt or None
+        self.passage_prompt = passage_prompt or None
+
+        if backend == "onnx" and quantize_int8 and not onnx_file_name:
+            onnx_file_name = onnx_int8_file_name
+        self.model = self._load_model(backend,num_threads,quantize_int8,onnx_file_name)
+        self.dimensions = self.model.get_sentence_embedding_dimension()
+
+        self._executor = ThreadPoolExecutor(max_workers=1,thread_name_prefix="local-embeddings")
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        logger.info(
+            f"Local embeddings client initialized: model={model_name}, backend={backend}, "
+            f"threads={num_threads or 'default'}, int8={quantize_int8}"
+        )
+
+    def _load_model(self,backend:str,num_threads:int,quantize_int8:bool,onnx_file_name:Optional[str]):
+        """Load the sentence-transformers model with thread and quantization settings applied
+
+        With the onnx backend, onnx_file_name picks an exported variant such as the int8 one;
+        if the model does not ship that file the default fp32 export is loaded instead.
+        """
+        from sentence_transformers import SentenceTransformer
+
+        if backend == "onnx":
+            import onnxruntime as ort
+
+            session_options = ort.SessionOptions()
+            if num_threads > 0:
+                session_options.intra_op_num_threads = num_threads
+
+            model_kwargs = {"provider": "CPUExecutionProvider","session_options": session_options}
+            if onnx_file_name:
+                try:
+                    return SentenceTransformer(
+                        self.model_name,device="cpu",backend="onnx",model_kwargs={**model_kwargs,"file_name": onnx_file_name}
+                    )
+                except Exception as e:
+                    logger.warning(f"Could not load {onnx_file_name} for {self.model_name}, using the fp32 ONNX model: {e}")
+
+            return SentenceTransformer(self.model_name,device="cpu",backend="onnx",model_kwargs=model_kwargs)
+
+        import torch
+
+        if num_threads > 0:
+            torch.set_num_threads(num_threads)
+
+        model = SentenceTransformer(self.model_name,device="cpu")
+
+        if quantize_int8:
+            model = torch.quantization.quantize_dynamic(model,{torch.nn.Linear},dtype=torch.qint8)
+
+        return model
+
+    def _encode(self,texts:List[str],prompt:Optional[str]) -> np.ndarray:
+        embeddings = self.model.encode(
+            texts,
+            prompt=prompt,
+            batch_size=self.max_batch_size,
+            normalize_embeddings=self.normalize,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+        return embeddings.astype(np.float32,copy=False)
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        """Queue and batch worker of the running loop
+
+        Airflow tasks embed every batch in a fresh event loop, and a worker task left on a
+        finished loop never runs again, so both are recreated when the loop changes.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._worker = None
+            self._loop = loop
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._batch_worker())
+        return self._queue
+
+    async def _batch_worker(self) -> None:
+        """Drain queued requests into batches and encode them off the event loop"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch: List[Tuple[List[str],Optional[str],asyncio.Future]] = [await self._queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(),timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            # queries and passages use different prompts, so encode each group separately
+            for prompt in {prompt for _,prompt,_ in batch}:
+                group = [(texts,future) for texts,item_prompt,future in batch if item_prompt == prompt]
+                flat_texts = [text for texts,_ in group for text in texts]
+
+                try:
+                    embeddings = await loop.run_in_executor(self._executor,self._encode,flat_texts,prompt)
+                except Exception as e:
+                    logger.error(f"Local embedding error: {e}")
+                    for _,future in group:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+
+                offset = 0
+                for texts,future in group:
+                    if not future.done():
+                        future.set_result(embeddings[offset:offset + len(texts)])
+                    offset += len(texts)
+
+            logger.debug(f"Encoded dynamic batch of {size} texts")
+
+    async def _submit(self,texts:List[str],prompt:Optional[str]) -> np.ndarray:
+        queue = self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((texts,prompt,future))
+        return await future
+
+    async def embed_passages(self,texts:List[str], batch_size: int = 100) -> np.ndarray:
+        if not texts:
+            return np.empty((0,self.dimensions),dtype=np.float32)
+        return await self._submit(texts,self.passage_prompt)
+
+    async def embed_query(self,query:str) -> List[float]:
+        embeddings = await self._submit([query],self.query_prompt)
+        return embeddings[0].tolist()
+
+    async def close(self):
+        if self._worker is not None and self._loop is asyncio.get_running_loop():
+            self._worker.cancel()
+        self._worker = None
+        self._queue = None
+        self._loop = None
+        self._executor.shutdown(wait=False)
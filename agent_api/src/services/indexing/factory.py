@@ -1,7 +1,7 @@
 from typing import Optional
 
 from src.config import Settings,get_settings
-from src.services.embeddings.factory import make_embeddings_client
+from src.services.embeddings.factory import make_batched_embeddings_client, make_embeddings_client
 from src.services.opensearch.factory import make_opensearch_client_fresh
 
 from .hybrid_indexer import HybridIndexingService
@@ -21,9 +21,21 @@ def make_hybrid_indexing_service(
         min_chunk_size = settings.chunking.min_chunk_size,
     )
 
-    embeddings_client = make_embeddings_client(settings)
+    if settings.embeddings.coalesce_batches:
+        embeddings_client = make_batched_embeddings_client(settings)
+    else:
+        embeddings_client = make_embeddings_client(settings)
     opensearch_client = make_opensearch_client_fresh(settings,host=opensearch_host)
 
-    return HybridIndexingService(chunker = chunker,embeddings_client=embeddings_client,opensearch_client=opensearch_client)
+    return HybridIndexingService(
+        chunker = chunker,
+        embeddings_client=embeddings_client,
+        opensearch_client=opensearch_client,
+        pipelined = settings.indexing.pipelined,
+        chunk_workers = settings.indexing.chunk_workers,
+        embedding_concurrency = settings.indexing.embedding_concurrency,
+        queue_size = settings.indexing.queue_size,
+        embedding_batch_size = settings.indexing.embedding_batch_size,
+    )
 
 
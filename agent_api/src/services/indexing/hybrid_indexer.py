@@ -1,27 +1,96 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
 from loguru import logger
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 
-from src.services.embeddings.jina_client import JinaEmbeddingsClient
+from src.schemas.indexing.models import TextChunk
+from src.services.embeddings.base import BaseEmbeddingsClient
 from src.services.opensearch.client import OpenSearchClient
 
 from .text_chunker import TextChunker
 
 
+def _chunk_paper_data(chunker: TextChunker, paper_data: Dict) -> List[TextChunk]:
+    """Chunk a single paper dict, kept at module level so it can run in a worker process"""
+    return chunker.chunk_paper(
+        title = paper_data.get("title",""),
+        abstract = paper_data.get("abstract",""),
+        full_text = paper_data.get("raw_text",paper_data.get("full_text","")),
+        arxiv_id = paper_data.get("arxiv_id"),
+        paper_id = paper_data.get("paper_id"),
+        sections = paper_data.get("sections"),
+    )
+
+
 class HybridIndexingService:
     """Service for indexing papers with chunking and embeddings for hybrid search"""
-    def __init__(self,chunker : TextChunker,embeddings_client:JinaEmbeddingsClient,opensearch_client:OpenSearchClient):
+    def __init__(
+            self,
+            chunker : TextChunker,
+            embeddings_client:BaseEmbeddingsClient,
+            opensearch_client:OpenSearchClient,
+            pipelined: bool = True,
+            chunk_workers: int = 2,
+            embedding_concurrency: int = 4,
+            queue_size: int = 16,
+            embedding_batch_size: int = 50,
+    ):
         """Initialize hybrid indexing service"""
         self.chunker  = chunker
         self.embeddings_client = embeddings_client
         self.opensearch_client = opensearch_client
+        self.pipelined = pipelined
+        self.chunk_workers = chunk_workers
+        self.embedding_concurrency = max(1,embedding_concurrency)
+        self.queue_size = max(1,queue_size)
+        self.embedding_batch_size = embedding_batch_size
 
         logger.info("Hybrid indexing service initialized")
-    
+
+    def _build_chunk_documents(self,paper_data:Dict,chunks:List[TextChunk],embeddings:List[Any]) -> List[Dict[str,Any]]:
+        """Pair each chunk with its embedding and the paper level fields stored in the index"""
+        authors = paper_data.get("authors",[])
+        authors = ",".join(authors) if isinstance(authors,list) else authors or ""
+
+        chunks_with_embeddings = []
+
+        for chunk, embedding in zip(chunks,embeddings):
+            chunk_data = {
+                "arxiv_id": chunk.arxiv_id,
+                "paper_id": chunk.paper_id,
+                "chunk_index": chunk.metadata.chunk_index,
+                "chunk_text": chunk.text,
+                "chunk_word_count": chunk.metadata.word_count,
+                "start_char": chunk.metadata.start_char,
+                "end_char": chunk.metadata.end_char,
+                "section_title": chunk.metadata.section_title,
+                "embedding_model": self.embeddings_client.model_name,
+                "title": paper_data.get("title",""),
+                "authors": authors,
+                "abstract": paper_data.get("abstract",""),
+                "categories": paper_data.get("categories",""),
+                "published_date": paper_data.get("published_date"),
+            }
+
+            chunks_with_embeddings.append({
+                "chunk_data": chunk_data,
+                "embedding":embedding
+            })
+
+        return chunks_with_embeddings
+
+    async def _embed_chunks(self,chunks:List[TextChunk]) -> List[Any]:
+        """Embed chunk texts for a single paper"""
+        chunk_texts = [chunk.text for chunk in chunks]
+        return await self.embeddings_client.embed_passages(
+            texts = chunk_texts,
+            batch_size = self.embedding_batch_size,
+        )
+
     async def index_paper(self,paper_data:Dict) -> Dict[str,int]:
         """Index a single paper with chunking and embeddings"""
         arxiv_id = paper_data.get("arxiv_id")
-        paper_id = paper_data.get("paper_id")
 
         if not arxiv_id:
             logger.error("Paper missing arxiv_id ")
@@ -31,14 +100,7 @@ class HybridIndexingService:
                     "errors":1}
 
         try:
-            chunks = self.chunker.chunk_paper(
-                title = paper_data.get("title",""),
-                abstract = paper_data.get("abstract",""),
-                full_text = paper_data.get("raw_text",paper_data.get("full_text","")),
-                arxiv_id = arxiv_id,
-                paper_id = paper_id,
-                sections = paper_id.get("sections"),
-            )        
+            chunks = _chunk_paper_data(self.chunker,paper_data)
 
             if not chunks:
                 logger.warning(f"No chunks created for paper : {arxiv_id}")
@@ -48,11 +110,7 @@ class HybridIndexingService:
                         "errors":0}
             logger.info(f"Created {len(chunks)} chunks for paper {arxiv_id}")
 
-            chunk_texts = [chunk.text for chunk in chunks]
-            embeddings = await self.embeddings_client.embed_passages(
-                texts = chunk_texts,
-                batch_size = 50,
-            )
+            embeddings = await self._embed_chunks(chunks)
 
             if len(embeddings)!= len(chunks):
                 logger.error(f"Embedding count mismatch: {len(embeddings)}")
@@ -60,33 +118,8 @@ class HybridIndexingService:
                         "chunks_indexed": 0,
                         "embeddings_generated":len(embeddings),
                         "errors":1}
-            
-            chunks_with_embeddings = []
-
-            for chunk, embedding in zip(chunks,embeddings):
-                chunk_data = {
-                    "arxiv_id": chunk.arxiv_id,
-                    "paper_id": chunk.paper_id,
-                    "chunk_index": chunk.metadata.chunk_index,
-                    "chunk_text": chunk.text,
-                    "chunk_word_count": chunk.metadata.word_count,
-                    "start_char": chunk_data.metadata.start_char,
-                    "end_char": chunk_data.metadata.end_char,
-                    "section_title": chunk_data.metadata.section_title,
-                    "embedding_model": "jina-embeddings-v3",
-                    "title": paper_data.get("title",""),
-                    "authors": ",".join(paper_data.get("authors",[]))
-                    if isinstance(paper_data.get("authors"),list)
-                    else paper_data.get("authors",""),
-                    "abstract": paper_data.get("abstract",""),
-                    "categories": paper_data.get("categories",""),
-                    "published_date": paper_data.get("published_date"),
-                }
-
-                chunks_with_embeddings.append({
-                    "chunk_data": chunk_data,
-                    "embeddings":embedding
-                })
+
+            chunks_with_embeddings = self._build_chunk_documents(paper_data,chunks,embeddings)
 
             results = self.opensearch_client.bulk_index_chunks(chunks_with_embeddings)
 
@@ -95,7 +128,7 @@ class HybridIndexingService:
             return {
                 "chunks_created": len(chunks),
                 "chunks_indexed": results["success"],
-                "embeddings_generated": len(embedding),
+                "embeddings_generated": len(embeddings),
                 "errors": results["failed"],
             }
         except Exception as e:
@@ -106,8 +139,18 @@ class HybridIndexingService:
                "embeddings_generated":0,
                 "errors":1,
             }
-        
-    async def index_papers_batch(self,papers: List[Dict],replace_existing:bool= False)->Dict[str,int]:
+
+    def _add_paper_stats(self,total_stats:Dict[str,int],stats:Dict[str,int]) -> None:
+        """Accumulate per paper stats into batch totals"""
+        total_stats["papers_processed"] +=1
+        total_stats["total_chunks_created"] += stats["chunks_created"]
+        total_stats["total_chunks_indexed"] += stats["chunks_indexed"]
+        total_stats["total_embeddings_generated"] += stats["embeddings_generated"]
+        total_stats["total_errors"] += stats["errors"]
+
+    async def index_papers_batch(
+            self,papers: List[Dict],replace_existing:bool= False,pipelined: Optional[bool] = None
+    )->Dict[str,int]:
         """Index multiple papers in batch"""
 
         total_stats = {
@@ -118,27 +161,142 @@ class HybridIndexingService:
             "total_errors": 0,
         }
 
-        for paper in papers:
-            arxiv_id = paper.get("arxiv_id")
+        if pipelined is None:
+            pipelined = self.pipelined
 
-            if replace_existing and arxiv_id:
-                self.opensearch_client.delete_paper_with_chunks(arxiv_id)
+        if pipelined:
+            await self._index_papers_pipelined(papers,replace_existing,total_stats)
+        else:
+            for paper in papers:
+                arxiv_id = paper.get("arxiv_id")
 
-            stats = await self.index_paper(paper)
+                if replace_existing and arxiv_id:
+                    self.opensearch_client.delete_paper_chunks(arxiv_id)
+
+                stats = await self.index_paper(paper)
+                self._add_paper_stats(total_stats,stats)
 
-            total_stats["papers_processed"] +=1
-            total_stats["total_chunks_created"] += stats["chunks_created"]
-            total_stats["total_chunks_indexed"] += stats["chunks_indexed"]
-            total_stats["total_embeddings_generated"] += stats["embeddings_generated"]
-            total_stats["total_errors"] += stats["errors"]
-        
         logger.info(
             f"Batch indexing complete: {total_stats["papers_processed"]} papers, "
             f"{total_stats['total_chunks_indexed']} chunks indexed"
         )
 
         return total_stats
-    
+
+    async def _index_papers_pipelined(self,papers:List[Dict],replace_existing:bool,total_stats:Dict[str,int]) -> None:
+        """Index papers through chunk -> embed -> bulk index stages connected by bounded queues
+
+        Chunking runs in a process pool, embeddings are requested by a fixed number of
+        concurrent workers and bulk writes run on a worker thread, so embeddings for the
+        next papers are in flight while the current paper is written to OpenSearch.
+        """
+        loop = asyncio.get_running_loop()
+        chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        index_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        chunk_slots = asyncio.Semaphore(max(1,self.chunk_workers) * 2)
+
+        pool = ProcessPoolExecutor(max_workers=self.chunk_workers) if self.chunk_workers > 0 else None
+
+        async def chunk_one(paper:Dict) -> None:
+            arxiv_id = paper.get("arxiv_id")
+            if not arxiv_id:
+                logger.error("Paper missing arxiv_id ")
+                self._add_paper_stats(total_stats,{"chunks_created":0,"chunks_indexed":0,"embeddings_generated":0,"errors":1})
+                return
+
+            async with chunk_slots:
+                try:
+                    if pool is not None:
+                        chunks = await loop.run_in_executor(pool,_chunk_paper_data,self.chunker,paper)
+                    else:
+                        chunks = await asyncio.to_thread(_chunk_paper_data,self.chunker,paper)
+                except Exception as e:
+                    logger.error(f"Error chunking paper {arxiv_id} : {e}")
+                    self._add_paper_stats(total_stats,{"chunks_created":0,"chunks_indexed":0,"embeddings_generated":0,"errors":1})
+                    return
+
+            await chunk_queue.put((paper,chunks))
+
+        async def chunk_stage() -> None:
+            await asyncio.gather(*(chunk_one(paper) for paper in papers))
+            for _ in range(self.embedding_concurrency):
+                await chunk_queue.put(None)
+
+        async def embed_worker() -> None:
+            while True:
+                item = await chunk_queue.get()
+                if item is None:
+                    break
+
+                paper, chunks = item
+                arxiv_id = paper.get("arxiv_id")
+
+                if not chunks:
+                    logger.warning(f"No chunks created for paper : {arxiv_id}")
+                    await index_queue.put((paper,chunks,[]))
+                    continue
+
+                try:
+                    embeddings = await self._embed_chunks(chunks)
+                except Exception as e:
+                    logger.error(f"Error embedding paper {arxiv_id} : {e}")
+                    self._add_paper_stats(total_stats,{"chunks_created":len(chunks),"chunks_indexed":0,"embeddings_generated":0,"errors":1})
+                    continue
+
+                if len(embeddings)!= len(chunks):
+                    logger.error(f"Embedding count mismatch: {len(embeddings)}")
+                    self._add_paper_stats(
+                        total_stats,
+                        {"chunks_created":len(chunks),"chunks_indexed":0,"embeddings_generated":len(embeddings),"errors":1},
+                    )
+                    continue
+
+                await index_queue.put((paper,chunks,embeddings))
+
+        async def embed_stage() -> None:
+            await asyncio.gather(*(embed_worker() for _ in range(self.embedding_concurrency)))
+            await index_queue.put(None)
+
+        def write_paper(paper:Dict,chunks:List[TextChunk],embeddings:List[Any]) -> Dict[str,int]:
+            arxiv_id = paper.get("arxiv_id")
+
+            if replace_existing:
+                self.opensearch_client.delete_paper_chunks(arxiv_id)
+
+            if not chunks:
+                return {"chunks_created":0,"chunks_indexed":0,"embeddings_generated":0,"errors":0}
+
+            results = self.opensearch_client.bulk_index_chunks(self._build_chunk_documents(paper,chunks,embeddings))
+            logger.info(f"Indexed paper { arxiv_id} : {results["success"]} chunks successful, {results["failed"]} failed")
+
+            return {
+                "chunks_created": len(chunks),
+                "chunks_indexed": results["success"],
+                "embeddings_generated": len(embeddings),
+                "errors": results["failed"],
+            }
+
+        async def index_stage() -> None:
+            while True:
+                item = await index_queue.get()
+                if item is None:
+                    break
+
+                paper, chunks, embeddings = item
+                try:
+                    stats = await asyncio.to_thread(write_paper,paper,chunks,embeddings)
+                except Exception as e:
+                    logger.error(f"Error Indexing paper {paper.get('arxiv_id')} : {e}")
+                    stats = {"chunks_created":len(chunks),"chunks_indexed":0,"embeddings_generated":len(embeddings),"errors":1}
+
+                self._add_paper_stats(total_stats,stats)
+
+        try:
+            await asyncio.gather(chunk_stage(),embed_stage(),index_stage())
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False,cancel_futures=True)
+
     async def reindex_paper(self,arxiv_id:str,paper_data:Dict)-> Dict[str,int]:
         """Reindex a paper by deleting old chunks and create new chunks"""
 
@@ -147,5 +305,3 @@ class HybridIndexingService:
             logger.info(f"Deleted existing chunks for paper: {arxiv_id}")
 
         return await self.index_paper(paper_data)
-
-    
\ No newline at end of file
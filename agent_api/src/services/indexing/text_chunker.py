@@ -1,13 +1,15 @@
 import json
 from loguru import logger
 import re
-from typing import Dict , List , Optional , Union
+from typing import Dict , Iterator , List , Optional , Tuple , Union
 
 from src.schemas.indexing.models import ChunkMetadata , TextChunk
 
 class TextChunker:
     """Service for chunking text into overlapping segments"""
 
+    _WORD_PATTERN = re.compile(r"\S+")
+
     def __init__(self,chunk_size:int = 600,overlap_size:int = 100,min_chunk_size:int =100):
         """Initialize text chunker"""
         self.chunk_size = chunk_size
@@ -18,15 +20,10 @@ class TextChunker:
             raise ValueError("Overlap size must be less than chunk size")
         logger.info(f"Text chunker initialized: chunk_size= {chunk_size}, overlap_size: {overlap_size} , min_chunk_size: {min_chunk_size}")
 
-    def _split_into_words(self,text)-> List[str]:
-        """Split text into words while preserving whitespace information"""
-        words = re.split(f"\s+",text)
-        return words
-    
-    def _reconstruct_text(self,words: List[str])-> str:
-        """Reconstruct text from words"""
-        return "".join(words)
-        
+    def _word_spans(self,text:str)-> List[Tuple[int,int]]:
+        """Get (start,end) character offsets of every word in a single regex scan"""
+        return [match.span() for match in self._WORD_PATTERN.finditer(text)]
+
     def chunk_paper(
             self,
             title: str,
@@ -51,78 +48,69 @@ class TextChunker:
     
     def chunk_text(self,text,arxiv_id: str,paper_id:str)-> list[TextChunk]:
         """Chunk text into overlapping segments"""
+        return list(self.iter_chunks(text,arxiv_id,paper_id))
+
+    def iter_chunks(self,text:str,arxiv_id: str,paper_id:str)-> Iterator[TextChunk]:
+        """Lazily yield overlapping chunks, slicing the original text so whitespace is preserved"""
         if not text or not text.strip():
             logger.warning(f"Empty text for paper")
-            return []
-        
-        words = self._split_into_words(text)
-
-        if len(words)<self.min_chunk_size:
-            logger.warning(f"text for paper {arxiv_id} has only {len(words)} words less than minimum {self.min_chunk_size}")
-
-            if words:
-                return [
-                    TextChunk(
-                        text = self._reconstruct_text(words,text),
-                        metadata = ChunkMetadata(
-                            chunk_index = 0,
-                            start_char = 0,
-                            end_char = len(text),
-                            word_count = len(words),
-                            overlap_with_previous = 0,
-                            overlap_with_next = 0,
-                        ),
-                        arxiv_id = arxiv_id,
-                        paper_id = paper_id,
-                    )
-                ]
-            
-            return []
-        
-        chunks = []
+            return
+
+        spans = self._word_spans(text)
+        total_words = len(spans)
+
+        if total_words<self.min_chunk_size:
+            logger.warning(f"text for paper {arxiv_id} has only {total_words} words less than minimum {self.min_chunk_size}")
+
+            if spans:
+                yield TextChunk(
+                    text = text[spans[0][0]:spans[-1][1]],
+                    metadata = ChunkMetadata(
+                        chunk_index = 0,
+                        start_char = spans[0][0],
+                        end_char = spans[-1][1],
+                        word_count = total_words,
+                        overlap_with_previous = 0,
+                        overlap_with_next = 0,
+                    ),
+                    arxiv_id = arxiv_id,
+                    paper_id = paper_id,
+                )
+            return
+
+        step = self.chunk_size - self.overlap_size
         chunk_index = 0
-        current_position = 0
-
-        while current_position< len(words):
-            chunk_start = current_position
-            chunk_end = min(current_position+ self.chunk_size,len(words))
 
-            chunk_words = words[chunk_start:chunk_end]
-            chunk_text = self._reconstruct_text(chunk_words)
+        for chunk_start in range(0,total_words,step):
+            chunk_end = min(chunk_start+ self.chunk_size,total_words)
 
-            start_char = len(" ".join(words[:chunk_start])) if chunk_start> 0 else 0
-            end_char = len(" ".join(words[:chunk_end])) 
+            start_char = spans[chunk_start][0]
+            end_char = spans[chunk_end-1][1]
 
             overlap_with_previous = min(self.overlap_size,chunk_start) if chunk_start>0 else 0
-            overlap_with_next = self.overlap_size if chunk_end<len(words) else 0
+            overlap_with_next = self.overlap_size if chunk_end<total_words else 0
 
-            chunk = TextChunk(
-                text = chunk_text,
+            yield TextChunk(
+                text = text[start_char:end_char],
                 metadata = ChunkMetadata(
                     chunk_index = chunk_index,
                     start_char = start_char,
                     end_char = end_char,
-                    word_count = len(chunk_words),
+                    word_count = chunk_end - chunk_start,
                     overlap_with_previous = overlap_with_previous,
                     overlap_with_next = overlap_with_next,
                     section_title = None,
                 ),
                 arxiv_id = arxiv_id,
                 paper_id = paper_id,
-
             )
-            chunks.append(chunk)
-
-            current_position += self.chunk_size - self.overlap_size
             chunk_index +=1
 
-            if chunk_end>=len(words):
+            if chunk_end>=total_words:
                 break
 
-        logger.info(f"Chunked paper {arxiv_id} : {len(words)} words -> {len(chunks)} chunks")
+        logger.info(f"Chunked paper {arxiv_id} : {total_words} words -> {chunk_index} chunks")
 
-        return chunks
-    
     def _chunk_by_sections(
             self, 
             title: str,
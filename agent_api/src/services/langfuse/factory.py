@@ -4,7 +4,7 @@ from src.config import get_settings
 from src.services.langfuse.client import LangfuseTracer
 
 @lru_cache(maxsize=1)
-def make_langfue_tracer()-> LangfuseTracer:
+def make_langfuse_tracer()-> LangfuseTracer:
     """Create and return a singleton langfue tracer instance"""
     settings = get_settings()
     return LangfuseTracer(settings)
\ No newline at end of file
@@ -7,34 +7,101 @@ import httpx
 from src.config import Settings
 from src.exceptions import OllamaConnectionError , OllamaException, OllamaTimeoutError
 from src.schemas.ollama import RAGResponse
+from src.services.ollama.context import ContextPacker
 from src.services.ollama.prompts import RAGPromptBuilder , ResponseParser
 
+# request fields /api/generate takes at the top level, everything else is a model option
+_GENERATE_FIELDS = {"format", "system", "template", "context", "raw", "images", "keep_alive", "suffix", "think"}
+
+
 class OllamaClient:
-    """client for interacting with ollama LLM Inference"""
+    """client for interacting with ollama LLM Inference
+
+    A single pooled httpx.AsyncClient is kept for the lifetime of the service so
+    requests reuse keep-alive connections instead of opening a new one each call.
+    Every request carries the same keep_alive and num_ctx, so models stay loaded and a
+    differing context size never forces Ollama to reload the model and drop its prompt cache.
+    """
 
-    def __init__(self):
-        self.base_url = Settings.ollama_host
-        self.timeout = httpx.Timeout(float(Settings.ollama_timeout))
-        self.prompt_builder = RAGPromptBuilder()
+    def __init__(self, settings: Settings):
+        self.base_url = settings.ollama_host
+        self.timeout = httpx.Timeout(float(settings.ollama_timeout), connect=settings.ollama_connect_timeout)
+        self.limits = httpx.Limits(
+            max_connections=settings.ollama_max_connections,
+            max_keepalive_connections=settings.ollama_max_keepalive_connections,
+            keepalive_expiry=settings.ollama_keepalive_expiry,
+        )
+        self.keep_alive = settings.ollama_keep_alive
+        self.num_ctx = settings.ollama_num_ctx
+        self._client: Optional[httpx.AsyncClient] = None
+        self.prompt_builder = RAGPromptBuilder(
+            ContextPacker(
+                context_token_budget=settings.prompt.context_token_budget,
+                model_budgets=settings.prompt.model_context_budgets,
+                chars_per_token=settings.prompt.chars_per_token,
+                near_duplicate_threshold=settings.prompt.near_duplicate_threshold,
+                include_abstract=settings.prompt.include_abstract,
+            )
+        )
         self.response_parser = ResponseParser()
-    
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared pooled HTTP client, created lazily and recreated if closed"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=self.limits)
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    def _request_body(self, model: str, prompt: str, stream: bool, **kwargs) -> Dict[str, Any]:
+        """Build an /api/generate body, moving sampling parameters into options where Ollama reads them"""
+        options = {"num_ctx": self.num_ctx, **kwargs.pop("options", {})}
+        data = {"model": model, "prompt": prompt, "stream": stream, "keep_alive": self.keep_alive}
+
+        for key, value in kwargs.items():
+            if key in _GENERATE_FIELDS:
+                data[key] = value
+            else:
+                options[key] = value
+
+        data["options"] = options
+        return data
+
+    async def warm_up(self, models: List[str]) -> Dict[str, bool]:
+        """Load each model and prefill the static prompt prefix so the first real request starts warm"""
+        results = {}
+
+        for model in models:
+            try:
+                await self.generate(model=model, prompt=self.prompt_builder.static_prefix, num_predict=1)
+                logger.info(f"Warmed up Ollama model {model} (keep_alive={self.keep_alive})")
+                results[model] = True
+            except Exception as e:
+                logger.warning(f"Failed to warm up Ollama model {model}: {e}")
+                results[model] = False
+
+        return results
+
     async def health_check(self) -> Dict[str, Any]:
         """
         Health check of Ollama service
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(f"{self.base_url}/api/version")
+            response = await self.client.get("/api/version")
 
-                if response.status_code == 200:
-                    version_data = response.json()
-                    return {
-                        "status": "healthy",
-                        "message": "Ollama service is running",
-                        "version": version_data.get("version", "unknown"),
-                    }
-                else:
-                    raise OllamaException(f"Ollama returned status {response.status_code}")
+            if response.status_code == 200:
+                version_data = response.json()
+                return {
+                    "status": "healthy",
+                    "message": "Ollama service is running",
+                    "version": version_data.get("version", "unknown"),
+                }
+            else:
+                raise OllamaException(f"Ollama returned status {response.status_code}")
 
         except httpx.ConnectError as e:
             raise OllamaConnectionError(f"Cannot connect to Ollama service: {e}")
@@ -50,14 +117,13 @@ class OllamaClient:
         Get list of available models.
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(f"{self.base_url}/api/tags")
+            response = await self.client.get("/api/tags")
 
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get("models", [])
-                else:
-                    raise OllamaException(f"Failed to list models: {response.status_code}")
+            if response.status_code == 200:
+                data = response.json()
+                return data.get("models", [])
+            else:
+                raise OllamaException(f"Failed to list models: {response.status_code}")
 
         except httpx.ConnectError as e:
             raise OllamaConnectionError(f"Cannot connect to Ollama service: {e}")
@@ -73,16 +139,15 @@ class OllamaClient:
         Generate text using specified model
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                data = {"model": model, "prompt": prompt, "stream": stream, **kwargs}
+            data = self._request_body(model, prompt, stream, **kwargs)
 
-                logger.info(f"Sending request to Ollama: model={model}, stream={stream}, extra_params={kwargs}")
-                response = await client.post(f"{self.base_url}/api/generate", json=data)
+            logger.info(f"Sending request to Ollama: model={model}, stream={stream}, options={data['options']}")
+            response = await self.client.post("/api/generate", json=data)
 
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    raise OllamaException(f"Generation failed: {response.status_code}")
+            if response.status_code == 200:
+                return response.json()
+            else:
+                raise OllamaException(f"Generation failed: {response.status_code}")
 
         except httpx.ConnectError as e:
             raise OllamaConnectionError(f"Cannot connect to Ollama service: {e}")
@@ -98,23 +163,22 @@ class OllamaClient:
         Generate text with streaming response.
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                data = {"model": model, "prompt": prompt, "stream": True, **kwargs}
+            data = self._request_body(model, prompt, True, **kwargs)
 
-                logger.info(f"Starting streaming generation: model={model}")
+            logger.info(f"Starting streaming generation: model={model}")
 
-                async with client.stream("POST", f"{self.base_url}/api/generate", json=data) as response:
-                    if response.status_code != 200:
-                        raise OllamaException(f"Streaming generation failed: {response.status_code}")
+            async with self.client.stream("POST", "/api/generate", json=data) as response:
+                if response.status_code != 200:
+                    raise OllamaException(f"Streaming generation failed: {response.status_code}")
 
-                    async for line in response.aiter_lines():
-                        if line.strip():
-                            try:
-                                chunk = json.loads(line)
-                                yield chunk
-                            except json.JSONDecodeError:
-                                logger.warning(f"Failed to parse streaming chunk: {line}")
-                                continue
+                async for line in response.aiter_lines():
+                    if line.strip():
+                        try:
+                            chunk = json.loads(line)
+                            yield chunk
+                        except json.JSONDecodeError:
+                            logger.warning(f"Failed to parse streaming chunk: {line}")
+                            continue
 
         except httpx.ConnectError as e:
             raise OllamaConnectionError(f"Cannot connect to Ollama service: {e}")
@@ -137,7 +201,7 @@ class OllamaClient:
      """
         try:
             if use_structured_output:
-                prompt_data = self.prompt_builder.create_structured_prompt(query, chunks)
+                prompt_data = self.prompt_builder.create_structured_prompt(query, chunks, model)
 
                 response = await self.generate(
                     model=model,
@@ -147,7 +211,7 @@ class OllamaClient:
                     format=prompt_data["format"],
                 )
             else:
-                prompt = self.prompt_builder.create_rag_prompt(query, chunks)
+                prompt = self.prompt_builder.create_rag_prompt(query, chunks, model)
 
                 response = await self.generate(
                     model=model,
@@ -201,7 +265,7 @@ class OllamaClient:
         Generate a streaming RAG answer using retrieved chunks.
         """
         try:
-            prompt = self.prompt_builder.create_rag_prompt(query, chunks)
+            prompt = self.prompt_builder.create_rag_prompt(query, chunks, model)
 
             async for chunk in self.generate_stream(
                 model=model,
@@ -0,0 +1,157 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+from loguru import logger
+
+# header TextChunker._chunk_by_sections prepends to every section chunk of a paper
+_CHUNK_HEADER = re.compile(r"\A(?P<title>[^\n]*)\n\\?Abstract: (?P<abstract>.*?)\n\n\s*", re.DOTALL)
+_WORD = re.compile(r"\w+")
+
+
+@dataclass
+class _Paper:
+    arxiv_id: str
+    title: str = ""
+    abstract: str = ""
+    excerpts: List[str] = field(default_factory=list)
+
+
+def split_chunk_header(chunk_text: str) -> Dict[str, str]:
+    """Split a section chunk into the title/abstract header it repeats and its own body"""
+    match = _CHUNK_HEADER.match(chunk_text)
+    if not match:
+        return {"title": "", "abstract": "", "body": chunk_text.strip()}
+
+    return {
+        "title": match.group("title").strip(),
+        "abstract": match.group("abstract").strip(),
+        "body": chunk_text[match.end():].strip(),
+    }
+
+
+def _shingles(text: str, size: int = 3) -> Set[str]:
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class ContextPacker:
+    """Select and lay out retrieved chunks so the prompt context fits a token budget
+
+    Section chunks all start with the paper title and abstract, so the header is stripped
+    from every chunk and written once per paper. Chunks whose word shingles overlap an
+    already selected chunk above near_duplicate_threshold are dropped, and the rest are
+    taken greedily by retrieval score while they still fit in the budget for the model.
+    Tokens are estimated from character counts since the model tokenizer is not available.
+    """
+
+    def __init__(
+        self,
+        context_token_budget: int = 2048,
+        model_budgets: Optional[Dict[str, int]] = None,
+        chars_per_token: float = 4.0,
+        near_duplicate_threshold: float = 0.8,
+        include_abstract: bool = True,
+    ):
+        self.context_token_budget = context_token_budget
+        self.model_budgets = model_budgets or {}
+        self.chars_per_token = chars_per_token
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self.include_abstract = include_abstract
+
+    def estimate_tokens(self, text: str) -> int:
+        return int(len(text) / self.chars_per_token) + 1
+
+    def budget_for(self, model: Optional[str] = None) -> int:
+        """Context budget for model, falling back to the default budget for unlisted models"""
+        if model and model in self.model_budgets:
+            return self.model_budgets[model]
+        return self.context_token_budget
+
+    def _paper_header(self, paper: _Paper, with_abstract: bool) -> str:
+        header = f"[arxiv:{paper.arxiv_id}]"
+        if paper.title:
+            header += f" {paper.title}"
+        if with_abstract and paper.abstract:
+            header += f"\nAbstract: {paper.abstract}"
+        return header + "\n"
+
+    def pack(self, chunks: List[Dict[str, Any]], model: Optional[str] = None) -> str:
+        """Return the context block for chunks, grouped by paper in order of each paper's best chunk"""
+        budget = self.budget_for(model)
+
+        ranked = sorted(enumerate(chunks), key=lambda item: (-float(item[1].get("score") or 0.0), item[0]))
+
+        papers: Dict[str, _Paper] = {}
+        selected_shingles: List[Set[str]] = []
+        used = 0
+        dropped_duplicates = 0
+        dropped_budget = 0
+
+        for _, chunk in ranked:
+            parts = split_chunk_header(chunk.get("chunk_text", chunk.get("content", "")) or "")
+            body = parts["body"]
+            if not body:
+                continue
+
+            shingles = _shingles(body)
+            if any(_jaccard(shingles, seen) >= self.near_duplicate_threshold for seen in selected_shingles):
+                dropped_duplicates += 1
+                continue
+
+            arxiv_id = chunk.get("arxiv_id", "")
+            paper = papers.get(arxiv_id)
+            header_cost = 0
+            with_abstract = self.include_abstract
+
+            if paper is None:
+                paper = _Paper(
+                    arxiv_id=arxiv_id,
+                    title=chunk.get("title") or parts["title"],
+                    abstract=parts["abstract"] or chunk.get("abstract", ""),
+                )
+                header_cost = self.estimate_tokens(self._paper_header(paper, with_abstract))
+
+            excerpt = f"- {body}\n"
+            cost = header_cost + self.estimate_tokens(excerpt)
+
+            if used + cost > budget and arxiv_id not in papers and with_abstract:
+                # try again without the abstract before giving up on the chunk
+                with_abstract = False
+                header_cost = self.estimate_tokens(self._paper_header(paper, with_abstract))
+                cost = header_cost + self.estimate_tokens(excerpt)
+
+            if used + cost > budget:
+                if used > 0:
+                    dropped_budget += 1
+                    continue
+                # the best chunk alone is over budget, keep a truncated prefix of it
+                room = max(0, budget - header_cost) * self.chars_per_token
+                excerpt = f"- {body[:int(room)].rstrip()}\n"
+                cost = header_cost + self.estimate_tokens(excerpt)
+
+            if arxiv_id not in papers:
+                if not with_abstract:
+                    paper.abstract = ""
+                papers[arxiv_id] = paper
+
+            paper.excerpts.append(excerpt)
+            selected_shingles.append(shingles)
+            used += cost
+
+        if dropped_duplicates or dropped_budget:
+            logger.info(
+                f"Context packer kept {len(selected_shingles)}/{len(chunks)} chunks (~{used}/{budget} tokens), "
+                f"dropped {dropped_duplicates} near duplicates and {dropped_budget} over budget"
+            )
+
+        blocks = [self._paper_header(paper, True) + "".join(paper.excerpts) for paper in papers.values()]
+        return "\n".join(blocks)
@@ -1,19 +1,16 @@
 import json
 import re
+import textwrap
 from pathlib import Path
-from typing import Any,  Dict, List
+from typing import Any,  Dict, List, Optional
 from pydantic import ValidationError
 
 from src.schemas.ollama import RAGResponse
+from src.services.ollama.context import ContextPacker
 
-class RAGPromptBuilder:
-    """Prompt Class for creating RAG Prompts"""
-
-    def __init__(self):
-        self.system_prompt = self._load_system_prompt()
-    
-    def _load_system_prompt(self):
-        prompt = """
+# static part of every RAG prompt, kept byte-identical across requests so Ollama can reuse
+# the KV cache of this prefix instead of prefilling it again
+SYSTEM_PROMPT = textwrap.dedent("""
                 You are an AI assistant specialized in answering questions about academic papers from arXiv. Your task is to provide accurate, helpful answers based ONLY on the provided paper excerpts.
 
                 CRITICAL: Do NOT add any introductory text, explanations, or formatting comments like "Here's the answer" or "Here's the JSON".
@@ -35,33 +32,45 @@ class RAGPromptBuilder:
                 - Always acknowledge uncertainty when the excerpts are ambiguous or incomplete
                 - Prioritize relevance and clarity in your response
                 - NEVER add introductory phrases or explanations before your JSON response
-            """
-        return prompt
-    
-    def create_rag_prompt(self, query: str, chunks: List[Dict[str,Any]])->str:
-        """Create a RAG Prompt with query and retrieved chunks"""
-        prompt = f"{self.system_prompt}\n\n"
-        prompt += "### context from papers: \n\n"
+""").strip()
 
-        for i,chunk in enumerate(chunks,1):
-            chunk_text = chunk.get("chunk_text",chunk.get("content",""))
-            arxiv_id = chunk.get("arxiv_id","")
+CONTEXT_HEADER = "### context from papers: \n\n"
 
-            prompt += f"[{i}. arxiv: {arxiv_id}]\n"
-            prompt += (
-                "###Answer: \n Provide a natural, conversational response(not Json) and cire sources using [arxiv:id] format .\n"
 
-            )
+class RAGPromptBuilder:
+    """Prompt Class for creating RAG Prompts
+
+    Prompts start with the static prefix (system instructions and the context header) and only
+    then the per-request context and question, so consecutive requests share the longest
+    possible prefix.
+    """
+
+    def __init__(self, context_packer: Optional[ContextPacker] = None):
+        self.system_prompt = self._load_system_prompt()
+        self.static_prefix = f"{self.system_prompt}\n\n{CONTEXT_HEADER}"
+        self.context_packer = context_packer or ContextPacker()
+    
+    def _load_system_prompt(self):
+        return SYSTEM_PROMPT
+    
+    def create_rag_prompt(self, query: str, chunks: List[Dict[str,Any]], model: Optional[str] = None)->str:
+        """Create a RAG Prompt with query and retrieved chunks packed into the context budget of model"""
+        prompt = self.static_prefix
+        prompt += self.context_packer.pack(chunks, model)
+        prompt += f"\n### Question: {query}\n\n"
+        prompt += (
+            "###Answer: \n Provide a natural, conversational response(not Json) and cite sources using [arxiv:id] format .\n"
+        )
 
         return prompt
     
-    def create_structured_prompt(self,query:str , chunks: List[Dict[str,Any]])-> Dict[str,Any]:
+    def create_structured_prompt(self,query:str , chunks: List[Dict[str,Any]], model: Optional[str] = None)-> Dict[str,Any]:
         """Prompt for ollama structured output"""
-        prompt_text = self.create_rag_prompt(query,chunks)
+        prompt_text = self.create_rag_prompt(query,chunks,model)
 
         return {
             "prompt": prompt_text,
-            "format": RAGResponse.model_json_scheme(),
+            "format": RAGResponse.model_json_schema(),
         }        
     
 class ResponseParser:
@@ -0,0 +1,357 @@
+import asyncio
+from collections import deque
+from loguru import logger
+from typing import Any, Awaitable, Dict, List, Optional
+
+import numpy as np
+
+from opensearchpy import AsyncOpenSearch
+from src.config import Settings
+
+from .index_config_hybrid import HYBRID_RRF_PIPELINE
+from .query_builder import (
+    QueryBuilder,
+    build_hybrid_search_body,
+    build_vector_search_body,
+    parse_search_hits,
+    reciprocal_rank_fusion,
+)
+
+
+class _LatencyTracker:
+    """Rolling window of recent search latencies, used to decide when to hedge"""
+
+    def __init__(self, window: int, percentile: float, default_seconds: float, min_seconds: float):
+        self.samples: deque = deque(maxlen=max(1, window))
+        self.percentile = percentile
+        self.default_seconds = default_seconds
+        self.min_seconds = min_seconds
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def hedge_delay(self) -> float:
+        """Configured percentile of recent latencies, or the default until enough samples are in"""
+        if len(self.samples) < 20:
+            return self.default_seconds
+        return max(self.min_seconds, float(np.percentile(self.samples, self.percentile)))
+
+
+class AsyncOpenSearchClient:
+    """Non-blocking OpenSearch client for the API, backed by a pooled keep-alive connection per host
+
+    Read-only search paths used by the routers. Index management and bulk writes stay on
+    the synchronous OpenSearchClient used by Airflow.
+
+    Searches slower than the recent p95 are hedged with a duplicate request, which the
+    connection pool sends to the next host when several are configured, and the slower of
+    the two is cancelled. Search methods accept a latency budget and return what they have
+    with degraded=True when it runs out.
+    """
+
+    def __init__(self, host: str, settings: Settings):
+        self.host = host
+        self.settings = settings
+        self.index_name = f"{settings.opensearch.index_name}-{settings.opensearch.chunk_index_suffix}"
+        self.request_timeout = settings.opensearch.request_timeout
+        self.embedding_budget = settings.opensearch.embedding_budget_ms / 1000
+        # set by OpenSearchHealthMonitor so search outcomes feed the circuit breaker
+        self.circuit_breaker = None
+        # late query embeddings left to finish, and fill the query cache, after their search returned
+        self._background_embeddings: set = set()
+
+        self.hedge_enabled = settings.opensearch.hedge_enabled
+        self.latency = _LatencyTracker(
+            window=settings.opensearch.hedge_latency_window,
+            percentile=settings.opensearch.hedge_percentile,
+            default_seconds=settings.opensearch.hedge_default_delay_ms / 1000,
+            min_seconds=settings.opensearch.hedge_min_delay_ms / 1000,
+        )
+
+        self.client = AsyncOpenSearch(
+            # a comma separated host list spreads connections, and hedged duplicates, over several nodes
+            hosts=[h.strip() for h in host.split(",") if h.strip()],
+            use_ssl=False,
+            verify_certs=False,
+            ssl_show_warn=False,
+            maxsize=settings.opensearch.pool_maxsize,
+            timeout=settings.opensearch.request_timeout,
+            http_compress=settings.opensearch.http_compress,
+            max_retries=settings.opensearch.max_retries,
+            retry_on_timeout=False,
+        )
+
+        logger.info(f"Async OpenSearch client initialized with host: {host} (pool size {settings.opensearch.pool_maxsize})")
+
+    async def health_check(self) -> bool:
+        """Check if opensearch cluster is healthy"""
+        try:
+            health = await self.client.cluster.health(request_timeout=self.request_timeout)
+            return health["status"] in ["green", "yellow"]
+        except Exception as e:
+            logger.error(f"Health Check failed : {e}")
+            return False
+
+    async def _search(self, **search_kwargs) -> Dict[str, Any]:
+        """Run a search, sending a hedged duplicate if the first one is slower than the recent p95
+
+        Whichever request answers first wins and the other is cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        search_kwargs.setdefault("index", self.index_name)
+        search_kwargs.setdefault("request_timeout", self.request_timeout)
+
+        tasks = {asyncio.ensure_future(self.client.search(**search_kwargs))}
+        error: Optional[BaseException] = None
+
+        try:
+            if self.hedge_enabled:
+                done, _ = await asyncio.wait(tasks, timeout=self.latency.hedge_delay())
+                if not done:
+                    logger.debug("Search slower than hedge delay, sending hedged request")
+                    tasks.add(asyncio.ensure_future(self.client.search(**search_kwargs)))
+
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.latency.record(loop.time() - started)
+                        return task.result()
+                    error = task.exception()
+
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def get_index_stats(self) -> Dict[str, Any]:
+        """Get statistics for the hybrid index"""
+        try:
+            if not await self.client.indices.exists(index=self.index_name):
+                return {"index_name": self.index_name, "exists": False, "document_count": 0}
+
+            stats_response = await self.client.indices.stats(index=self.index_name)
+            index_stats = stats_response["indices"][self.index_name]["total"]
+
+            return {
+                "index_name": self.index_name,
+                "exists": True,
+                "document_count": index_stats["docs"]["count"],
+                "deleted_count": index_stats["docs"]["deleted"],
+                "size_in_bytes": index_stats["store"]["size_in_bytes"],
+            }
+
+        except Exception as e:
+            logger.error(f"Error gettings index stats: {e}")
+            return {"index_name": self.index_name, "exists": False, "document_count": 0, "error": str(e)}
+
+    async def search_chunks_vector(
+        self, query_embedding: List[float], size: int = 10, categories: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Pure vector search on chunks."""
+        try:
+            search_body = build_vector_search_body(query_embedding, size, categories)
+            response = await self._search(body=search_body)
+            return parse_search_hits(response)
+
+        except Exception as e:
+            logger.error(f"Vector search error: {e}")
+            return {"total": 0, "hits": []}
+
+    async def search_unified(
+        self,
+        query: str,
+        query_embedding: Optional[List[float]] = None,
+        size: int = 10,
+        from_: int = 0,
+        categories: Optional[List[str]] = None,
+        latest: bool = False,
+        use_hybrid: bool = True,
+        min_score: float = 0.0,
+        budget_seconds: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Unified search method supporting BM25 and hybrid modes, same contract as OpenSearchClient.search_unified
+
+        With budget_seconds set, a search that has not answered in time returns no hits and degraded=True.
+        """
+        try:
+            if query_embedding is None or not use_hybrid:
+                search = self._search_bm25_only(
+                    query=query, size=size, from_=from_, categories=categories, latest=latest
+                )
+            else:
+                search = self._search_hybrid_native(
+                    query=query, query_embedding=query_embedding, size=size, categories=categories, min_score=min_score
+                )
+
+            results = await asyncio.wait_for(search, budget_seconds)
+            results["degraded"] = False
+
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_success()
+            return results
+
+        except asyncio.TimeoutError:
+            logger.warning(f"Unified search exceeded {budget_seconds * 1000:.0f}ms budget")
+            return {"total": 0, "hits": [], "degraded": True}
+
+        except Exception as e:
+            logger.error(f"Unified search error: {e}")
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_failure()
+            return {"total": 0, "hits": [], "degraded": False}
+
+        finally:
+            # a timed out or cancelled search recorded no outcome and must not hold the half-open trial
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.release_trial()
+
+    async def search_hybrid_parallel(
+        self,
+        query: str,
+        query_embedding: Awaitable[Optional[List[float]]],
+        size: int = 10,
+        categories: Optional[List[str]] = None,
+        min_score: float = 0.0,
+        embedding_budget_seconds: Optional[float] = None,
+        budget_seconds: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Hybrid search that starts the BM25 leg while the query embedding is still being computed
+
+        The BM25 query is sent immediately. Once query_embedding resolves the k-NN leg runs and both
+        lists are fused client-side with RRF (same k as HYBRID_RRF_PIPELINE). If the embedding or the
+        k-NN leg fails, or the embedding takes longer than the embedding budget, the BM25 results are
+        returned alone. The result carries search_mode "hybrid" or "bm25" accordingly. A late
+        embedding is not cancelled, it finishes in the background so the query cache still gets it.
+
+        With budget_seconds set, whatever leg has answered when the budget runs out is returned
+        with degraded=True, BM25 alone if the k-NN leg is late and no hits if both are.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + budget_seconds if budget_seconds is not None else None
+
+        def remaining(limit: Optional[float] = None) -> Optional[float]:
+            if deadline is None:
+                return limit
+            left = max(0.0, deadline - loop.time())
+            return left if limit is None else min(left, limit)
+
+        if embedding_budget_seconds is None:
+            embedding_budget_seconds = self.embedding_budget
+
+        candidates = size * 2
+        embedding_task = asyncio.ensure_future(query_embedding)
+        bm25_task = asyncio.ensure_future(
+            self._search_bm25_only(query=query, size=candidates, from_=0, categories=categories, latest=False)
+        )
+        vector_task: Optional[asyncio.Task] = None
+
+        async def bm25_only(degraded: bool) -> Dict[str, Any]:
+            try:
+                bm25_results = await asyncio.wait_for(asyncio.shield(bm25_task), remaining())
+            except asyncio.TimeoutError:
+                logger.warning("BM25 leg exceeded the latency budget, returning no hits")
+                return {"total": 0, "hits": [], "search_mode": "bm25", "degraded": True}
+            return {
+                "total": bm25_results["total"],
+                "hits": bm25_results["hits"][:size],
+                "search_mode": "bm25",
+                "degraded": degraded,
+            }
+
+        try:
+            try:
+                embedding = await asyncio.wait_for(asyncio.shield(embedding_task), remaining(embedding_budget_seconds))
+            except asyncio.TimeoutError:
+                logger.warning(f"Query embedding exceeded {embedding_budget_seconds * 1000:.0f}ms budget, using BM25 only")
+                embedding = None
+            except Exception as e:
+                logger.warning(f"Query embedding failed, using BM25 only: {e}")
+                embedding = None
+
+            if embedding is None:
+                results = await bm25_only(degraded=deadline is not None and remaining() == 0.0)
+            else:
+                vector_task = asyncio.ensure_future(
+                    self._search(body=build_vector_search_body(embedding, candidates, categories))
+                )
+                try:
+                    vector_response, bm25_results = await asyncio.wait_for(
+                        asyncio.gather(asyncio.shield(vector_task), asyncio.shield(bm25_task)), remaining()
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning("Hybrid search exceeded the latency budget, returning partial results")
+                    if vector_task.done() and not vector_task.cancelled() and vector_task.exception() is None and not bm25_task.done():
+                        hits = parse_search_hits(vector_task.result())["hits"][:size]
+                        results = {"total": len(hits), "hits": hits, "search_mode": "hybrid", "degraded": True}
+                    else:
+                        results = await bm25_only(degraded=True)
+                except Exception as e:
+                    # raises again if it was the BM25 leg that failed
+                    logger.warning(f"k-NN leg failed, using BM25 only: {e}")
+                    results = await bm25_only(degraded=False)
+                else:
+                    vector_results = parse_search_hits(vector_response)
+                    hits = reciprocal_rank_fusion([bm25_results["hits"], vector_results["hits"]], size)
+                    hits = [hit for hit in hits if hit["score"] >= min_score]
+                    results = {"total": len(hits), "hits": hits, "search_mode": "hybrid", "degraded": False}
+
+            # nothing back in time says nothing about the cluster, the trial is just released below
+            if self.circuit_breaker is not None and (results["hits"] or not results["degraded"]):
+                self.circuit_breaker.record_success()
+
+            logger.info(f"Parallel hybrid search for '{query[:50]}...' returned {results['total']} results ({results['search_mode']})")
+            return results
+
+        except Exception as e:
+            logger.error(f"Parallel hybrid search error: {e}")
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_failure()
+            return {"total": 0, "hits": [], "search_mode": "bm25", "degraded": False}
+
+        finally:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.release_trial()
+            bm25_task.cancel()
+            if vector_task is not None:
+                vector_task.cancel()
+            if not embedding_task.done():
+                self._background_embeddings.add(embedding_task)
+                embedding_task.add_done_callback(self._background_embeddings.discard)
+
+    async def _search_bm25_only(
+        self, query: str, size: int, from_: int, categories: Optional[List[str]], latest: bool
+    ) -> Dict[str, Any]:
+        """Pure BM25 search implementation."""
+        builder = QueryBuilder(
+            query=query,
+            size=size,
+            from_=from_,
+            categories=categories,
+            latest_papers=latest,
+            search_chunks=True,
+        )
+
+        response = await self._search(body=builder.build())
+
+        results = parse_search_hits(response)
+
+        logger.info(f"BM25 search for '{query[:50]}...' returned {results['total']} results")
+        return results
+
+    async def _search_hybrid_native(
+        self, query: str, query_embedding: List[float], size: int, categories: Optional[List[str]], min_score: float
+    ) -> Dict[str, Any]:
+        """Native OpenSearch hybrid search with RRF pipeline."""
+        search_body = build_hybrid_search_body(query, query_embedding, size, categories)
+
+        response = await self._search(body=search_body, params={"search_pipeline": HYBRID_RRF_PIPELINE["id"]})
+
+        results = parse_search_hits(response, min_score=min_score)
+
+        logger.info(f"Native hybrid search for '{query[:50]}...' returned {results['total']} results")
+        return results
+
+    async def close(self) -> None:
+        await self.client.close()
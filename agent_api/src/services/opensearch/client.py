@@ -1,11 +1,14 @@
 from loguru import logger
 from typing import Any,  List, Dict , Optional
 
+import numpy as np
+import orjson
 from opensearchpy import OpenSearch
 from src.config import Settings
+from .generation import IndexGeneration
 from  .index_config_hybrid import ARXIV_PAPERS_CHUNKS_INDEX, ARXIV_PAPERS_CHUNKS_MAPPING, HYBRID_RRF_PIPELINE
 
-from .query_builder import QueryBuilder
+from .query_builder import QueryBuilder, build_hybrid_search_body, build_vector_search_body, parse_search_hits
 
 class OpenSearchClient:
     """OpenSearch Client supporting BM25 and Hybrid search with naive RRF"""
@@ -14,6 +17,8 @@ class OpenSearchClient:
         self.host = host
         self.settings = settings
         self.index_name = f"{settings.opensearch.index_name}-{settings.opensearch.chunk_index_suffix}"
+        # bumped after every write so cached retrieval results for the index go stale
+        self.generation: Optional[IndexGeneration] = None
 
         self.client = OpenSearch(
             hosts = [host],
@@ -133,31 +138,11 @@ class OpenSearchClient:
         :returns: Search results
         """
         try:
-            # Build filter
-            filter_clause = []
-            if categories:
-                filter_clause.append({"terms": {"categories": categories}})
-
-            search_body = {
-                "size": size,
-                "query": {"knn": {"embedding": {"vector": query_embedding, "k": size}}},
-                "_source": {"excludes": ["embedding"]},
-            }
-
-            if filter_clause:
-                search_body["query"] = {"bool": {"must": [search_body["query"]], "filter": filter_clause}}
+            search_body = build_vector_search_body(query_embedding, size, categories)
 
             response = self.client.search(index=self.index_name, body=search_body)
 
-            results = {"total": response["hits"]["total"]["value"], "hits": []}
-
-            for hit in response["hits"]["hits"]:
-                chunk = hit["_source"]
-                chunk["score"] = hit["_score"]
-                chunk["chunk_id"] = hit["_id"]
-                results["hits"].append(chunk)
-
-            return results
+            return parse_search_hits(response)
 
         except Exception as e:
             logger.error(f"Vector search error: {e}")
@@ -188,7 +173,7 @@ class OpenSearchClient:
         """
         try:
             # If no embedding provided or hybrid disabled, use BM25 only
-            if not query_embedding or not use_hybrid:
+            if query_embedding is None or not use_hybrid:
                 return self._search_bm25_only(query=query, size=size, from_=from_, categories=categories, latest=latest)
 
             # Use native OpenSearch hybrid search with RRF pipeline
@@ -216,17 +201,7 @@ class OpenSearchClient:
 
         response = self.client.search(index=self.index_name, body=search_body)
 
-        results = {"total": response["hits"]["total"]["value"], "hits": []}
-
-        for hit in response["hits"]["hits"]:
-            chunk = hit["_source"]
-            chunk["score"] = hit["_score"]
-            chunk["chunk_id"] = hit["_id"]
-
-            if "highlight" in hit:
-                chunk["highlights"] = hit["highlight"]
-
-            results["hits"].append(chunk)
+        results = parse_search_hits(response)
 
         logger.info(f"BM25 search for '{query[:50]}...' returned {results['total']} results")
         return results
@@ -235,43 +210,15 @@ class OpenSearchClient:
         self, query: str, query_embedding: List[float], size: int, categories: Optional[List[str]], min_score: float
     ) -> Dict[str, Any]:
         """Native OpenSearch hybrid search with RRF pipeline."""
-        builder = QueryBuilder(
-            query=query, size=size * 2, from_=0, categories=categories, latest_papers=False, search_chunks=True
-        )
-        bm25_search_body = builder.build()
-
-        bm25_query = bm25_search_body["query"]
-
-        hybrid_query = {"hybrid": {"queries": [bm25_query, {"knn": {"embedding": {"vector": query_embedding, "k": size * 2}}}]}}
-
-        search_body = {
-            "size": size,
-            "query": hybrid_query,
-            "_source": bm25_search_body["_source"],
-            "highlight": bm25_search_body["highlight"],
-        }
+        search_body = build_hybrid_search_body(query, query_embedding, size, categories)
 
         # Execute search with RRF pipeline
         response = self.client.search(
             index=self.index_name, body=search_body, params={"search_pipeline": HYBRID_RRF_PIPELINE["id"]}
         )
 
-        results = {"total": response["hits"]["total"]["value"], "hits": []}
-
-        for hit in response["hits"]["hits"]:
-            if hit["_score"] < min_score:
-                continue
-
-            chunk = hit["_source"]
-            chunk["score"] = hit["_score"]
-            chunk["chunk_id"] = hit["_id"]
+        results = parse_search_hits(response, min_score=min_score)
 
-            if "highlight" in hit:
-                chunk["highlights"] = hit["highlight"]
-
-            results["hits"].append(chunk)
-
-        results["total"] = len(results["hits"])
         logger.info(f"Native hybrid search for '{query[:50]}...' returned {results['total']} results")
         return results
 
@@ -306,27 +253,44 @@ class OpenSearchClient:
             logger.error(f"Error indexing chunk: {e}")
             return False
 
+    def _bulk_body(self, chunks: List[Dict[str, Any]]) -> bytes:
+        """Serialize bulk actions as NDJSON with orjson, writing float32 embeddings without boxing them into lists"""
+        action_line = orjson.dumps({"index": {"_index": self.index_name}})
+        lines = []
+        for chunk in chunks:
+            source = dict(chunk["chunk_data"])
+            source["embedding"] = np.asarray(chunk["embedding"], dtype=np.float32)
+            lines.append(action_line)
+            lines.append(orjson.dumps(source, option=orjson.OPT_SERIALIZE_NUMPY))
+        lines.append(b"")
+        return b"\n".join(lines)
+
     def bulk_index_chunks(self, chunks: List[Dict[str, Any]]) -> Dict[str, int]:
         """Bulk index multiple chunks with embeddings.
 
         :param chunks: List of dicts with 'chunk_data' and 'embedding'
         :returns: Statistics
         """
-        from opensearchpy import helpers
+        if not chunks:
+            return {"success": 0, "failed": 0}
 
         try:
-            actions = []
-            for chunk in chunks:
-                chunk_data = chunk["chunk_data"].copy()
-                chunk_data["embedding"] = chunk["embedding"]
-
-                action = {"_index": self.index_name, "_source": chunk_data}
-                actions.append(action)
-
-            success, failed = helpers.bulk(self.client, actions, refresh=True)
-
-            logger.info(f"Bulk indexed {success} chunks, {len(failed)} failed")
-            return {"success": success, "failed": len(failed)}
+            response = self.client.bulk(body=self._bulk_body(chunks), refresh=True)
+
+            success = 0
+            failed = 0
+            for item in response["items"]:
+                status = item.get("index", {}).get("status", 500)
+                if 200 <= status < 300:
+                    success += 1
+                else:
+                    failed += 1
+                    logger.warning(f"Bulk index item failed: {item.get('index', {}).get('error')}")
+
+            logger.info(f"Bulk indexed {success} chunks, {failed} failed")
+            if success and self.generation is not None:
+                self.generation.bump()
+            return {"success": success, "failed": failed}
 
         except Exception as e:
             logger.error(f"Bulk chunk indexing error: {e}")
@@ -345,6 +309,8 @@ class OpenSearchClient:
 
             deleted = response.get("deleted", 0)
             logger.info(f"Deleted {deleted} chunks for paper {arxiv_id}")
+            if deleted and self.generation is not None:
+                self.generation.bump()
             return deleted > 0
 
         except Exception as e:
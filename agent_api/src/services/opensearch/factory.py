@@ -3,9 +3,13 @@
 from functools import lru_cache
 from typing import Optional
 
+import redis
 from src.config import Settings, get_settings
 
+from .async_client import AsyncOpenSearchClient
 from .client import OpenSearchClient
+from .generation import IndexGeneration
+from .health import OpenSearchHealthMonitor
 
 
 @lru_cache(maxsize=1)
@@ -14,7 +18,9 @@ def make_opensearch_client(settings: Optional[Settings] = None) -> OpenSearchCli
     if settings is None:
         settings = get_settings()
 
-    return OpenSearchClient(host=settings.opensearch.host, settings=settings)
+    client = OpenSearchClient(host=settings.opensearch.host, settings=settings)
+    client.generation = make_index_generation(client.index_name, settings)
+    return client
 
 
 def make_opensearch_client_fresh(settings: Optional[Settings] = None, host: Optional[str] = None) -> OpenSearchClient:
@@ -25,4 +31,49 @@ def make_opensearch_client_fresh(settings: Optional[Settings] = None, host: Opti
     # Use provided host or settings host
     opensearch_host = host or settings.opensearch.host
 
-    return OpenSearchClient(host=opensearch_host, settings=settings)
+    client = OpenSearchClient(host=opensearch_host, settings=settings)
+    client.generation = make_index_generation(client.index_name, settings)
+    return client
+
+
+def make_index_generation(index_name: str, settings: Optional[Settings] = None) -> Optional[IndexGeneration]:
+    """Factory function to create the Redis backed index generation counter, None when the retrieval cache is off."""
+    if settings is None:
+        settings = get_settings()
+
+    if not settings.retrieval_cache.enabled:
+        return None
+
+    redis_settings = settings.redis
+    redis_client = redis.Redis(
+        host=redis_settings.host,
+        port=redis_settings.port,
+        password=redis_settings.password if redis_settings.password else None,
+        db=redis_settings.db,
+        socket_timeout=redis_settings.socket_timeout,
+        socket_connect_timeout=redis_settings.socket_connection_timeout,
+    )
+    return IndexGeneration(redis_client, index_name)
+
+
+def make_async_opensearch_client(settings: Optional[Settings] = None) -> AsyncOpenSearchClient:
+    """Factory function to create the pooled async OpenSearch client used by the API routers."""
+    if settings is None:
+        settings = get_settings()
+
+    return AsyncOpenSearchClient(host=settings.opensearch.host, settings=settings)
+
+
+def make_opensearch_health_monitor(
+    client: AsyncOpenSearchClient, settings: Optional[Settings] = None
+) -> OpenSearchHealthMonitor:
+    """Factory function to create the background health monitor and circuit breaker for the async client."""
+    if settings is None:
+        settings = get_settings()
+
+    return OpenSearchHealthMonitor(
+        client=client,
+        interval_seconds=settings.opensearch.health_check_interval_seconds,
+        failure_threshold=settings.opensearch.circuit_failure_threshold,
+        reset_timeout_seconds=settings.opensearch.circuit_reset_timeout_seconds,
+    )
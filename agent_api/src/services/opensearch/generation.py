@@ -0,0 +1,29 @@
+from loguru import logger
+from typing import Optional
+
+import redis
+
+
+def index_generation_key(index_name: str) -> str:
+    """Redis key holding the write generation of an index"""
+    return f"index_generation:{index_name}"
+
+
+class IndexGeneration:
+    """Monotonic write counter for an index, kept in Redis so readers in other processes see every bump
+
+    Cached retrieval results record the generation they were computed at and are treated as
+    stale once the counter has moved on.
+    """
+
+    def __init__(self, redis_client: redis.Redis, index_name: str):
+        self.redis = redis_client
+        self.key = index_generation_key(index_name)
+
+    def bump(self) -> Optional[int]:
+        """Advance the generation after the index changed; failures are logged, never raised into the write path"""
+        try:
+            return self.redis.incr(self.key)
+        except Exception as e:
+            logger.warning(f"Failed to bump index generation {self.key}: {e}")
+            return None
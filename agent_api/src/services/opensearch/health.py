@@ -0,0 +1,126 @@
+import asyncio
+import time
+from loguru import logger
+from typing import Optional
+
+from .async_client import AsyncOpenSearchClient
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker for OpenSearch calls
+
+    The circuit opens after failure_threshold consecutive failures and stays open for
+    reset_timeout_seconds. After that a single trial request is let through (half-open);
+    its success closes the circuit and its failure opens it again. A trial that ends
+    without either is released, letting the next request through as the trial.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout_seconds: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    def allow_request(self) -> bool:
+        """Whether a request may be sent now, without any network round trip"""
+        if self.state == self.CLOSED:
+            return True
+
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout_seconds:
+                return False
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+        if self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info("OpenSearch circuit closed")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Free the half-open trial after a request that ended without an outcome, cut short
+        by its latency budget or cancelled, so the next request can be the trial"""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.trip()
+
+    def trip(self) -> None:
+        if self.state != self.OPEN:
+            logger.warning(f"OpenSearch circuit opened after {self.consecutive_failures} failures")
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+
+class OpenSearchHealthMonitor:
+    """Polls cluster health in the background and exposes the cached status and circuit breaker"""
+
+    def __init__(
+        self,
+        client: AsyncOpenSearchClient,
+        interval_seconds: float = 10.0,
+        failure_threshold: int = 3,
+        reset_timeout_seconds: float = 30.0,
+    ):
+        self.client = client
+        self.interval_seconds = interval_seconds
+        self.breaker = CircuitBreaker(failure_threshold=failure_threshold, reset_timeout_seconds=reset_timeout_seconds)
+        self.client.circuit_breaker = self.breaker
+        self.healthy = False
+        self.last_checked: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def check(self) -> bool:
+        """Run one health check and update the cached status and breaker"""
+        self.healthy = await self.client.health_check()
+        self.last_checked = time.time()
+
+        if self.healthy:
+            self.breaker.record_success()
+        else:
+            self.breaker.trip()
+
+        return self.healthy
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"OpenSearch health poll failed: {e}")
+
+    async def start(self) -> None:
+        """Check once so the status is known before serving, then keep polling"""
+        await self.check()
+        self._task = asyncio.create_task(self._poll())
+        logger.info(f"OpenSearch health monitor started (every {self.interval_seconds}s)")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def allow_request(self) -> bool:
+        return self.breaker.allow_request()
@@ -64,6 +64,9 @@ ARXIV_PAPERS_CHUNKS_MAPPING = {
     },
 }
 
+# k in the RRF formula 1/(k+rank), shared with the client-side fusion in query_builder
+RRF_RANK_CONSTANT = 60
+
 HYBRID_RRF_PIPELINE = {
     "id": "hybrid-rrf-pipeline",
     "description": "Post processor for hybrid RRF search",
@@ -72,7 +75,7 @@ HYBRID_RRF_PIPELINE = {
             "score-ranker-processor": {
                 "combination": {
                     "technique": "rrf",  # Reciprocal Rank Fusion
-                    "rank_constant": 60,  # Default k=60 for RRF formula: 1/(k+rank)
+                    "rank_constant": RRF_RANK_CONSTANT,  # Default k=60 for RRF formula: 1/(k+rank)
                 }
             }
         }
@@ -1,6 +1,7 @@
 from loguru import logger
 from typing import Any, Dict, List, Optional
 
+from .index_config_hybrid import RRF_RANK_CONSTANT
 
 
 class QueryBuilder:
@@ -155,3 +156,82 @@ class QueryBuilder:
             return None
 
         return [{"published_date": {"order": "desc"}}, "_score"]
+
+
+def build_vector_search_body(query_embedding: List[float], size: int, categories: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Build a pure k-NN search body over chunk embeddings"""
+    search_body = {
+        "size": size,
+        "query": {"knn": {"embedding": {"vector": query_embedding, "k": size}}},
+        "_source": {"excludes": ["embedding"]},
+    }
+
+    if categories:
+        search_body["query"] = {"bool": {"must": [search_body["query"]], "filter": [{"terms": {"categories": categories}}]}}
+
+    return search_body
+
+
+def build_hybrid_search_body(
+    query: str, query_embedding: List[float], size: int, categories: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Build a hybrid (BM25 + k-NN) search body to run through the RRF search pipeline"""
+    builder = QueryBuilder(
+        query=query, size=size * 2, from_=0, categories=categories, latest_papers=False, search_chunks=True
+    )
+    bm25_search_body = builder.build()
+
+    bm25_query = bm25_search_body["query"]
+
+    hybrid_query = {"hybrid": {"queries": [bm25_query, {"knn": {"embedding": {"vector": query_embedding, "k": size * 2}}}]}}
+
+    return {
+        "size": size,
+        "query": hybrid_query,
+        "_source": bm25_search_body["_source"],
+        "highlight": bm25_search_body["highlight"],
+    }
+
+
+def parse_search_hits(response: Dict[str, Any], min_score: Optional[float] = None) -> Dict[str, Any]:
+    """Flatten an OpenSearch response into chunk dicts with score, chunk_id and highlights"""
+    results = {"total": response["hits"]["total"]["value"], "hits": []}
+
+    for hit in response["hits"]["hits"]:
+        if min_score is not None and hit["_score"] < min_score:
+            continue
+
+        chunk = hit["_source"]
+        chunk["score"] = hit["_score"]
+        chunk["chunk_id"] = hit["_id"]
+
+        if "highlight" in hit:
+            chunk["highlights"] = hit["highlight"]
+
+        results["hits"].append(chunk)
+
+    if min_score is not None:
+        results["total"] = len(results["hits"])
+
+    return results
+
+
+def reciprocal_rank_fusion(
+    result_lists: List[List[Dict[str, Any]]], size: int, rank_constant: int = RRF_RANK_CONSTANT
+) -> List[Dict[str, Any]]:
+    """Fuse ranked hit lists client-side with RRF, score(d) = sum over lists of 1 / (rank_constant + rank)
+
+    Hits are matched on chunk_id. The first occurrence of a hit keeps its fields (and highlights),
+    and its score is replaced by the fused score.
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    scores: Dict[str, float] = {}
+
+    for hits in result_lists:
+        for rank, hit in enumerate(hits, 1):
+            chunk_id = hit["chunk_id"]
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (rank_constant + rank)
+            fused.setdefault(chunk_id, hit)
+
+    ranked = sorted(scores, key=scores.get, reverse=True)[:size]
+    return [{**fused[chunk_id], "score": scores[chunk_id]} for chunk_id in ranked]
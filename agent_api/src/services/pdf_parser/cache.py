@@ -0,0 +1,98 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from importlib import metadata
+from loguru import logger
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.schemas.pdf_parser.models import PdfContent
+from src.services.cache.client import pack_value, unpack_value
+
+# bump when the PdfContent produced from the same Docling output changes
+PARSER_CACHE_VERSION = 1
+
+
+def _docling_version() -> str:
+    try:
+        return metadata.version("docling")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def file_sha256(path: Path, block_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ParsedPdfCache:
+    """Content addressed on-disk cache of parse results
+
+    Entries are keyed by the sha256 of the PDF bytes together with the parser version and the
+    pipeline options, so a re-downloaded copy of the same paper hits and a change of Docling
+    version or options misses. Values are stored in the msgpack/zlib encoding of the Redis
+    caches and written through a temp file and rename, so a crashed write never leaves a
+    truncated entry behind.
+    """
+
+    def __init__(self, cache_dir: str, options: Dict[str, Any], compression_threshold: int = 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.compression_threshold = compression_threshold
+        fingerprint = {"parser": PARSER_CACHE_VERSION, "docling": _docling_version(), "options": options}
+        self._fingerprint = json.dumps(fingerprint, sort_keys=True)
+
+    def _key(self, pdf_path: Path) -> str:
+        return hashlib.sha256(f"{file_sha256(pdf_path)}:{self._fingerprint}".encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.msgpack"
+
+    def _read(self, key: str) -> Optional[PdfContent]:
+        entry_path = self._entry_path(key)
+        if not entry_path.exists():
+            return None
+
+        try:
+            return PdfContent.model_validate(unpack_value(entry_path.read_bytes()))
+        except Exception as e:
+            logger.warning(f"Discarding unreadable parse cache entry {entry_path.name}: {e}")
+            entry_path.unlink(missing_ok=True)
+            return None
+
+    def _write(self, key: str, content: PdfContent) -> None:
+        entry_path = self._entry_path(key)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=entry_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(pack_value(content.model_dump(mode="json"), self.compression_threshold))
+            os.replace(tmp_path, entry_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    async def key(self, pdf_path: Path) -> str:
+        """Cache key of pdf_path, hashing the file off the event loop"""
+        return await asyncio.to_thread(self._key, pdf_path)
+
+    async def get(self, key: str) -> Optional[PdfContent]:
+        try:
+            return await asyncio.to_thread(self._read, key)
+        except OSError as e:
+            logger.warning(f"Parse cache lookup failed for {key[:16]}: {e}")
+            return None
+
+    async def set(self, key: str, content: PdfContent) -> bool:
+        try:
+            await asyncio.to_thread(self._write, key, content)
+            return True
+        except OSError as e:
+            logger.warning(f"Failed to store parse result {key[:16]}: {e}")
+            return False
@@ -1,35 +1,78 @@
+import asyncio
+import time
 from loguru import logger
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import pypdfium2 as pdfium
 from docling.datamodel.base_models import InputFormat
-from docling.datamodel.pipeline_options import PdfpipelineOptions
+from docling.datamodel.pipeline_options import PdfPipelineOptions
 from docling.document_converter import DocumentConverter,PdfFormatOption
 from src.exceptions import PDFParsingException, PDFValidationError
 from src.schemas.pdf_parser.models import PaperFigure , PaperSection,ParserType,PdfContent
 
+# one page PDF with headings, body text and a small table, run through the pipeline at startup
+WARMUP_PDF_PATH = Path(__file__).parent / "assets" / "warmup.pdf"
+
 class DoclingParser:
     """DOcling PDF parser for scientific document Processing."""
 
-    def _init__(self,max_pages:int,max_file_size_mb:int,do_ocr:bool = False,do_table_Structure:bool = True):
-        """Initialize DOcumentCOnverter with Optimized Pipeline options"""
-        pipeline_options  = PdfpipelineOptions(
-            do_table_Structure = do_table_Structure,
+    def __init__(
+            self,
+            max_pages:int,
+            max_file_size_mb:int,
+            do_ocr:bool = False,
+            do_table_structure:bool = True,
+            tiered:bool = False,
+            structure_pages:int = 12,
+            max_text_pages:int = 300,
+    ):
+        """Initialize DOcumentCOnverter with Optimized Pipeline options
+
+        In tiered mode the whole text layer is read with pypdfium2 and the Docling structure
+        pass only runs on the first structure_pages pages, so papers longer than max_pages are
+        still parsed, up to max_text_pages.
+        """
+        pipeline_options  = PdfPipelineOptions(
+            do_table_structure = do_table_structure,
             do_ocr = do_ocr,
         )
         self._converter = DocumentConverter(format_options={InputFormat.PDF : PdfFormatOption(pipeline_options=pipeline_options)})
         self._warmed_up = False
         self.max_pages = max_pages
         self.max_file_size_bytes = max_file_size_mb *1024*1024
+        self.tiered = tiered
+        self.structure_pages = structure_pages
+        self.max_text_pages = max_text_pages
+
+    def _load_models(self):
+        """Build the PDF pipeline, loading the layout and table structure weights without running them
+
+        Nothing is inferred, so no torch or OpenMP thread pool is started; this is what the
+        parent does before forking parser workers.
+        """
+        start = time.perf_counter()
+        self._converter.initialize_pipeline(InputFormat.PDF)
+        logger.info(f"Docling models loaded in {time.perf_counter() - start:.1f}s")
 
     def _warm_up_models(self):
-        """Pre Warm the models to avoid cold start"""
+        """Pre Warm the models to avoid cold start
+
+        Converts the bundled warm-up PDF so the layout and table structure models are loaded
+        and have run once before the first real paper.
+        """
         if not self._warmed_up:
+            start = time.perf_counter()
+            try:
+                self._converter.convert(str(WARMUP_PDF_PATH),max_num_pages=1)
+                logger.info(f"Docling models warmed up in {time.perf_counter() - start:.1f}s")
+            except Exception as e:
+                logger.warning(f"Docling warm up failed, models will load on the first parse: {e}")
             self._warmed_up =True
 
-    def _validate_pdf(self,pdf_path:Path)->bool:
-        """Comprehensive PDF Validation including size and page limits"""
+    def _validate_pdf(self,pdf_path:Path,max_pages:Optional[int] = None)->Optional[int]:
+        """Comprehensive PDF Validation including size and page limits, returns the page count"""
+        max_pages = max_pages or self.max_pages
         try:
             if pdf_path.stat().st_size ==0:
                 logger.error(f"PDF File is Empty: {pdf_path}")
@@ -48,10 +91,10 @@ class DoclingParser:
             number_of_pages = len(pdf_doc)
             pdf_doc.close()
 
-            if number_of_pages>self.max_pages:
-                logger.warning(f"PDF has {number_of_pages} , exceeding limit of {self.max_pages}, skipping processing to avoid performance issues")
-                raise PDFValidationError(f"PDF Has too many pages: {number_of_pages}> {self.max_pages}")
-            return True
+            if number_of_pages>max_pages:
+                logger.warning(f"PDF has {number_of_pages} , exceeding limit of {max_pages}, skipping processing to avoid performance issues")
+                raise PDFValidationError(f"PDF Has too many pages: {number_of_pages}> {max_pages}")
+            return number_of_pages
         except PDFValidationError as e:
             raise
         except Exception as e:
@@ -59,35 +102,108 @@ class DoclingParser:
 
 
     async def parse_pdf(self,pdf_path:Path)->Optional[PdfContent]:
-        """parse PDF using Docling Parser
-        Limited to 20 pages to avoid memory issues with large papers"""
+        """parse PDF using Docling Parser in a worker thread so the event loop is not blocked"""
+        return await asyncio.to_thread(self.convert_pdf,pdf_path)
 
+    def _extract_text_layer(self,pdf_path:Path)->List[str]:
+        """Text of every page from the PDF text layer, cheap compared to the Docling pipeline"""
+        pdf_doc = pdfium.PdfDocument(str(pdf_path))
         try:
-            self._validate_pdf(pdf_path)
-            self._warm_up_models()
+            page_texts = []
+            for page in pdf_doc:
+                text_page = page.get_textpage()
+                page_texts.append(text_page.get_text_range().replace("\r\n","\n").strip())
+                text_page.close()
+                page.close()
+            return page_texts
+        finally:
+            pdf_doc.close()
 
-            result = self._converter.convert(str(pdf_path),max_file_size=self.max_file_size_bytes,max_num_pages=self.max_pages)
+    def _extract_sections(self,doc)->List[PaperSection]:
+        """Group the text items of a Docling document into sections at each title or section header"""
+        sections = []
+        current_section = {"title": "Content","content":""}
 
-            doc = result.document
+        for element in doc.texts:
+            if hasattr(element,"label") and element.label in ["title","section_header"]:
+                if current_section["content"].strip():
+                    sections.append(PaperSection(title=current_section["title"],content =current_section["content"].strip(),level=1))
 
-            sections = []
-            current_section = {"title": "Content","content":""}
+                current_section = {"title": element.text.strip(),"content":""}
 
-            for element in doc.texts:
-                if hasattr(element,"labels") and element.label in ["title","section_header"]:
-                    if current_section["content"].strip():
-                        sections.append(PaperSection(title=current_section["title"],content =current_section["content"].strip()))
+            else:
+                if hasattr(element,"text") and element.text:
+                    current_section["content"] += element.text + "\n"
+        if current_section["content"].strip():
+            sections.append(PaperSection(title=current_section["title"],content = current_section["content"].strip(),level=1))
+
+        return sections
+
+    def _convert_tiered(self,pdf_path:Path)->PdfContent:
+        """Text layer for the whole paper, Docling structure for the first structure_pages pages
+
+        Pages after the structure pass are appended as one section from the text layer. If the
+        structure pass fails and the text layer has content, the text layer alone is returned.
+        """
+        number_of_pages = self._validate_pdf(pdf_path,self.max_text_pages) or 0
+        page_texts = self._extract_text_layer(pdf_path)
+        raw_text = "\n\n".join(text for text in page_texts if text)
+        structure_pages = min(self.structure_pages,len(page_texts))
+        # a PDF without a text layer needs the structure pass even when it is switched off
+        if not raw_text:
+            structure_pages = max(structure_pages,min(1,len(page_texts)))
+
+        sections = []
+        parser_used = ParserType.PDFIUM
+
+        if structure_pages > 0:
+            try:
+                self._warm_up_models()
+                result = self._converter.convert(
+                    str(pdf_path),max_file_size=self.max_file_size_bytes,page_range=(1,structure_pages)
+                )
+                sections = self._extract_sections(result.document)
+                raw_text = raw_text or result.document.export_to_text()
+                parser_used = ParserType.DOCLING
+            except Exception as e:
+                if not raw_text:
+                    raise
+                logger.warning(f"Docling structure pass failed for {pdf_path.name}, using the text layer only: {e}")
+                structure_pages = 0
+
+        remaining_text = "\n\n".join(text for text in page_texts[structure_pages:] if text)
+        if remaining_text:
+            sections.append(PaperSection(title=f"Pages {structure_pages + 1}-{len(page_texts)}",content=remaining_text,level=1))
+
+        return PdfContent(
+            sections = sections,
+            raw_text = raw_text,
+            parser_used = parser_used,
+            metadata={
+                "source":"docling+pdfium" if parser_used == ParserType.DOCLING else "pdfium",
+                "total_pages": number_of_pages or len(page_texts),
+                "structure_pages": structure_pages,
+                "note":"Content Extracted from PDF, metadata comes from ArXiv API",
+            }
+        )
 
-                    current_section = {"title": element.text.strip(),"content":""}
+    def convert_pdf(self,pdf_path:Path)->Optional[PdfContent]:
+        """parse PDF using Docling Parser, synchronously
+        Limited to max_pages to avoid memory issues with large papers, unless tiered"""
 
-                else:
-                    if hasattr(element,"text") and element.text:
-                        current_section["content"] += element.text + "\n"
-            if current_section["content"].strip():
-                sections.append(PaperSection(title=current_section["title"],content = current_section["content"].strip()))
+        try:
+            if self.tiered:
+                return self._convert_tiered(pdf_path)
+
+            self._validate_pdf(pdf_path)
+            self._warm_up_models()
+
+            result = self._converter.convert(str(pdf_path),max_file_size=self.max_file_size_bytes,max_num_pages=self.max_pages)
+
+            doc = result.document
 
             return PdfContent(
-                sections = sections,
+                sections = self._extract_sections(doc),
                 figures = [],
                 labels = [],
                 raw_text = doc.export_to_text(),
@@ -96,7 +212,7 @@ class DoclingParser:
                 metadata={"source":"docling","note":"Content Extracted from PDF, metadata comes from ArXiv API"}
             )
 
-        except Exception as e:
+        except PDFValidationError as e:
             error_msg = str(e).lower()
 
             if "too large" in error_msg or "too many pages" in error_msg:
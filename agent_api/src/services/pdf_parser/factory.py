@@ -1,15 +1,43 @@
 from functools import lru_cache
 
 from src.config import get_settings
+from .cache import ParsedPdfCache
 from .parser import PDFParserService
 
 @lru_cache(maxsize=1)
 def make_pdf_parser_service()->PDFParserService:
     """Cache PDF Parser Serrvice"""
     settings = get_settings()
+
+    result_cache = None
+    if settings.pdf_parser.cache_enabled:
+        result_cache = ParsedPdfCache(
+            cache_dir= settings.pdf_parser.cache_dir,
+            options= {
+                "max_pages": settings.pdf_parser.max_pages,
+                "do_ocr": settings.pdf_parser.do_ocr,
+                "do_table_structure": settings.pdf_parser.do_table_structure,
+                "tiered": settings.pdf_parser.tiered_parsing,
+                "structure_pages": settings.pdf_parser.structure_pages,
+                "max_text_pages": settings.pdf_parser.max_text_pages,
+            },
+            compression_threshold= settings.redis.compression_threshold_bytes,
+        )
+
     return PDFParserService(
         max_pages= settings.pdf_parser.max_pages,
         max_file_size_mb= settings.pdf_parser.max_file_size_mb,
         do_ocr = settings.pdf_parser.do_ocr,
         do_table_structure=settings.pdf_parser.do_table_structure, 
+        tiered= settings.pdf_parser.tiered_parsing,
+        structure_pages= settings.pdf_parser.structure_pages,
+        max_text_pages= settings.pdf_parser.max_text_pages,
+        max_workers= settings.arxiv.max_concurrent_parsing,
+        parse_timeout_seconds= settings.pdf_parser.parse_timeout_seconds,
+        worker_start_timeout_seconds= settings.pdf_parser.worker_start_timeout_seconds,
+        worker_memory_limit_mb= settings.pdf_parser.worker_memory_limit_mb,
+        max_docs_per_worker= settings.pdf_parser.max_docs_per_worker,
+        start_method= settings.pdf_parser.start_method,
+        preload_models= settings.pdf_parser.preload_models,
+        result_cache= result_cache,
     )
\ No newline at end of file
@@ -5,20 +5,58 @@ from typing import Optional
 from src.exceptions import PDFParsingException , PDFValidationError
 from src.schemas.pdf_parser.models import PdfContent
 
-from .docling import DoclingParser
+from .cache import ParsedPdfCache
+from .pool import ParserWorkerPool
 
 class PDFParserService:
-    """PDF Parsing using DOcling"""
+    """PDF Parsing using DOcling
 
-    def __init__(self,max_pages:int,max_file_size_mb:int,do_ocr:bool= False,do_table_structure:bool= True):
+    Parsing runs in a pool of worker processes, so it never blocks the event loop and at most
+    max_workers PDFs are parsed at once. Workers are started by start(), or else by the
+    first parse.
+    With a result cache, a PDF whose bytes were already parsed with the same options is
+    served from disk without reaching the workers.
+    """
+
+    def __init__(
+            self,
+            max_pages:int,
+            max_file_size_mb:int,
+            do_ocr:bool= False,
+            do_table_structure:bool= True,
+            tiered:bool = False,
+            structure_pages:int = 12,
+            max_text_pages:int = 300,
+            max_workers:int = 1,
+            parse_timeout_seconds:float = 300.0,
+            worker_start_timeout_seconds:float = 180.0,
+            worker_memory_limit_mb:int = 0,
+            max_docs_per_worker:int = 50,
+            start_method:str = "spawn",
+            preload_models:bool = False,
+            result_cache:Optional[ParsedPdfCache] = None,
+    ):
         """Initialize PDF Parser service with configurable limits"""
 
-        self.docling_parser = DoclingParser(
-            max_pages = max_pages,
-            max_file_size_mb = max_file_size_mb,
-            do_ocr = do_ocr,
-            do_table_structure = do_table_structure
+        self.worker_pool = ParserWorkerPool(
+            parser_kwargs = {
+                "max_pages": max_pages,
+                "max_file_size_mb": max_file_size_mb,
+                "do_ocr": do_ocr,
+                "do_table_structure": do_table_structure,
+                "tiered": tiered,
+                "structure_pages": structure_pages,
+                "max_text_pages": max_text_pages,
+            },
+            workers = max_workers,
+            parse_timeout_seconds = parse_timeout_seconds,
+            start_timeout_seconds = worker_start_timeout_seconds,
+            memory_limit_mb = worker_memory_limit_mb,
+            max_docs_per_worker = max_docs_per_worker,
+            start_method = start_method,
+            preload_models = preload_models,
         )
+        self.result_cache = result_cache
 
     async def parse_pdf(self,pdf_path:Path)->Optional[PdfContent]:
         """Parse pDF using Docling"""
@@ -26,9 +64,19 @@ class PDFParserService:
             logger.error(f"PDF File not Found: {pdf_path}")
             raise PDFValidationError(f"PDF file not found: {pdf_path}")
         try:
-            result = await self.docling_parser.parse_pdf(pdf_path)
+            cache_key = None
+            if self.result_cache is not None:
+                cache_key = await self.result_cache.key(pdf_path)
+                cached = await self.result_cache.get(cache_key)
+                if cached:
+                    logger.info(f"Parse cache hit for {pdf_path.name}")
+                    return cached
+
+            result = await self.worker_pool.parse(pdf_path)
             if result:
                 logger.info(f"Parsed  {pdf_path}")
+                if cache_key is not None:
+                    await self.result_cache.set(cache_key, result)
                 return result
             else:
                 logger.error(f"Docling Parsing returned no results fro {pdf_path.name}")
@@ -38,4 +86,12 @@ class PDFParserService:
 
         except Exception as e:
             logger.error(f"Docling Parsing Error fro {pdf_path.name}: {e}")
-            raise PDFParsingException(f"Docling Parsing Error {pdf_path.name}: {e}")
\ No newline at end of file
+            raise PDFParsingException(f"Docling Parsing Error {pdf_path.name}: {e}")
+
+    def start(self)->None:
+        """Start and warm the parser workers now instead of on the first parse, blocking while models preload"""
+        self.worker_pool.start()
+
+    def close(self)->None:
+        """Stop the parser worker processes"""
+        self.worker_pool.close()
\ No newline at end of file
@@ -0,0 +1,332 @@
+import asyncio
+import gc
+import itertools
+import json
+import multiprocessing
+import os
+from loguru import logger
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.exceptions import PDFParsingException, PDFValidationError
+from src.schemas.pdf_parser.models import PdfContent
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# parser whose models the fork server loaded before forking, inherited copy-on-write by every worker
+_preloaded_parser = None
+
+# hands the parser arguments to the fork server, which reads them when it imports the preload module
+_PRELOAD_ENV = "PDF_PARSER_PRELOAD_KWARGS"
+
+
+class _MemoryLimitExceeded(Exception):
+    pass
+
+
+def _worker_main(conn: Connection, parser_kwargs: Dict[str, Any]) -> None:
+    """Worker process loop: load the Docling models once, then parse every path sent over conn
+
+    Replies are (status, job_id, payload) tuples, status being one of ready, failed, ok,
+    invalid or error. A None message or a closed pipe stops the worker.
+    """
+    from .docling import DoclingParser
+
+    try:
+        parser = _preloaded_parser if _preloaded_parser is not None else DoclingParser(**parser_kwargs)
+        parser._warm_up_models()
+    except Exception as e:
+        conn.send(("failed", None, f"{type(e).__name__}: {e}"))
+        return
+
+    conn.send(("ready", None, None))
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+
+        job_id, pdf_path = message
+        try:
+            content = parser.convert_pdf(Path(pdf_path))
+            conn.send(("ok", job_id, content.model_dump(mode="json") if content else None))
+        except PDFValidationError as e:
+            conn.send(("invalid", job_id, str(e)))
+        except MemoryError:
+            conn.send(("error", job_id, f"Out of Memory Processing PDF: {pdf_path}"))
+            return
+        except Exception as e:
+            conn.send(("error", job_id, str(e)))
+
+
+def _load_models_for_workers(parser_kwargs: Dict[str, Any]) -> None:
+    """Load the models in this process, without running them, so forked workers inherit them"""
+    global _preloaded_parser
+    if _preloaded_parser is not None:
+        return
+
+    from .docling import DoclingParser
+
+    parser = DoclingParser(**parser_kwargs)
+    parser._load_models()
+    _preloaded_parser = parser
+    # keep the collector from touching, and so copying, the inherited model objects in the workers
+    gc.freeze()
+
+
+class _Worker:
+    """Handle on one parser process and the parent end of its pipe"""
+
+    def __init__(self, ctx: multiprocessing.context.BaseContext, parser_kwargs: Dict[str, Any]):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, parser_kwargs), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.docs_parsed = 0
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+    def memory_bytes(self) -> int:
+        """Proportional set size of the worker, so pages shared with the parent or other workers
+        count once; falls back to resident size, and 0 where /proc is not available"""
+        try:
+            with open(f"/proc/{self.pid}/smaps_rollup") as f:
+                for line in f:
+                    if line.startswith("Pss:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            pass
+
+        try:
+            with open(f"/proc/{self.pid}/statm") as f:
+                return int(f.read().split()[1]) * _PAGE_SIZE
+        except (OSError, ValueError, IndexError):
+            return 0
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Ask the worker to exit after its current document, killing it if it does not"""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.kill()
+        self.conn.close()
+
+    def kill(self) -> None:
+        self.process.kill()
+        self.process.join(5)
+        self.conn.close()
+
+
+class ParserWorkerPool:
+    """Fixed size pool of Docling worker processes with an async parse API
+
+    The pool size bounds how many PDFs are parsed at once. Each worker loads the Docling
+    models once when it starts and is replaced after max_docs_per_worker documents to stop
+    memory creep. A document that runs past parse_timeout_seconds, or drives the worker's
+    memory above memory_limit_mb, gets its worker killed and replaced, so one bad
+    PDF cannot stall or exhaust the pool.
+
+    With preload_models the workers come from a forkserver that loads the models once, so
+    they share the model weights copy-on-write instead of each loading its own copy. The
+    server is a fresh single threaded process, where forking from this one could copy a lock
+    held by one of its threads into the child. It never runs the models either: the torch
+    and OpenMP thread pools an inference starts do not survive a fork, so each worker runs
+    its own warm-up conversion. Only use it for CPU inference, CUDA cannot be used again in
+    a forked child.
+    """
+
+    def __init__(
+        self,
+        parser_kwargs: Dict[str, Any],
+        workers: int = 1,
+        parse_timeout_seconds: float = 300.0,
+        start_timeout_seconds: float = 180.0,
+        memory_limit_mb: int = 0,
+        max_docs_per_worker: int = 50,
+        start_method: str = "spawn",
+        preload_models: bool = False,
+        poll_interval_seconds: float = 0.5,
+    ):
+        self.parser_kwargs = parser_kwargs
+        self.size = max(1, workers)
+        self.parse_timeout = parse_timeout_seconds
+        self.start_timeout = start_timeout_seconds
+        self.memory_limit_bytes = memory_limit_mb * 1024 * 1024
+        self.max_docs_per_worker = max_docs_per_worker
+        self.poll_interval = poll_interval_seconds
+        self.preload_models = preload_models
+        if preload_models and start_method != "forkserver":
+            logger.info(f"Preloading parser models requires forkserver workers, ignoring start method {start_method}")
+            start_method = "forkserver"
+        self._ctx = multiprocessing.get_context(start_method)
+        self._workers: List[_Worker] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._job_ids = itertools.count(1)
+
+    def _preload(self) -> None:
+        """Start the fork server with the models loaded, for every worker forked from it to share
+
+        A server that other code already started cannot be preloaded; its workers load their
+        own models.
+        """
+        from multiprocessing import forkserver
+
+        self._ctx.set_forkserver_preload([f"{__package__}.preload"])
+        os.environ[_PRELOAD_ENV] = json.dumps(self.parser_kwargs)
+        try:
+            forkserver.ensure_running()
+        finally:
+            os.environ.pop(_PRELOAD_ENV, None)
+
+    def start(self) -> None:
+        """Start the workers ahead of the first parse, for callers that want them warm up front
+
+        With preload_models the first worker waits for the fork server to load the models, so
+        this blocks for as long as that takes and async callers should run it in a thread.
+        """
+        if self.preload_models:
+            self._preload()
+        self._workers = [worker for worker in self._workers if worker.process.is_alive()]
+        while len(self._workers) < self.size:
+            self._workers.append(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._ctx, self.parser_kwargs)
+        logger.info(f"Started PDF parser worker pid={worker.pid}")
+        return worker
+
+    def _ensure_started(self) -> asyncio.Queue:
+        """Start missing workers and bind the idle queue to the running loop
+
+        Callers such as Airflow tasks run each batch in a fresh event loop, so the queue is
+        rebuilt whenever the loop changes while the worker processes are kept.
+        """
+        loop = asyncio.get_running_loop()
+        if self._idle is not None and self._loop is loop:
+            return self._idle
+
+        self.start()
+
+        self._idle = asyncio.Queue()
+        self._loop = loop
+        for worker in self._workers:
+            self._idle.put_nowait(worker)
+
+        return self._idle
+
+    @staticmethod
+    async def _readable(conn: Connection, timeout: float) -> bool:
+        """Wait up to timeout for a reply, or EOF, on conn by watching its pipe from the loop"""
+        if conn.poll():
+            return True
+
+        loop = asyncio.get_running_loop()
+        readable = loop.create_future()
+        fd = conn.fileno()
+        loop.add_reader(fd, lambda: readable.done() or readable.set_result(True))
+        try:
+            return await asyncio.wait_for(readable, timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            loop.remove_reader(fd)
+
+    async def _receive(self, worker: _Worker, timeout: float) -> Tuple[str, Optional[int], Any]:
+        """Wait for the next reply from worker, watching its memory while it works"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+
+            if await self._readable(worker.conn, min(remaining, self.poll_interval)):
+                return worker.conn.recv()
+
+            if not worker.process.is_alive():
+                raise EOFError(f"worker exited with code {worker.process.exitcode}")
+
+            if self.memory_limit_bytes and worker.memory_bytes() > self.memory_limit_bytes:
+                raise _MemoryLimitExceeded()
+
+    async def _wait_ready(self, worker: _Worker) -> None:
+        status, _, payload = await self._receive(worker, self.start_timeout)
+        if status != "ready":
+            raise PDFParsingException(f"PDF parser worker failed to start: {payload}")
+        worker.ready = True
+
+    def _replace(self, worker: _Worker, graceful: bool) -> _Worker:
+        if graceful:
+            worker.stop()
+        else:
+            worker.kill()
+
+        replacement = self._spawn()
+        self._workers = [replacement if w is worker else w for w in self._workers]
+        return replacement
+
+    async def parse(self, pdf_path: Path) -> Optional[PdfContent]:
+        """Parse pdf_path on the next idle worker, waiting for one if all are busy"""
+        idle = self._ensure_started()
+        worker = await idle.get()
+        healthy = False
+
+        try:
+            if not worker.ready:
+                await self._wait_ready(worker)
+
+            job_id = next(self._job_ids)
+            worker.conn.send((job_id, str(pdf_path)))
+
+            while True:
+                status, reply_id, payload = await self._receive(worker, self.parse_timeout)
+                # replies to a job abandoned by an earlier event loop are dropped
+                if reply_id == job_id:
+                    break
+
+            worker.docs_parsed += 1
+            healthy = True
+
+        except asyncio.TimeoutError:
+            logger.error(f"PDF parsing timed out after {self.parse_timeout:.0f}s, killing worker pid={worker.pid}")
+            raise PDFParsingException(f"PDF Processing timed out: {pdf_path}")
+        except _MemoryLimitExceeded:
+            logger.error(f"PDF parser worker pid={worker.pid} exceeded {self.memory_limit_bytes // (1024 * 1024)}MB, killing it")
+            raise PDFParsingException(f"Out of Memory Processing PDF: {pdf_path}")
+        except (EOFError, OSError) as e:
+            logger.error(f"PDF parser worker pid={worker.pid} died while parsing {pdf_path}: {e}")
+            raise PDFParsingException(f"PDF parser worker died while parsing {pdf_path}")
+
+        finally:
+            if not healthy:
+                worker = self._replace(worker, graceful=False)
+            elif worker.docs_parsed >= self.max_docs_per_worker:
+                logger.info(f"Recycling PDF parser worker pid={worker.pid} after {worker.docs_parsed} documents")
+                worker = self._replace(worker, graceful=True)
+            idle.put_nowait(worker)
+
+        if status == "ok":
+            return PdfContent.model_validate(payload) if payload else None
+        if status == "invalid":
+            raise PDFValidationError(payload)
+        raise PDFParsingException(f"Failed to Parse PDF with DOcling: {payload}")
+
+    def close(self) -> None:
+        """Stop every worker process"""
+        for worker in self._workers:
+            worker.stop()
+        self._workers = []
+        self._idle = None
+        self._loop = None
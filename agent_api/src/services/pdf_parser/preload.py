@@ -0,0 +1,18 @@
+"""Imported by the parser pool's fork server to load the Docling models before it forks any worker"""
+
+import json
+import os
+
+from loguru import logger
+
+from .pool import _PRELOAD_ENV, _load_models_for_workers
+
+# popped so the workers, and anything they start, do not load the models again
+_parser_kwargs = os.environ.pop(_PRELOAD_ENV, None)
+
+if _parser_kwargs is not None:
+    try:
+        _load_models_for_workers(json.loads(_parser_kwargs))
+    except Exception as e:
+        # the fork server only tolerates import errors, so a failed preload must not escape
+        logger.warning(f"Could not preload the PDF parser models, each worker loads its own: {e}")
@@ -0,0 +1,94 @@
+import asyncio
+from loguru import logger
+from typing import AsyncIterator, Optional
+
+from starlette.requests import Request
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    # stop nginx style proxies from buffering the whole stream
+    "X-Accel-Buffering": "no",
+}
+
+HEARTBEAT_FRAME = ": heartbeat\n\n"
+
+_END = object()
+
+
+async def sse_event_stream(
+    frames: AsyncIterator[str],
+    http_request: Optional[Request] = None,
+    flush_interval_ms: float = 20.0,
+    heartbeat_interval_seconds: float = 15.0,
+    queue_size: int = 64,
+) -> AsyncIterator[str]:
+    """Write pre-framed SSE events to the client with frame coalescing, heartbeats and disconnect handling
+
+    Frames arriving within flush_interval_ms of the first one are joined into a single write,
+    so a fast token stream does not cost one socket write per token. A comment frame is sent
+    after heartbeat_interval_seconds of silence to keep proxies from closing the connection.
+    The source is read through a bounded queue and stops being read once the client is gone,
+    which closes the source generator and lets it cancel its upstream work.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+    flush_interval = flush_interval_ms / 1000
+
+    async def pump() -> None:
+        try:
+            async for frame in frames:
+                await queue.put(frame)
+        except Exception as e:
+            logger.error(f"SSE source failed: {e}")
+        await queue.put(_END)
+
+    pump_task = asyncio.create_task(pump())
+
+    try:
+        ended = False
+        while not ended:
+            try:
+                first = await asyncio.wait_for(queue.get(), heartbeat_interval_seconds)
+            except asyncio.TimeoutError:
+                if http_request is not None and await http_request.is_disconnected():
+                    logger.info("SSE client disconnected")
+                    return
+                yield HEARTBEAT_FRAME
+                continue
+
+            if first is _END:
+                return
+
+            batch = [first]
+            deadline = loop.time() + flush_interval
+
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    frame = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if frame is _END:
+                    ended = True
+                    break
+                batch.append(frame)
+
+            yield "".join(batch)
+
+            if not ended and http_request is not None and await http_request.is_disconnected():
+                logger.info("SSE client disconnected")
+                return
+
+    finally:
+        pump_task.cancel()
+        try:
+            await pump_task
+        except asyncio.CancelledError:
+            pass
+        # close the source so cancellation reaches whatever it is streaming from
+        aclose = getattr(frames, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from src.schemas.api.ask import AskRequest, AskResponse
+from src.services.cache.client import CacheClient, ask_cache_key, pack_value, unpack_value
+
+
+def test_small_values_are_stored_uncompressed():
+    data = pack_value({"answer": "short"}, compression_threshold=1024)
+
+    assert data[:1] == b"\x00"
+    assert unpack_value(data) == {"answer": "short"}
+
+
+def test_large_values_are_zlib_compressed():
+    value = {"answer": "attention " * 500, "sources": ["https://arxiv.org/pdf/1706.03762.pdf"]}
+
+    data = pack_value(value, compression_threshold=1024)
+
+    assert data[:1] == b"\x01"
+    assert len(data) < 1024
+    assert unpack_value(data) == value
+
+
+def test_unknown_encoding_is_rejected():
+    with pytest.raises(ValueError):
+        unpack_value(b"\x07payload")
+
+
+def test_ask_cache_key_ignores_category_order():
+    first = AskRequest(query="q", categories=["cs.LG", "cs.AI"])
+    second = AskRequest(query="q", categories=["cs.AI", "cs.LG"])
+
+    assert ask_cache_key(first) == ask_cache_key(second)
+    assert ask_cache_key(first) != ask_cache_key(AskRequest(query="q", top_k=5))
+
+
+async def test_responses_round_trip_through_one_mget(settings, fake_redis):
+    client = CacheClient(fake_redis, settings.redis)
+    requests = [AskRequest(query="a"), AskRequest(query="b"), AskRequest(query="c")]
+    responses = [
+        AskResponse(query=request.query, answer=f"answer {request.query}", sources=[], chunks_used=1, search_mode="bm25")
+        for request in requests[:2]
+    ]
+
+    assert await client.store_responses(list(zip(requests, responses)))
+    found = await client.find_cached_responses(requests)
+
+    assert [response.answer if response else None for response in found] == ["answer a", "answer b", None]
+
+
+async def test_undecodable_values_read_as_misses(settings, fake_redis):
+    client = CacheClient(fake_redis, settings.redis)
+    fake_redis.data["broken"] = b"\x00\xc1"
+
+    assert await client.get_many(["broken", "missing"]) == [None, None]
+
+
+async def test_slow_lookup_is_treated_as_a_miss(settings, fake_redis, monkeypatch):
+    client = CacheClient(fake_redis, settings.redis)
+    client.lookup_timeout = 0.01
+    await client.set_many([("key", "value")])
+
+    async def slow_mget(keys):
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(fake_redis, "mget", slow_mget)
+
+    assert await client.get_many(["key"]) == [None]
@@ -0,0 +1,157 @@
+import asyncio
+
+import pytest
+
+from src.services.opensearch import health
+from src.services.opensearch.async_client import AsyncOpenSearchClient
+from src.services.opensearch.health import CircuitBreaker, OpenSearchHealthMonitor
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(health.time, "monotonic", clock)
+    return clock
+
+
+def test_circuit_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout_seconds=30)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_lets_one_trial_through_and_closes_on_success(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=30)
+    breaker.record_failure()
+
+    clock.now += 31
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+
+def test_failed_trial_opens_the_circuit_again(clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout_seconds=30)
+    breaker.trip()
+
+    clock.now += 31
+    assert breaker.allow_request()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+class _FakeClient:
+    def __init__(self, healthy):
+        self.healthy = healthy
+        self.circuit_breaker = None
+
+    async def health_check(self):
+        return self.healthy
+
+
+async def test_monitor_wires_its_breaker_into_the_client_and_follows_health_checks():
+    client = _FakeClient(healthy=False)
+    monitor = OpenSearchHealthMonitor(client, interval_seconds=60)
+
+    assert client.circuit_breaker is monitor.breaker
+    assert await monitor.check() is False
+    assert not monitor.allow_request()
+
+    client.healthy = True
+    assert await monitor.check() is True
+    assert monitor.allow_request()
+
+
+def test_released_trial_lets_the_next_request_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=30)
+    breaker.trip()
+
+    clock.now += 31
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.release_trial()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+
+
+def _half_open_client(settings):
+    # no clock fixture here, patching time.monotonic would stop the event loop's clock too
+    client = AsyncOpenSearchClient("http://localhost:9200", settings)
+    client.circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=0)
+    client.circuit_breaker.trip()
+    assert client.circuit_breaker.allow_request()
+    assert client.circuit_breaker.state == CircuitBreaker.HALF_OPEN
+    return client
+
+
+async def _slow_bm25(**kwargs):
+    await asyncio.sleep(10)
+
+
+async def test_search_timed_out_by_its_budget_releases_the_trial(monkeypatch, settings):
+    client = _half_open_client(settings)
+    monkeypatch.setattr(client, "_search_bm25_only", _slow_bm25)
+
+    results = await client.search_unified("attention", use_hybrid=False, budget_seconds=0.01)
+
+    assert results["degraded"] is True
+    assert client.circuit_breaker.state == CircuitBreaker.HALF_OPEN
+    assert client.circuit_breaker.allow_request()
+
+
+async def test_parallel_hybrid_with_nothing_in_time_releases_the_trial(monkeypatch, settings):
+    client = _half_open_client(settings)
+    monkeypatch.setattr(client, "_search_bm25_only", _slow_bm25)
+
+    async def embedding():
+        await asyncio.sleep(10)
+
+    results = await client.search_hybrid_parallel("attention", embedding(), budget_seconds=0.01)
+
+    assert results["hits"] == [] and results["degraded"] is True
+    assert client.circuit_breaker.state == CircuitBreaker.HALF_OPEN
+    assert client.circuit_breaker.allow_request()
+
+
+async def test_cancelled_search_releases_the_trial(monkeypatch, settings):
+    client = _half_open_client(settings)
+    monkeypatch.setattr(client, "_search_bm25_only", _slow_bm25)
+
+    search = asyncio.ensure_future(client.search_unified("attention", use_hybrid=False))
+    await asyncio.sleep(0.01)
+    search.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await search
+
+    assert client.circuit_breaker.allow_request()
@@ -0,0 +1,107 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from src.services.cache.coalescing import SingleFlight, StreamBroadcaster
+
+
+async def test_single_flight_runs_concurrent_calls_once():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "answer"
+
+    results = await asyncio.gather(*[single_flight.do("key", work) for _ in range(5)])
+
+    assert results == ["answer"] * 5
+    assert calls == 1
+    assert len(single_flight) == 0
+
+
+async def test_single_flight_shares_the_error_and_releases_the_key():
+    single_flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(single_flight.do("key", fail), single_flight.do("key", fail), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(single_flight) == 0
+
+
+async def test_cancelled_caller_does_not_cancel_the_shared_work():
+    single_flight = SingleFlight()
+    finished = asyncio.Event()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        finished.set()
+        return "answer"
+
+    impatient = asyncio.ensure_future(single_flight.do("key", work))
+    patient = asyncio.ensure_future(single_flight.do("key", work))
+    await asyncio.sleep(0)
+    impatient.cancel()
+
+    assert await patient == "answer"
+    assert finished.is_set()
+    with pytest.raises(asyncio.CancelledError):
+        await impatient
+
+
+async def test_late_subscriber_replays_events_from_the_start():
+    broadcaster = StreamBroadcaster()
+    starts = 0
+    release = asyncio.Event()
+
+    async def producer():
+        nonlocal starts
+        starts += 1
+        yield 1
+        yield 2
+        await release.wait()
+        yield 3
+
+    first = broadcaster.subscribe("key", producer)
+    assert [await anext(first), await anext(first)] == [1, 2]
+
+    second = broadcaster.subscribe("key", producer)
+    release.set()
+
+    assert await _collect(first) == [3]
+    assert await _collect(second) == [1, 2, 3]
+    assert starts == 1
+    assert len(broadcaster) == 0
+
+
+async def test_producer_is_cancelled_once_every_subscriber_leaves():
+    broadcaster = StreamBroadcaster()
+    cancelled = asyncio.Event()
+
+    async def endless():
+        try:
+            while True:
+                yield "token"
+                await asyncio.sleep(0.001)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async with aclosing(broadcaster.subscribe("key", endless)) as events:
+        async for _ in events:
+            break
+
+    await asyncio.wait_for(cancelled.wait(), 1)
+    await asyncio.sleep(0)
+    assert len(broadcaster) == 0
+
+
+async def _collect(events):
+    return [event async for event in events]
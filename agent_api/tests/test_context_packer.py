@@ -0,0 +1,85 @@
+from src.services.ollama.context import ContextPacker, split_chunk_header
+from src.services.ollama.prompts import RAGPromptBuilder
+
+TITLE = "Attention Is All You Need"
+ABSTRACT = "The dominant sequence transduction models are based on recurrent networks."
+
+
+def _section_chunk(body, title=TITLE, abstract=ABSTRACT):
+    # same layout as TextChunker._chunk_by_sections
+    return f"{title}\n\\Abstract: {abstract}\n\n section: Intro\n\n {body}"
+
+
+def _chunk(arxiv_id, body, score, **fields):
+    return {"arxiv_id": arxiv_id, "score": score, "chunk_text": _section_chunk(body), **fields}
+
+
+def test_split_chunk_header_separates_title_abstract_and_body():
+    parts = split_chunk_header(_section_chunk("We propose the Transformer."))
+
+    assert parts["title"] == TITLE
+    assert parts["abstract"] == ABSTRACT
+    assert parts["body"] == "section: Intro\n\n We propose the Transformer."
+
+
+def test_split_chunk_header_leaves_word_chunks_alone():
+    parts = split_chunk_header("  plain chunk from word based chunking  ")
+
+    assert parts == {"title": "", "abstract": "", "body": "plain chunk from word based chunking"}
+
+
+def test_pack_writes_each_paper_header_once_in_order_of_best_chunk():
+    packer = ContextPacker(context_token_budget=10_000)
+    chunks = [
+        _chunk("1706.03762", "multi head attention lets the model attend jointly", 0.5),
+        _chunk("1810.04805", "bert pretrains deep bidirectional representations", 0.9, title="BERT"),
+        _chunk("1706.03762", "positional encodings inject order information", 0.7),
+    ]
+
+    context = packer.pack(chunks)
+
+    assert context.count(f"Abstract: {ABSTRACT}") == 2
+    assert context.count("[arxiv:1706.03762]") == 1
+    assert context.index("[arxiv:1810.04805] BERT") < context.index("[arxiv:1706.03762]")
+    assert context.index("positional encodings") < context.index("multi head attention")
+
+
+def test_pack_drops_near_duplicate_chunks():
+    packer = ContextPacker(context_token_budget=10_000, near_duplicate_threshold=0.8)
+    body = "scaled dot product attention divides the scores by the square root of the key dimension"
+    chunks = [_chunk("1706.03762", body, 0.9), _chunk("1706.03762", body + " again", 0.8)]
+
+    context = packer.pack(chunks)
+
+    assert context.count("scaled dot product attention") == 1
+
+
+def test_pack_stays_within_the_model_budget():
+    packer = ContextPacker(context_token_budget=10_000, model_budgets={"tiny": 60}, chars_per_token=4.0)
+    chunks = [_chunk(f"2401.0000{i}", f"finding number {i} " + "detail " * 20, 1.0 - i / 10) for i in range(5)]
+
+    small = packer.pack(chunks, model="tiny")
+    large = packer.pack(chunks)
+
+    assert packer.estimate_tokens(small) <= 60 + len(chunks)
+    assert "finding number 0" in small
+    assert "finding number 4" not in small
+    assert all(f"finding number {i}" in large for i in range(5))
+
+
+def test_oversized_best_chunk_is_truncated_rather_than_dropped():
+    packer = ContextPacker(context_token_budget=40, include_abstract=False)
+
+    context = packer.pack([_chunk("1706.03762", "word " * 500, 1.0)])
+
+    assert context.startswith(f"[arxiv:1706.03762] {TITLE}")
+    assert 0 < packer.estimate_tokens(context) <= 45
+
+
+def test_prompt_starts_with_the_static_prefix():
+    builder = RAGPromptBuilder(ContextPacker(context_token_budget=100))
+
+    prompt = builder.create_rag_prompt("what is attention?", [_chunk("1706.03762", "attention", 1.0)])
+
+    assert prompt.startswith(builder.static_prefix)
+    assert "### Question: what is attention?" in prompt
@@ -0,0 +1,59 @@
+import pytest
+
+from src.config import ArxivSettings
+from src.services.arxiv import downloader
+from src.services.arxiv.downloader import PDFDownloadManager, TokenBucket
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(downloader.time, "monotonic", clock)
+    return clock
+
+
+def test_bucket_spaces_requests_after_the_burst(clock):
+    bucket = TokenBucket(rate=1 / 3, capacity=2)
+
+    assert bucket._reserve() == 0.0
+    assert bucket._reserve() == 0.0
+    assert bucket._reserve() == pytest.approx(3.0)
+    assert bucket._reserve() == pytest.approx(6.0)
+
+
+def test_bucket_refills_at_rate_up_to_capacity(clock):
+    bucket = TokenBucket(rate=1.0, capacity=1)
+    bucket._reserve()
+
+    clock.now += 0.5
+    assert bucket._reserve() == pytest.approx(0.5)
+
+    clock.now += 100
+    assert bucket._reserve() == 0.0
+    assert bucket._reserve() == pytest.approx(1.0)
+
+
+def test_download_rate_defaults_to_the_arxiv_request_delay(tmp_path):
+    settings = ArxivSettings(pdf_cache_dir=str(tmp_path), rate_limit_delay=3.0)
+
+    manager = PDFDownloadManager(settings)
+
+    assert manager.rate_limiter.rate == pytest.approx(1 / 3)
+    assert manager.rate_limiter.capacity == 1
+
+
+def test_explicit_download_rate_overrides_the_default(tmp_path):
+    settings = ArxivSettings(pdf_cache_dir=str(tmp_path), download_rate_per_second=2.0, download_burst=4)
+
+    manager = PDFDownloadManager(settings)
+
+    assert manager.rate_limiter.rate == 2.0
+    assert manager.rate_limiter.capacity == 4
@@ -0,0 +1,70 @@
+import asyncio
+
+import numpy as np
+
+from src.services.embeddings.batcher import EmbeddingBatcher
+
+
+class _FakeClient:
+    model_name = "fake"
+    dimensions = 2
+
+    def __init__(self):
+        self.batches = []
+
+    async def embed_passages(self, texts, batch_size=None):
+        self.batches.append(list(texts))
+        await asyncio.sleep(0.01)
+        return np.array([[float(len(text)), 1.0] for text in texts], dtype=np.float32)
+
+    async def embed_query(self, query):
+        return [float(len(query)), 1.0]
+
+    async def close(self):
+        pass
+
+
+async def test_concurrent_callers_share_full_batches():
+    client = _FakeClient()
+    batcher = EmbeddingBatcher(client, batch_size=4, max_wait_ms=20)
+
+    first, second = await asyncio.gather(batcher.embed_passages(["a", "bb"]), batcher.embed_passages(["ccc", "dddd"]))
+
+    assert client.batches == [["a", "bb", "ccc", "dddd"]]
+    assert first[:, 0].tolist() == [1.0, 2.0]
+    assert second[:, 0].tolist() == [3.0, 4.0]
+
+
+async def test_partial_batch_is_sent_after_max_wait():
+    client = _FakeClient()
+    batcher = EmbeddingBatcher(client, batch_size=100, max_wait_ms=5)
+
+    embeddings = await asyncio.wait_for(batcher.embed_passages(["a", "bb", "ccc"]), 1)
+
+    assert client.batches == [["a", "bb", "ccc"]]
+    assert embeddings.shape == (3, 2)
+
+
+def test_batcher_can_be_reused_across_event_loops():
+    client = _FakeClient()
+    batcher = EmbeddingBatcher(client, batch_size=2, max_wait_ms=5, max_concurrent_requests=1)
+
+    async def embed_many():
+        return await batcher.embed_passages(["a", "bb", "ccc", "dddd", "eeeee"])
+
+    # a single request slot makes the later batches wait on the semaphore in each loop
+    for _ in range(2):
+        assert asyncio.run(embed_many())[:, 0].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+    assert len(client.batches) == 6
+
+
+async def test_empty_input_returns_an_empty_float32_matrix():
+    client = _FakeClient()
+    batcher = EmbeddingBatcher(client)
+
+    embeddings = await batcher.embed_passages([])
+
+    assert embeddings.shape == (0, 2)
+    assert embeddings.dtype == np.float32
+    assert client.batches == []
@@ -0,0 +1,101 @@
+import sqlite3
+
+import numpy as np
+import pytest
+
+from src.services.embeddings import cache as cache_module
+from src.services.embeddings.cache import (
+    DiskEmbeddingCache,
+    EmbeddingCache,
+    QueryEmbeddingCache,
+    RedisEmbeddingCache,
+    embedding_cache_key,
+)
+
+
+def test_base_cache_cannot_be_instantiated():
+    with pytest.raises(TypeError):
+        EmbeddingCache()
+
+
+def test_partial_cache_implementation_cannot_be_instantiated():
+    class GetOnly(EmbeddingCache):
+        async def get_many(self, keys):
+            return {}
+
+    with pytest.raises(TypeError):
+        GetOnly()
+
+
+def test_cache_key_covers_model_task_and_dimensions():
+    key = embedding_cache_key("jina-embeddings-v3", "retrieval.passage", 1024, "text")
+
+    assert key != embedding_cache_key("jina-embeddings-v3", "retrieval.query", 1024, "text")
+    assert key != embedding_cache_key("jina-embeddings-v3", "retrieval.passage", 512, "text")
+    assert key.startswith("jina-embeddings-v3:retrieval.passage:1024:")
+
+
+@pytest.fixture(params=["redis", "disk"])
+def cache(request, fake_redis, tmp_path):
+    if request.param == "redis":
+        return RedisEmbeddingCache(fake_redis)
+    return DiskEmbeddingCache(str(tmp_path))
+
+
+async def test_cache_round_trips_float32_embeddings(cache):
+    stored = {"a": np.array([0.1, 0.2, 0.3]), "b": np.array([1.0, -1.0, 0.5])}
+
+    await cache.set_many(stored)
+    found = await cache.get_many(["a", "b", "missing"])
+
+    assert set(found) == {"a", "b"}
+    assert found["a"].dtype == np.float32
+    np.testing.assert_allclose(found["b"], stored["b"])
+
+
+async def test_query_cache_fills_the_local_tier_from_the_backend(tmp_path):
+    backend = DiskEmbeddingCache(str(tmp_path))
+    await QueryEmbeddingCache(backend=backend).set("q", np.array([1.0, 2.0]))
+
+    fresh = QueryEmbeddingCache(backend=backend)
+    assert (await fresh.get("q")).tolist() == [1.0, 2.0]
+
+    fresh.backend = None
+    assert (await fresh.get("q")).tolist() == [1.0, 2.0]
+
+
+class _WallClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+async def test_disk_cache_skips_and_prunes_expired_embeddings(tmp_path, monkeypatch):
+    clock = _WallClock()
+    monkeypatch.setattr(cache_module.time, "time", clock)
+    disk_cache = DiskEmbeddingCache(str(tmp_path), ttl_seconds=10)
+    await disk_cache.set_many({"old": np.ones(2, dtype=np.float32)})
+
+    clock.now += 5
+    assert list(await disk_cache.get_many(["old"])) == ["old"]
+
+    clock.now += 6
+    assert await disk_cache.get_many(["old"]) == {}
+
+    await disk_cache.set_many({"new": np.ones(2, dtype=np.float32)})
+    with sqlite3.connect(disk_cache.db_path) as conn:
+        assert [key for key, in conn.execute("SELECT key FROM embeddings")] == ["new"]
+
+
+def test_disk_cache_adds_expiry_to_an_existing_cache_file(tmp_path):
+    with sqlite3.connect(tmp_path / "embeddings.sqlite3") as conn:
+        conn.execute("CREATE TABLE embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        conn.execute("INSERT INTO embeddings VALUES ('a', ?)", (np.ones(2, dtype=np.float32).tobytes(),))
+
+    disk_cache = DiskEmbeddingCache(str(tmp_path), ttl_seconds=60)
+
+    with sqlite3.connect(disk_cache.db_path) as conn:
+        (expires_at,) = conn.execute("SELECT expires_at FROM embeddings WHERE key = 'a'").fetchone()
+    assert expires_at is not None
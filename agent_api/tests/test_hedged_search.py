@@ -0,0 +1,70 @@
+import asyncio
+
+from src.services.opensearch.async_client import AsyncOpenSearchClient, _LatencyTracker
+
+
+class _FakeSearch:
+    """Stand-in for AsyncOpenSearch.search with a latency per call"""
+
+    def __init__(self, delays):
+        self.delays = list(delays)
+        self.calls = 0
+        self.cancelled = 0
+
+    async def __call__(self, **kwargs):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        call = self.calls
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return {"call": call}
+
+
+def _client(settings, monkeypatch, search, hedge_delay=0.01):
+    client = AsyncOpenSearchClient("http://localhost:9200", settings)
+    client.hedge_enabled = True
+    client.latency = _LatencyTracker(window=100, percentile=95, default_seconds=hedge_delay, min_seconds=0.001)
+    monkeypatch.setattr(client.client, "search", search)
+    return client
+
+
+def test_hedge_delay_tracks_the_recent_percentile():
+    tracker = _LatencyTracker(window=100, percentile=95, default_seconds=0.5, min_seconds=0.01)
+    assert tracker.hedge_delay() == 0.5
+
+    for i in range(100):
+        tracker.record(0.001 * (i + 1))
+
+    assert 0.09 < tracker.hedge_delay() < 0.1
+
+
+async def test_slow_search_is_hedged_and_the_loser_cancelled(settings, monkeypatch):
+    search = _FakeSearch([1.0, 0.001])
+    client = _client(settings, monkeypatch, search)
+
+    response = await asyncio.wait_for(client._search(body={}), 0.5)
+    await asyncio.sleep(0)
+
+    assert response == {"call": 2}
+    assert search.calls == 2
+    assert search.cancelled == 1
+
+
+async def test_fast_search_is_not_hedged(settings, monkeypatch):
+    search = _FakeSearch([0.001])
+    client = _client(settings, monkeypatch, search, hedge_delay=0.5)
+
+    assert await client._search(body={}) == {"call": 1}
+    assert search.calls == 1
+
+
+async def test_unified_search_past_its_budget_returns_degraded(settings, monkeypatch):
+    search = _FakeSearch([1.0])
+    client = _client(settings, monkeypatch, search, hedge_delay=5)
+
+    results = await client.search_unified("attention", use_hybrid=False, budget_seconds=0.02)
+
+    assert results == {"total": 0, "hits": [], "degraded": True}
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from src.services.indexing.hybrid_indexer import HybridIndexingService
+from src.services.indexing.text_chunker import TextChunker
+
+
+class _FakeEmbeddings:
+    model_name = "fake"
+
+    def __init__(self, fail_for=()):
+        self.fail_for = set(fail_for)
+
+    async def embed_passages(self, texts, batch_size=None):
+        if any(marker in text for text in texts for marker in self.fail_for):
+            raise RuntimeError("embedding failed")
+        return np.zeros((len(texts), 4), dtype=np.float32)
+
+
+class _FakeOpenSearch:
+    def __init__(self):
+        self.indexed = {}
+        self.deleted = []
+
+    def bulk_index_chunks(self, chunks):
+        for chunk in chunks:
+            data = chunk["chunk_data"]
+            self.indexed.setdefault(data["arxiv_id"], []).append(data["chunk_index"])
+        return {"success": len(chunks), "failed": 0}
+
+    def delete_paper_chunks(self, arxiv_id):
+        self.deleted.append(arxiv_id)
+        return True
+
+
+def _paper(i, words=700):
+    text = " ".join(f"paper{i}word{j}" for j in range(words))
+    return {"arxiv_id": f"2401.{i:05d}", "paper_id": str(i), "title": f"Paper {i}", "abstract": "", "raw_text": text}
+
+
+def _service(opensearch, embeddings=None, **kwargs):
+    return HybridIndexingService(
+        TextChunker(chunk_size=200, overlap_size=20, min_chunk_size=10),
+        embeddings or _FakeEmbeddings(),
+        opensearch,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("chunk_workers", [0, 1])
+async def test_pipelined_batch_matches_sequential_indexing(chunk_workers):
+    papers = [_paper(i) for i in range(6)]
+    sequential_search, pipelined_search = _FakeOpenSearch(), _FakeOpenSearch()
+
+    sequential = await _service(sequential_search).index_papers_batch(papers, pipelined=False)
+    pipelined = await _service(pipelined_search, chunk_workers=chunk_workers, embedding_concurrency=2, queue_size=2).index_papers_batch(
+        papers, pipelined=True
+    )
+
+    assert pipelined == sequential
+    assert pipelined["papers_processed"] == 6
+    assert pipelined["total_errors"] == 0
+    assert {arxiv_id: sorted(ids) for arxiv_id, ids in pipelined_search.indexed.items()} == sequential_search.indexed
+
+
+async def test_pipelined_batch_counts_failed_and_invalid_papers():
+    papers = [_paper(0), _paper(1), {"title": "no id"}]
+    opensearch = _FakeOpenSearch()
+
+    stats = await _service(opensearch, _FakeEmbeddings(fail_for=["paper1word"]), chunk_workers=0).index_papers_batch(
+        papers, replace_existing=True
+    )
+
+    assert stats["papers_processed"] == 3
+    assert stats["total_errors"] == 2
+    assert list(opensearch.indexed) == ["2401.00000"]
+    assert opensearch.deleted == ["2401.00000"]
@@ -0,0 +1,275 @@
+import asyncio
+
+from src.routers import ask
+from src.schemas.api.ask import AskRequest
+from src.services.cache.client import CacheClient
+from src.services.cache.coalescing import SingleFlight
+from src.services.cache.retrieval import RetrievalCache
+from src.services.cache.semantic import SemanticAnswerCache
+from src.services.langfuse.client import LangfuseTracer
+from src.services.ollama.prompts import RAGPromptBuilder
+from src.services.opensearch.async_client import AsyncOpenSearchClient
+from src.services.opensearch.query_builder import reciprocal_rank_fusion
+
+
+def _hit(chunk_id, **fields):
+    return {"chunk_id": chunk_id, "score": 0.0, **fields}
+
+
+def test_rrf_sums_reciprocal_ranks_across_lists():
+    bm25 = [_hit("a"), _hit("b"), _hit("c")]
+    vector = [_hit("c"), _hit("a")]
+
+    fused = reciprocal_rank_fusion([bm25, vector], size=10, rank_constant=60)
+
+    assert [hit["chunk_id"] for hit in fused] == ["a", "c", "b"]
+    assert fused[0]["score"] == 1 / 61 + 1 / 62
+    assert fused[2]["score"] == 1 / 62
+
+
+def test_rrf_keeps_first_occurrence_fields_and_cuts_to_size():
+    bm25 = [_hit("a", highlights={"chunk_text": ["<em>a</em>"]}), _hit("b")]
+    vector = [_hit("a", highlights={}), _hit("d")]
+
+    fused = reciprocal_rank_fusion([bm25, vector], size=2)
+
+    assert len(fused) == 2
+    assert fused[0]["chunk_id"] == "a"
+    assert fused[0]["highlights"] == {"chunk_text": ["<em>a</em>"]}
+
+
+async def test_parallel_hybrid_lets_a_late_embedding_finish_in_the_background(monkeypatch, settings):
+    client = AsyncOpenSearchClient("http://localhost:9200", settings)
+    embedded = asyncio.Event()
+
+    async def bm25(**kwargs):
+        return {"total": 2, "hits": [_hit("a"), _hit("b")]}
+
+    async def slow_embedding():
+        await asyncio.sleep(0.05)
+        embedded.set()
+        return [0.1, 0.2]
+
+    monkeypatch.setattr(client, "_search_bm25_only", bm25)
+
+    results = await client.search_hybrid_parallel("attention", slow_embedding(), size=1, embedding_budget_seconds=0.01)
+
+    assert results["search_mode"] == "bm25"
+    assert [hit["chunk_id"] for hit in results["hits"]] == ["a"]
+    assert not embedded.is_set()
+    await asyncio.wait_for(embedded.wait(), 1)
+    await asyncio.sleep(0)
+    assert not client._background_embeddings
+
+
+async def test_parallel_hybrid_falls_back_to_bm25_when_the_knn_leg_fails(monkeypatch, settings):
+    client = AsyncOpenSearchClient("http://localhost:9200", settings)
+
+    async def bm25(**kwargs):
+        return {"total": 1, "hits": [_hit("a")]}
+
+    async def failing_vector_search(body):
+        raise ConnectionError("k-NN plugin unavailable")
+
+    async def embedding():
+        return [0.1, 0.2]
+
+    monkeypatch.setattr(client, "_search_bm25_only", bm25)
+    monkeypatch.setattr(client, "_search", failing_vector_search)
+
+    results = await client.search_hybrid_parallel("attention", embedding(), size=3)
+
+    assert results["search_mode"] == "bm25"
+    assert results["degraded"] is False
+    assert [hit["chunk_id"] for hit in results["hits"]] == ["a"]
+
+
+class _Embeddings:
+    def __init__(self, delay, embedding=(1.0, 0.0)):
+        self.delay = delay
+        self.embedding = list(embedding)
+        self.calls = 0
+
+    async def embed_query(self, query):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.embedding
+
+
+class _FakeOpenSearch:
+    def __init__(self, settings, search_delay=0.0):
+        self.settings = settings
+        self.search_delay = search_delay
+        self.calls = []
+        self.cancelled = False
+
+    async def search_unified(self, **kwargs):
+        self.calls.append(kwargs)
+        return {"total": 1, "hits": [{"arxiv_id": "1706.03762", "score": 1.0, "chunk_text": "attention"}]}
+
+    async def search_hybrid_parallel(self, query_embedding, **kwargs):
+        self.calls.append(kwargs)
+        try:
+            await asyncio.sleep(self.search_delay)
+            embedding = await asyncio.wait_for(query_embedding, kwargs["budget_seconds"])
+        except asyncio.TimeoutError:
+            embedding = None
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        kwargs["embedding"] = embedding
+        return {
+            "total": 1,
+            "hits": [{"arxiv_id": "1706.03762", "score": 1.0, "chunk_text": "attention"}],
+            "search_mode": "hybrid" if embedding is not None else "bm25",
+            "degraded": embedding is None,
+        }
+
+
+class _FakeOllama:
+    prompt_builder = RAGPromptBuilder()
+
+    async def generate_rag_answer(self, query, chunks, model):
+        return {"answer": "attention"}
+
+
+async def _ask(settings, request, opensearch, embeddings, semantic_cache, retrieval_cache=None):
+    return await asyncio.wait_for(
+        ask.ask_question(
+            request=request,
+            opensearch_client=opensearch,
+            embeddings_service=embeddings,
+            ollama_client=_FakeOllama(),
+            langfuse_tracer=LangfuseTracer(settings),
+            cache_client=None,
+            semantic_cache=semantic_cache,
+            retrieval_cache=retrieval_cache,
+            single_flight=SingleFlight(),
+        ),
+        2,
+    )
+
+
+async def test_semantic_cache_embedding_is_bounded_by_the_latency_budget(settings):
+    opensearch = _FakeOpenSearch(settings)
+    embeddings = _Embeddings(delay=10)
+
+    response = await _ask(
+        settings, AskRequest(query="what is attention?", latency_budget_ms=50), opensearch, embeddings, SemanticAnswerCache()
+    )
+
+    assert response.degraded is True
+    assert response.search_mode == "bm25"
+    assert embeddings.calls == 1
+    assert opensearch.calls[0]["embedding"] is None
+
+
+async def test_semantic_cache_embedding_overlaps_bm25_and_is_embedded_once(settings):
+    opensearch = _FakeOpenSearch(settings)
+    embeddings = _Embeddings(delay=0.01)
+
+    response = await _ask(settings, AskRequest(query="what is attention?"), opensearch, embeddings, SemanticAnswerCache())
+
+    assert response.search_mode == "hybrid"
+    assert response.degraded is False
+    assert embeddings.calls == 1
+    assert opensearch.calls[0]["embedding"] == [1.0, 0.0]
+
+
+async def test_semantic_cache_hit_cancels_the_running_retrieval(settings):
+    request = AskRequest(query="what is attention?")
+    semantic_cache = SemanticAnswerCache()
+    cached = ask.AskResponse(query=request.query, answer="cached", sources=[], chunks_used=0, search_mode="hybrid")
+    semantic_cache.store(request, [1.0, 0.0], cached)
+    opensearch = _FakeOpenSearch(settings, search_delay=10)
+
+    response = await _ask(settings, request, opensearch, _Embeddings(delay=0.01), semantic_cache)
+
+    assert response.answer == "cached"
+    assert opensearch.cancelled
+
+
+async def test_retrieval_cache_hit_skips_the_semantic_cache_embedding(settings, fake_redis):
+    request = AskRequest(query="what is attention?")
+    retrieval_cache = RetrievalCache(CacheClient(fake_redis, settings.redis), index_name="arxiv-papers-chunks")
+    _, generation = await retrieval_cache.get(request.query, "hybrid", size=request.top_k)
+    hits = [{"arxiv_id": "1706.03762", "score": 1.0, "chunk_text": "attention"}]
+    await retrieval_cache.set(request.query, "hybrid", request.top_k, {"total": 1, "hits": hits}, generation)
+    opensearch = _FakeOpenSearch(settings)
+    embeddings = _Embeddings(delay=0)
+
+    response = await _ask(settings, request, opensearch, embeddings, SemanticAnswerCache(), retrieval_cache)
+
+    assert response.chunks_used == 1
+    assert response.search_mode == "hybrid"
+    assert embeddings.calls == 0
+    assert opensearch.calls == []
+
+
+async def test_failed_embedding_is_not_retried_when_parallel_hybrid_is_off(settings):
+    settings = settings.model_copy(update={"opensearch": settings.opensearch.model_copy(update={"parallel_hybrid": False})})
+    opensearch = _FakeOpenSearch(settings)
+
+    class _FailingEmbeddings(_Embeddings):
+        async def embed_query(self, query):
+            self.calls += 1
+            raise RuntimeError("embeddings service down")
+
+    embeddings = _FailingEmbeddings(delay=0)
+
+    response = await _ask(settings, AskRequest(query="what is attention?"), opensearch, embeddings, SemanticAnswerCache())
+
+    assert response.search_mode == "bm25"
+    assert embeddings.calls == 1
+    assert opensearch.calls[0]["use_hybrid"] is False
+    assert opensearch.calls[0]["query_embedding"] is None
+
+
+def _vector_response(*chunk_ids):
+    hits = [{"_id": chunk_id, "_score": 1.0 - i / 10, "_source": {"chunk_text": chunk_id}} for i, chunk_id in enumerate(chunk_ids)]
+    return {"hits": {"total": {"value": len(hits)}, "hits": hits}}
+
+
+async def test_parallel_hybrid_sends_bm25_before_the_embedding_resolves_and_fuses_both(monkeypatch, settings):
+    client = AsyncOpenSearchClient("http://localhost:9200", settings)
+    events = []
+
+    async def bm25(**kwargs):
+        events.append("bm25")
+        return {"total": 2, "hits": [_hit("a"), _hit("b")]}
+
+    async def vector_search(body):
+        events.append("vector")
+        return _vector_response("b", "c")
+
+    async def embedding():
+        await asyncio.sleep(0.01)
+        events.append("embedded")
+        return [0.1, 0.2]
+
+    monkeypatch.setattr(client, "_search_bm25_only", bm25)
+    monkeypatch.setattr(client, "_search", vector_search)
+
+    results = await client.search_hybrid_parallel("attention", embedding(), size=3, embedding_budget_seconds=1)
+
+    assert events == ["bm25", "embedded", "vector"]
+    assert results["search_mode"] == "hybrid"
+    assert [hit["chunk_id"] for hit in results["hits"]] == ["b", "a", "c"]
+
+
+async def test_parallel_hybrid_falls_back_to_bm25_when_embedding_fails(monkeypatch, settings):
+    client = AsyncOpenSearchClient("http://localhost:9200", settings)
+
+    async def bm25(**kwargs):
+        return {"total": 1, "hits": [_hit("a")]}
+
+    async def failing_embedding():
+        raise RuntimeError("embeddings service down")
+
+    monkeypatch.setattr(client, "_search_bm25_only", bm25)
+
+    results = await client.search_hybrid_parallel("attention", failing_embedding(), size=3)
+
+    assert results["search_mode"] == "bm25"
+    assert results["degraded"] is False
+    assert [hit["chunk_id"] for hit in results["hits"]] == ["a"]
@@ -0,0 +1,80 @@
+import base64
+import json
+
+import httpx
+import numpy as np
+
+from src.services.embeddings.cache import DiskEmbeddingCache, QueryEmbeddingCache, RedisEmbeddingCache
+from src.services.embeddings.jina_client import JinaEmbeddingsClient
+
+
+def _vector(text):
+    vector = np.zeros(1024, dtype="<f4")
+    vector[0] = len(text)
+    vector[1] = 0.5
+    return vector
+
+
+class _FakeJina:
+    """Embeddings endpoint answering with base64 float32 vectors derived from each input"""
+
+    def __init__(self):
+        self.inputs = []
+
+    def __call__(self, request):
+        body = json.loads(request.content)
+        self.inputs.append(body["input"])
+        data = [
+            {"index": i, "embedding": base64.b64encode(_vector(text).tobytes()).decode()}
+            for i, text in enumerate(body["input"])
+        ]
+        return httpx.Response(200, json={"model": body["model"], "usage": {"total_tokens": 1}, "data": data})
+
+
+def _client(api, **kwargs):
+    client = JinaEmbeddingsClient(api_key="test", **kwargs)
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+    return client
+
+
+async def test_passages_decode_into_one_contiguous_float32_array():
+    api = _FakeJina()
+    client = _client(api)
+
+    embeddings = await client.embed_passages(["a", "bb", "ccc"], batch_size=2)
+    await client.close()
+
+    assert api.inputs == [["a", "bb"], ["ccc"]]
+    assert embeddings.dtype == np.float32
+    assert embeddings.shape == (3, 1024)
+    assert embeddings.flags["C_CONTIGUOUS"]
+    assert embeddings[:, 0].tolist() == [1.0, 2.0, 3.0]
+
+
+async def test_passage_cache_only_sends_misses_once(tmp_path):
+    api = _FakeJina()
+    client = _client(api, cache=DiskEmbeddingCache(str(tmp_path)))
+
+    await client.embed_passages(["a", "bb"])
+    embeddings = await client.embed_passages(["bb", "ccc", "ccc", "a"])
+    await client.close()
+
+    assert api.inputs == [["a", "bb"], ["ccc"]]
+    assert embeddings[:, 0].tolist() == [2.0, 3.0, 3.0, 1.0]
+
+
+async def test_repeated_query_is_served_from_the_query_cache(fake_redis):
+    api = _FakeJina()
+    backend = RedisEmbeddingCache(fake_redis, prefix="query_embedding")
+    client = _client(api, query_cache=QueryEmbeddingCache(backend=backend))
+
+    first = await client.embed_query("what is attention?")
+    second = await client.embed_query("what is attention?")
+
+    # a second API process shares the embedding through the Redis tier
+    other = _client(api, query_cache=QueryEmbeddingCache(backend=backend))
+    third = await other.embed_query("what is attention?")
+
+    assert len(api.inputs) == 1
+    assert first == second == third
+    assert isinstance(first, list) and first[0] == len("what is attention?")
@@ -0,0 +1,81 @@
+import asyncio
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from src.services.embeddings.local_client import LocalEmbeddingsClient
+
+
+class _FakeSentenceTransformer:
+    available_files = {"onnx/model.onnx"}
+    loaded = []
+
+    def __init__(self, model_name, device=None, backend="torch", model_kwargs=None):
+        file_name = (model_kwargs or {}).get("file_name", "onnx/model.onnx")
+        if backend == "onnx" and file_name not in self.available_files:
+            raise FileNotFoundError(file_name)
+        self.file_name = file_name
+        _FakeSentenceTransformer.loaded.append(file_name)
+
+    def get_sentence_embedding_dimension(self):
+        return 4
+
+    def encode(self, texts, **kwargs):
+        return np.ones((len(texts), 4), dtype=np.float64)
+
+
+@pytest.fixture
+def fake_backends(monkeypatch):
+    sentence_transformers = types.ModuleType("sentence_transformers")
+    sentence_transformers.SentenceTransformer = _FakeSentenceTransformer
+    onnxruntime = types.ModuleType("onnxruntime")
+    onnxruntime.SessionOptions = types.SimpleNamespace
+    monkeypatch.setitem(sys.modules, "sentence_transformers", sentence_transformers)
+    monkeypatch.setitem(sys.modules, "onnxruntime", onnxruntime)
+    monkeypatch.setattr(_FakeSentenceTransformer, "available_files", {"onnx/model.onnx"})
+    _FakeSentenceTransformer.loaded = []
+    return _FakeSentenceTransformer
+
+
+def test_int8_onnx_loads_the_configured_export(fake_backends):
+    fake_backends.available_files = {"onnx/model.onnx", "onnx/model_qint8_arm64.onnx"}
+
+    client = LocalEmbeddingsClient(backend="onnx", quantize_int8=True, onnx_int8_file_name="onnx/model_qint8_arm64.onnx")
+
+    assert client.model.file_name == "onnx/model_qint8_arm64.onnx"
+
+
+def test_missing_int8_onnx_export_falls_back_to_fp32(fake_backends):
+    client = LocalEmbeddingsClient(backend="onnx", quantize_int8=True)
+
+    assert fake_backends.loaded == ["onnx/model.onnx"]
+    assert client.model.file_name == "onnx/model.onnx"
+
+
+def test_explicit_onnx_file_name_wins_over_the_int8_default(fake_backends):
+    fake_backends.available_files = {"onnx/model.onnx", "onnx/model_O4.onnx"}
+
+    client = LocalEmbeddingsClient(backend="onnx", quantize_int8=True, onnx_file_name="onnx/model_O4.onnx")
+
+    assert client.model.file_name == "onnx/model_O4.onnx"
+
+
+def test_client_can_be_reused_across_event_loops(fake_backends):
+    client = LocalEmbeddingsClient(backend="onnx", max_wait_ms=1)
+
+    async def embed():
+        return await client.embed_passages(["a", "b"])
+
+    for _ in range(2):
+        assert asyncio.run(asyncio.wait_for(embed(), 1)).shape == (2, 4)
+
+
+async def test_empty_input_returns_an_empty_float32_matrix(fake_backends):
+    client = LocalEmbeddingsClient(backend="onnx")
+
+    embeddings = await client.embed_passages([])
+
+    assert embeddings.shape == (0, 4)
+    assert embeddings.dtype == np.float32
@@ -0,0 +1,60 @@
+import json
+
+import httpx
+
+from src.services.ollama.client import OllamaClient
+
+
+def test_request_body_moves_sampling_parameters_into_options(settings):
+    client = OllamaClient(settings)
+
+    body = client._request_body("llama3.2:1b", "hello", False, temperature=0.2, num_predict=8, format="json")
+
+    assert body["model"] == "llama3.2:1b"
+    assert body["stream"] is False
+    assert body["format"] == "json"
+    assert body["keep_alive"] == settings.ollama_keep_alive
+    assert body["options"] == {"num_ctx": settings.ollama_num_ctx, "temperature": 0.2, "num_predict": 8}
+
+
+def test_request_body_merges_explicit_options_and_keeps_num_ctx_by_default(settings):
+    client = OllamaClient(settings)
+
+    body = client._request_body("llama3.2:1b", "hello", True, options={"top_p": 0.9}, seed=7)
+
+    assert body["options"] == {"num_ctx": settings.ollama_num_ctx, "top_p": 0.9, "seed": 7}
+    assert "top_p" not in body and "seed" not in body
+
+
+async def test_warm_up_prefills_the_static_prefix_and_reports_each_model(settings):
+    client = OllamaClient(settings)
+    requests = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append(body)
+        if body["model"] == "missing":
+            return httpx.Response(404)
+        return httpx.Response(200, json={"response": "", "done": True})
+
+    client._client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+
+    results = await client.warm_up(["llama3.2:1b", "missing"])
+    await client.close()
+
+    assert results == {"llama3.2:1b": True, "missing": False}
+    assert requests[0]["prompt"] == client.prompt_builder.static_prefix
+    assert requests[0]["options"]["num_predict"] == 1
+
+
+async def test_http_client_is_shared_across_calls_and_recreated_after_close(settings):
+    client = OllamaClient(settings)
+
+    pooled = client.client
+    assert client.client is pooled
+    assert pooled.timeout.connect == settings.ollama_connect_timeout
+
+    await client.close()
+    assert pooled.is_closed
+    assert client.client is not pooled
+    await client.close()
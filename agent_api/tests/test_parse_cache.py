@@ -0,0 +1,60 @@
+from src.schemas.pdf_parser.models import PaperSection, ParserType, PdfContent
+from src.services.pdf_parser.cache import ParsedPdfCache
+
+OPTIONS = {"max_pages": 30, "do_ocr": False}
+
+
+def _content():
+    return PdfContent(
+        sections=[PaperSection(title="Introduction", content="attention " * 300, level=1)],
+        raw_text="attention " * 300,
+        parser_used=ParserType.DOCLING,
+        metadata={"pages": 1},
+    )
+
+
+def _pdf(path, data=b"%PDF-1.4 same bytes"):
+    path.write_bytes(data)
+    return path
+
+
+async def test_result_round_trips_for_a_copy_of_the_same_pdf(tmp_path):
+    cache = ParsedPdfCache(str(tmp_path / "cache"), OPTIONS)
+    key = await cache.key(_pdf(tmp_path / "2401.00001.pdf"))
+    await cache.set(key, _content())
+
+    copy_key = await cache.key(_pdf(tmp_path / "downloaded-again.pdf"))
+
+    assert copy_key == key
+    assert await cache.get(copy_key) == _content()
+
+
+async def test_key_changes_with_content_and_options(tmp_path):
+    cache = ParsedPdfCache(str(tmp_path / "cache"), OPTIONS)
+    other_options = ParsedPdfCache(str(tmp_path / "cache"), {**OPTIONS, "do_ocr": True})
+    pdf = _pdf(tmp_path / "paper.pdf")
+
+    key = await cache.key(pdf)
+
+    assert await cache.key(_pdf(tmp_path / "other.pdf", b"%PDF-1.4 other bytes")) != key
+    assert await other_options.key(pdf) != key
+
+
+async def test_unreadable_entry_is_discarded(tmp_path):
+    cache = ParsedPdfCache(str(tmp_path / "cache"), OPTIONS)
+    key = await cache.key(_pdf(tmp_path / "paper.pdf"))
+    await cache.set(key, _content())
+    entry_path = cache._entry_path(key)
+    entry_path.write_bytes(b"\x00garbage")
+
+    assert await cache.get(key) is None
+    assert not entry_path.exists()
+
+
+async def test_writes_leave_no_temp_files(tmp_path):
+    cache = ParsedPdfCache(str(tmp_path / "cache"), OPTIONS)
+    key = await cache.key(_pdf(tmp_path / "paper.pdf"))
+
+    await cache.set(key, _content())
+
+    assert [path.suffix for path in cache._entry_path(key).parent.iterdir()] == [".msgpack"]
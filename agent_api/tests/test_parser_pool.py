@@ -0,0 +1,97 @@
+import asyncio
+import gc
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import types
+
+import pytest
+
+from src.services.pdf_parser import pool
+from src.services.pdf_parser.pool import ParserWorkerPool
+
+
+class _RecordingParser:
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.calls = []
+        _RecordingParser.instances.append(self)
+
+    def _load_models(self):
+        self.calls.append("load")
+
+    def _warm_up_models(self):
+        self.calls.append("warm_up")
+
+
+@pytest.fixture
+def recording_parser(monkeypatch):
+    module = types.ModuleType("src.services.pdf_parser.docling")
+    module.DoclingParser = _RecordingParser
+    monkeypatch.setitem(sys.modules, "src.services.pdf_parser.docling", module)
+    monkeypatch.setattr(pool, "_preloaded_parser", None)
+    _RecordingParser.instances = []
+    yield _RecordingParser
+    gc.unfreeze()
+
+
+def test_preload_loads_models_without_running_them(recording_parser):
+    pool._load_models_for_workers({"max_pages": 1})
+    pool._load_models_for_workers({"max_pages": 1})
+
+    assert len(recording_parser.instances) == 1
+    assert recording_parser.instances[0].calls == ["load"]
+    assert recording_parser.instances[0].kwargs == {"max_pages": 1}
+    assert pool._preloaded_parser is recording_parser.instances[0]
+
+
+def test_preload_uses_forkserver_workers():
+    worker_pool = ParserWorkerPool({}, start_method="fork", preload_models=True)
+
+    assert worker_pool._ctx.get_start_method() == "forkserver"
+
+
+def test_preload_hands_the_parser_arguments_to_the_fork_server(monkeypatch):
+    from multiprocessing import forkserver
+
+    seen = {}
+    monkeypatch.setattr(forkserver, "set_forkserver_preload", lambda modules: seen.update(modules=modules))
+    monkeypatch.setattr(forkserver, "ensure_running", lambda: seen.update(env=os.environ.get(pool._PRELOAD_ENV)))
+
+    ParserWorkerPool({"max_pages": 1}, preload_models=True)._preload()
+
+    assert seen == {"modules": ["src.services.pdf_parser.preload"], "env": json.dumps({"max_pages": 1})}
+    assert pool._PRELOAD_ENV not in os.environ
+
+
+async def test_readable_waits_on_the_pipe_without_threads():
+    parent, child = multiprocessing.Pipe()
+    threads = threading.active_count()
+
+    assert await ParserWorkerPool._readable(parent, 0.01) is False
+
+    asyncio.get_running_loop().call_later(0.01, child.send, "ready")
+    assert await ParserWorkerPool._readable(parent, 1) is True
+    assert parent.recv() == "ready"
+    assert threading.active_count() == threads
+
+    child.close()
+    assert await ParserWorkerPool._readable(parent, 1) is True
+    parent.close()
+
+
+def test_preload_module_loads_the_models_once_and_clears_the_arguments(recording_parser, monkeypatch):
+    import importlib
+
+    monkeypatch.setenv(pool._PRELOAD_ENV, json.dumps({"max_pages": 2}))
+    from src.services.pdf_parser import preload
+
+    importlib.reload(preload)
+
+    assert pool._preloaded_parser is recording_parser.instances[0]
+    assert recording_parser.instances[0].kwargs == {"max_pages": 2}
+    assert pool._PRELOAD_ENV not in os.environ
@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+import types
+
+import pytest
+
+from src.exceptions import PDFParsingException, PDFValidationError
+from src.schemas.pdf_parser.models import ParserType, PdfContent
+from src.services.pdf_parser.pool import ParserWorkerPool
+
+
+class _StubParser:
+    """Parser whose behaviour is picked by the file name, run inside forked workers"""
+
+    def __init__(self, **kwargs):
+        pass
+
+    def _warm_up_models(self):
+        pass
+
+    def convert_pdf(self, pdf_path):
+        if pdf_path.stem == "slow":
+            time.sleep(30)
+        if pdf_path.stem == "invalid":
+            raise PDFValidationError(f"not a PDF: {pdf_path}")
+        if pdf_path.stem == "crash":
+            os._exit(1)
+        return PdfContent(raw_text=f"text of {pdf_path.name} from {os.getpid()}", parser_used=ParserType.DOCLING)
+
+
+@pytest.fixture
+def worker_pool(monkeypatch):
+    # forked workers import the parser from the inherited sys.modules, so no Docling is needed
+    module = types.ModuleType("src.services.pdf_parser.docling")
+    module.DoclingParser = _StubParser
+    monkeypatch.setitem(sys.modules, "src.services.pdf_parser.docling", module)
+
+    pool = ParserWorkerPool(
+        {},
+        workers=2,
+        parse_timeout_seconds=1.0,
+        start_timeout_seconds=10.0,
+        max_docs_per_worker=3,
+        start_method="fork",
+        poll_interval_seconds=0.05,
+    )
+    yield pool
+    pool.close()
+
+
+def _pid(content):
+    return int(content.raw_text.rsplit(" ", 1)[1])
+
+
+async def test_parses_in_worker_processes_and_recycles_them(worker_pool, tmp_path):
+    worker_pool.size = 1
+    worker_pool.max_docs_per_worker = 2
+
+    pids = [_pid(await worker_pool.parse(tmp_path / f"paper{i}.pdf")) for i in range(3)]
+
+    assert os.getpid() not in pids
+    assert pids[0] == pids[1] != pids[2]
+
+
+async def test_invalid_pdf_keeps_its_error_type(worker_pool, tmp_path):
+    with pytest.raises(PDFValidationError):
+        await worker_pool.parse(tmp_path / "invalid.pdf")
+
+    assert (await worker_pool.parse(tmp_path / "paper.pdf")).raw_text.startswith("text of paper.pdf")
+
+
+async def test_timed_out_worker_is_killed_and_replaced(worker_pool, tmp_path):
+    await worker_pool.parse(tmp_path / "warm.pdf")
+    before = {worker.pid for worker in worker_pool._workers}
+
+    with pytest.raises(PDFParsingException, match="timed out"):
+        await worker_pool.parse(tmp_path / "slow.pdf")
+
+    assert {worker.pid for worker in worker_pool._workers} != before
+    assert len(worker_pool._workers) == 2
+    assert await worker_pool.parse(tmp_path / "paper.pdf")
+
+
+async def test_crashed_worker_is_replaced(worker_pool, tmp_path):
+    with pytest.raises(PDFParsingException, match="died"):
+        await worker_pool.parse(tmp_path / "crash.pdf")
+
+    assert all(worker.process.is_alive() for worker in worker_pool._workers)
+    assert await worker_pool.parse(tmp_path / "paper.pdf")
@@ -0,0 +1,52 @@
+from src.services.cache.client import CacheClient
+from src.services.cache.retrieval import RetrievalCache, normalize_query
+
+RESULTS = {"total": 1, "hits": [{"chunk_id": "a", "score": 1.0}]}
+
+
+def _cache(settings, fake_redis):
+    return RetrievalCache(CacheClient(fake_redis, settings.redis), index_name="arxiv-papers-chunks")
+
+
+def test_normalize_query_folds_case_whitespace_and_trailing_punctuation():
+    assert normalize_query("  What is   Attention?? ") == "what is attention"
+    assert normalize_query("what is attention") == "what is attention"
+
+
+async def test_trivially_different_queries_share_an_entry(settings, fake_redis):
+    cache = _cache(settings, fake_redis)
+    _, generation = await cache.get("What is attention?", "hybrid", size=3)
+
+    assert await cache.set("What is attention?", "hybrid", 3, RESULTS, generation)
+    results, _ = await cache.get("what is  attention", "hybrid", size=3)
+
+    assert results == RESULTS
+
+
+async def test_mode_and_filters_are_part_of_the_key(settings, fake_redis):
+    cache = _cache(settings, fake_redis)
+    _, generation = await cache.get("attention", "hybrid", size=3)
+    await cache.set("attention", "hybrid", 3, RESULTS, generation, categories=["cs.LG", "cs.AI"])
+
+    assert (await cache.get("attention", "hybrid", size=3, categories=["cs.AI", "cs.LG"]))[0] == RESULTS
+    assert (await cache.get("attention", "bm25", size=3, categories=["cs.AI", "cs.LG"]))[0] is None
+    assert (await cache.get("attention", "hybrid", size=5, categories=["cs.AI", "cs.LG"]))[0] is None
+
+
+async def test_index_write_invalidates_earlier_entries(settings, fake_redis):
+    cache = _cache(settings, fake_redis)
+    _, generation = await cache.get("attention", "hybrid", size=3)
+    await cache.set("attention", "hybrid", 3, RESULTS, generation)
+
+    await fake_redis.incr(cache.generation_key)
+    results, new_generation = await cache.get("attention", "hybrid", size=3)
+
+    assert results is None
+    assert new_generation == generation + 1
+
+
+async def test_empty_results_are_not_cached(settings, fake_redis):
+    cache = _cache(settings, fake_redis)
+
+    assert not await cache.set("attention", "hybrid", 3, {"total": 0, "hits": []}, 0)
+    assert not await cache.set("attention", "hybrid", 3, RESULTS, -1)
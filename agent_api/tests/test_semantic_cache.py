@@ -0,0 +1,84 @@
+import pytest
+
+from src.schemas.api.ask import AskRequest, AskResponse
+from src.services.cache import semantic
+from src.services.cache.semantic import SemanticAnswerCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(semantic.time, "monotonic", clock)
+    return clock
+
+
+def _response(answer):
+    return AskResponse(query="q", answer=answer, sources=[], chunks_used=1, search_mode="hybrid")
+
+
+def test_lookup_returns_the_closest_answer_above_the_threshold(clock):
+    cache = SemanticAnswerCache(similarity_threshold=0.9)
+    request = AskRequest(query="what is attention?")
+    cache.store(request, [1.0, 0.0], _response("exact"))
+    cache.store(request, [0.95, 0.31], _response("close"))
+
+    hit = cache.lookup(AskRequest(query="explain attention"), [1.0, 0.01])
+
+    assert hit.answer == "exact"
+    assert hit.query == "explain attention"
+    assert cache.lookup(request, [0.0, 1.0]) is None
+
+
+def test_lookup_only_matches_the_same_partition(clock):
+    cache = SemanticAnswerCache(similarity_threshold=0.9)
+    cache.store(AskRequest(query="q", model="llama3.2:1b"), [1.0, 0.0], _response("small model"))
+
+    assert cache.lookup(AskRequest(query="q", model="llama3.2:3b"), [1.0, 0.0]) is None
+    assert cache.lookup(AskRequest(query="q", use_hybrid=False), [1.0, 0.0]) is None
+
+
+def test_expired_best_match_falls_through_to_the_next_live_one(clock):
+    cache = SemanticAnswerCache(similarity_threshold=0.9, ttl_seconds=60)
+    request = AskRequest(query="what is attention?")
+    cache.store(request, [1.0, 0.0], _response("old"))
+    clock.now += 50
+    cache.store(request, [0.95, 0.31], _response("newer"))
+
+    clock.now += 20
+    hit = cache.lookup(request, [1.0, 0.0])
+
+    assert hit.answer == "newer"
+    assert len(cache) == 1
+
+
+def test_store_purges_expired_entries(clock):
+    cache = SemanticAnswerCache(ttl_seconds=60)
+    cache.store(AskRequest(query="a", model="m1"), [1.0, 0.0], _response("a"))
+    cache.store(AskRequest(query="b", model="m2"), [0.0, 1.0], _response("b"))
+
+    clock.now += 61
+    cache.store(AskRequest(query="c", model="m3"), [1.0, 1.0], _response("c"))
+
+    assert len(cache) == 1
+    assert set(cache._partitions) == {cache._partition(AskRequest(query="c", model="m3"))}
+
+
+def test_least_recently_used_entries_are_evicted(clock):
+    cache = SemanticAnswerCache(similarity_threshold=0.99, max_entries=2)
+    request = AskRequest(query="q")
+    cache.store(request, [1.0, 0.0], _response("a"))
+    cache.store(request, [0.0, 1.0], _response("b"))
+    cache.lookup(request, [1.0, 0.0])
+
+    cache.store(request, [1.0, 1.0], _response("c"))
+
+    assert cache.lookup(request, [1.0, 0.0]).answer == "a"
+    assert cache.lookup(request, [0.0, 1.0]) is None
@@ -0,0 +1,64 @@
+import asyncio
+
+from src.services.streaming.sse import HEARTBEAT_FRAME, sse_event_stream
+
+
+class _FakeRequest:
+    def __init__(self, disconnect_after: int):
+        self.checks = 0
+        self.disconnect_after = disconnect_after
+
+    async def is_disconnected(self):
+        self.checks += 1
+        return self.checks > self.disconnect_after
+
+
+async def _frames(count, delay=0.0):
+    for i in range(count):
+        if delay:
+            await asyncio.sleep(delay)
+        yield f"data: {i}\n\n"
+
+
+async def test_fast_frames_are_coalesced_into_few_writes():
+    writes = [write async for write in sse_event_stream(_frames(50), flush_interval_ms=50)]
+
+    assert "".join(writes) == "".join(f"data: {i}\n\n" for i in range(50))
+    assert len(writes) < 5
+
+
+async def test_heartbeat_is_sent_while_the_source_is_silent():
+    writes = [write async for write in sse_event_stream(_frames(1, delay=0.05), heartbeat_interval_seconds=0.01)]
+
+    assert writes[0] == HEARTBEAT_FRAME
+    assert writes[-1] == "data: 0\n\n"
+
+
+async def test_client_disconnect_closes_the_source():
+    closed = asyncio.Event()
+
+    async def endless():
+        try:
+            while True:
+                await asyncio.sleep(0.001)
+                yield "data: token\n\n"
+        finally:
+            closed.set()
+
+    writes = [
+        write
+        async for write in sse_event_stream(endless(), _FakeRequest(disconnect_after=2), flush_interval_ms=1)
+    ]
+
+    assert len(writes) == 3
+    assert closed.is_set()
+
+
+async def test_source_error_ends_the_stream_after_sent_frames():
+    async def failing():
+        yield "data: 0\n\n"
+        raise RuntimeError("upstream failed")
+
+    writes = [write async for write in sse_event_stream(failing(), flush_interval_ms=1)]
+
+    assert "".join(writes) == "data: 0\n\n"
@@ -0,0 +1,83 @@
+from src.routers import ask
+from src.schemas.api.ask import AskRequest
+from src.services.cache.client import CacheClient
+from src.services.cache.coalescing import StreamBroadcaster
+from src.services.langfuse.client import LangfuseTracer
+from src.services.ollama.prompts import RAGPromptBuilder
+
+TOKENS = ["Trans", "formers", " use", " attention", "."]
+
+
+class FakeOllama:
+    def __init__(self):
+        self.prompt_builder = RAGPromptBuilder()
+        self.calls = 0
+
+    async def generate_rag_answer_stream(self, query, chunks, model):
+        self.calls += 1
+        for token in TOKENS:
+            yield {"response": token}
+        yield {"done": True}
+
+
+async def _fake_prepare(request, *args, **kwargs):
+    chunks = [{"arxiv_id": "1706.03762", "title": "Attention", "score": 1.0, "chunk_text": "attention is all you need"}]
+    return chunks, ["https://arxiv.org/pdf/1706.03762.pdf"], ["1706.03762"], "hybrid", False
+
+
+async def _stream(request, ollama, cache_client, settings) -> str:
+    response = await ask.ask_question_stream(
+        request=request,
+        opensearch_client=None,
+        embeddings_service=None,
+        ollama_client=ollama,
+        langfuse_tracer=LangfuseTracer(settings),
+        cache_client=cache_client,
+        retrieval_cache=None,
+        stream_broadcaster=StreamBroadcaster(),
+        settings=settings,
+        http_request=None,
+    )
+    return "".join([frame async for frame in response.body_iterator])
+
+
+async def test_cached_stream_replays_byte_identical_frames(monkeypatch, settings, fake_redis):
+    monkeypatch.setattr(ask, "_prepare_chunks_and_sources", _fake_prepare)
+    ollama = FakeOllama()
+    cache_client = CacheClient(fake_redis, settings.redis)
+    request = AskRequest(query="what are transformers?")
+
+    live = await _stream(request, ollama, cache_client, settings)
+    replayed = await _stream(request, ollama, cache_client, settings)
+
+    assert ollama.calls == 1
+    assert replayed == live
+    for token in TOKENS:
+        assert ask._sse_frame({"chunk": token}) in replayed
+
+
+async def test_answer_cached_by_ask_replays_as_one_chunk(settings, fake_redis):
+    cache_client = CacheClient(fake_redis, settings.redis)
+    request = AskRequest(query="what are transformers?")
+    answer = "".join(TOKENS)
+    await cache_client.store_response(
+        request, ask.AskResponse(query=request.query, answer=answer, sources=[], chunks_used=1, search_mode="hybrid")
+    )
+
+    cached, tokens = await cache_client.find_cached_stream(request)
+    frames = ask._replay_frames(cached, tokens)
+
+    assert tokens is None
+    assert ask._sse_frame({"chunk": answer}) in frames
+    assert frames.endswith(ask._sse_frame({"answer": answer, "done": True}))
+
+
+async def test_stale_tokens_are_not_replayed_with_a_different_answer(settings, fake_redis):
+    cache_client = CacheClient(fake_redis, settings.redis)
+    request = AskRequest(query="what are transformers?")
+    response = ask.AskResponse(query=request.query, answer="new answer", sources=[], chunks_used=1, search_mode="hybrid")
+    await cache_client.store_response(request, response, ["old", " answer"])
+
+    _, tokens = await cache_client.find_cached_stream(request)
+
+    assert tokens is None
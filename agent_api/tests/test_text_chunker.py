@@ -0,0 +1,50 @@
+import re
+
+from src.services.indexing.text_chunker import TextChunker
+
+
+def _text(words: int) -> str:
+    # irregular whitespace so offsets cannot be rebuilt by joining words with single spaces
+    return "".join(f"w{i}" + ("\n\n" if i % 7 == 0 else "  " if i % 3 == 0 else " ") for i in range(words))
+
+
+def test_chunks_slice_original_text_at_their_offsets():
+    text = _text(1000)
+    chunks = TextChunker(chunk_size=100, overlap_size=20, min_chunk_size=10).chunk_text(text, "1234.5678", "p1")
+
+    for chunk in chunks:
+        assert chunk.text == text[chunk.metadata.start_char:chunk.metadata.end_char]
+        assert chunk.metadata.word_count == len(chunk.text.split())
+
+
+def test_chunks_overlap_and_cover_every_word():
+    text = _text(450)
+    chunks = TextChunker(chunk_size=100, overlap_size=20, min_chunk_size=10).chunk_text(text, "1234.5678", "p1")
+
+    assert [c.metadata.chunk_index for c in chunks] == list(range(len(chunks)))
+    assert chunks[0].text.split()[0] == "w0"
+    assert chunks[-1].text.split()[-1] == "w449"
+    for previous, current in zip(chunks, chunks[1:]):
+        assert previous.text.split()[-20:] == current.text.split()[:20]
+        assert current.metadata.overlap_with_previous == 20
+    assert chunks[-1].metadata.overlap_with_next == 0
+
+
+def test_short_text_is_a_single_chunk():
+    chunks = TextChunker(chunk_size=100, overlap_size=20, min_chunk_size=50).chunk_text("  only a few words  ", "id", "p")
+
+    assert len(chunks) == 1
+    assert chunks[0].text == "only a few words"
+    assert chunks[0].metadata.start_char == 2
+
+
+def test_iter_chunks_is_lazy():
+    chunker = TextChunker(chunk_size=100, overlap_size=20, min_chunk_size=10)
+    chunks = chunker.iter_chunks(_text(10000), "id", "p")
+
+    first = next(chunks)
+    assert re.match(r"w0\b", first.text)
+
+
+def test_empty_text_yields_nothing():
+    assert TextChunker().chunk_text("   ", "id", "p") == []
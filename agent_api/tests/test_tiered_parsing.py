@@ -0,0 +1,108 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("docling")
+
+from src.exceptions import PDFValidationError  # noqa: E402
+from src.schemas.pdf_parser.models import ParserType  # noqa: E402
+from src.services.pdf_parser.docling import DoclingParser  # noqa: E402
+
+
+def _write_pdf(path: Path, page_texts) -> Path:
+    """Minimal PDF with one line of Helvetica text per page"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    data += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+
+    path.write_bytes(data)
+    return path
+
+
+class _FakeConverter:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def convert(self, source, **kwargs):
+        self.calls.append(kwargs)
+        if self.fail:
+            raise RuntimeError("layout model crashed")
+        texts = [SimpleNamespace(label="section_header", text="Introduction"), SimpleNamespace(label="text", text="first page body")]
+        return SimpleNamespace(document=SimpleNamespace(texts=texts, export_to_text=lambda: "first page body"))
+
+
+def _parser(converter=None, **kwargs):
+    options = {"max_pages": 2, "max_file_size_mb": 5, "tiered": True, "structure_pages": 1, "max_text_pages": 10, **kwargs}
+    parser = DoclingParser(**options)
+    parser._converter = converter or _FakeConverter()
+    parser._warmed_up = True
+    return parser
+
+
+@pytest.fixture
+def paper(tmp_path):
+    return _write_pdf(tmp_path / "paper.pdf", ["First page", "Second page", "Third page"])
+
+
+def test_structure_pass_covers_the_first_pages_and_text_layer_the_rest(paper):
+    converter = _FakeConverter()
+
+    content = _parser(converter).convert_pdf(paper)
+
+    assert converter.calls[0]["page_range"] == (1, 1)
+    assert content.parser_used == ParserType.DOCLING
+    assert [section.title for section in content.sections] == ["Introduction", "Pages 2-3"]
+    assert "Second page" in content.sections[-1].content and "Third page" in content.sections[-1].content
+    assert content.metadata["total_pages"] == 3
+    assert content.metadata["structure_pages"] == 1
+
+
+def test_text_layer_only_when_structure_pages_is_zero(paper):
+    converter = _FakeConverter()
+
+    content = _parser(converter, structure_pages=0).convert_pdf(paper)
+
+    assert converter.calls == []
+    assert content.parser_used == ParserType.PDFIUM
+    assert all(text in content.raw_text for text in ["First page", "Second page", "Third page"])
+
+
+def test_failed_structure_pass_falls_back_to_the_text_layer(paper):
+    content = _parser(_FakeConverter(fail=True)).convert_pdf(paper)
+
+    assert content.parser_used == ParserType.PDFIUM
+    assert content.metadata["structure_pages"] == 0
+    assert [section.title for section in content.sections] == ["Pages 1-3"]
+
+
+def test_papers_over_max_pages_are_parsed_up_to_max_text_pages(paper):
+    assert _parser(max_pages=1, max_text_pages=3).convert_pdf(paper) is not None
+    assert _parser(max_pages=1, max_text_pages=2).convert_pdf(paper) is None
+
+
+def test_empty_file_is_rejected(tmp_path):
+    empty = tmp_path / "empty.pdf"
+    empty.write_bytes(b"")
+
+    with pytest.raises(PDFValidationError):
+        _parser().convert_pdf(empty)
@@ -18,6 +18,8 @@ def get_cached_services()-> Tuple[Any,Any,Any,Any,Any]:
 
     arxiv_client = make_arxiv_client()
     pdf_parser = make_pdf_parser_service()
+    # ingestion is the only caller that parses, so its workers load and warm the models up front
+    pdf_parser.start()
     database = make_database()
     opensearch_client = make_opensearch_client()
 